@@ -18,6 +18,24 @@ PROJECT_ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = PROJECT_ROOT / "moj_system" / "data"
 OUTPUT_DIR = PROJECT_ROOT / "outputs"
 
+# Persistent walk-forward result cache (moj_system/core/wf_cache.py)
+WF_CACHE_DIR = OUTPUT_DIR / "wf_cache"
+WF_CACHE_MAX_BYTES = 512 * 1024**2
+
+# Incremental walk-forward state of the daily runner, one file per series
+WF_STATE_DIR = OUTPUT_DIR / "wf_state"
+
+# Per-sample MC / bootstrap results (moj_system/core/robustness_store.py)
+ROBUSTNESS_STORE_DIR = OUTPUT_DIR / "robustness_samples"
+
+# Streaming MC / bootstrap aggregation (moj_system/core/robustness_stats.py):
+# result rows and equity curves kept per run, whatever n_samples is
+ROBUSTNESS_RESERVOIR_SIZE = 500
+ROBUSTNESS_CURVE_RESERVOIR_SIZE = 50
+
+# Completed sweep_optimizer units, read back by --resume
+SWEEP_CHECKPOINT_DIR = OUTPUT_DIR / "sweep_checkpoint"
+
 # Default Strategy Grids
 BASE_GRIDS = {
     "X_GRID": [0.08, 0.10, 0.12, 0.15, 0.20],
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+moj_system/core/executor.py
+===========================
+Shared task executor for the parallel phases of the engines (walk-forward
+grid search, Monte Carlo and block bootstrap robustness).
+
+Tasks are joblib delayed calls. Each one runs inside a guard that catches
+its exception in the worker, so a failing task never tears down the pool:
+only that task is re-submitted, up to max_retries times per backend. A
+pool that dies as a whole (e.g. a worker killed by the OOM killer) keeps
+every result received before the failure and re-submits only the tasks
+still missing, counted against the same retry budget; what is left then
+moves on to the next backend (loky -> threading -> in-process by
+default). Progress and per-task timings are logged; the counters of the
+last run are kept in TaskExecutor.stats.
+"""
+
+import logging
+import os
+import sys
+import time
+
+from joblib import Parallel, delayed, effective_n_jobs
+
+# Backend name -> log label; "sequential" runs the tasks in-process
+BACKEND_LABELS = {
+    "loky": "multiprocessing",
+    "threading": "threading",
+    "sequential": "sequential",
+}
+
+
+def get_n_jobs() -> int:
+    """
+    Return the recommended number of parallel jobs for this machine.
+
+    Logic:
+      - On Windows with > 3 cores: use (cpu_count - 1) to keep the UI
+        responsive (loky/spawn overhead is higher on Windows).
+      - All other platforms: use all logical cores.
+      - Always returns at least 1.
+
+    Replaces the following block that was duplicated verbatim in ~8 files::
+
+        _cpu_count = os.cpu_count() or 1
+        N_JOBS = max(1, _cpu_count - 1) if _cpu_count > 3 and sys.platform == "win32" else _cpu_count
+
+    Returns
+    -------
+    int — recommended n_jobs value for joblib.Parallel / walk_forward
+
+    Example
+    -------
+    >>> from moj_system.core.executor import get_n_jobs
+    >>> N_JOBS = get_n_jobs()
+    """
+    cpu_count = os.cpu_count() or 1
+    if cpu_count > 3 and sys.platform == "win32":
+        return max(1, cpu_count - 1)
+    return cpu_count
+
+
+class TaskFailure:
+    """Marker result of a task that raised (error holds its repr)."""
+
+    def __init__(self, error):
+        self.error = error
+
+    def __repr__(self):
+        return f"TaskFailure({self.error})"
+
+
+def _guarded_call(index, func, args, kwargs):
+    """Run one task; return (index, result or TaskFailure, seconds)."""
+    t0 = time.perf_counter()
+    try:
+        result = func(*args, **kwargs)
+    except Exception as exc:
+        result = TaskFailure(repr(exc))
+    return index, result, time.perf_counter() - t0
+
+
+class TaskExecutor:
+    """
+    Run joblib delayed tasks with per-task retry and backend fallback.
+
+    Parameters
+    ----------
+    n_jobs         : int or None — workers of the parallel backends
+                     (None = get_n_jobs())
+    backends       : sequence of "loky" / "threading" / "sequential",
+                     tried in order for the tasks still missing
+    max_retries    : int — re-submissions of a failed task per backend
+    label          : str — name used in log messages
+    progress_every : int or None — log progress every this many completed
+                     tasks (None = about every 5%)
+    """
+
+    def __init__(
+        self,
+        n_jobs=None,
+        backends=("loky", "threading", "sequential"),
+        max_retries=1,
+        label="Tasks",
+        progress_every=None,
+    ):
+        self.n_jobs = get_n_jobs() if n_jobs is None else n_jobs
+        self.backends = tuple(backends)
+        self.max_retries = max_retries
+        self.label = label
+        self.progress_every = progress_every
+        self.stats = {}
+
+    @property
+    def effective_jobs(self) -> int:
+        """Worker count of the parallel backends (n_jobs resolved)."""
+        return effective_n_jobs(self.n_jobs)
+
+    def _submit(self, backend, indexed_tasks):
+        """Generator of (index, result, seconds) of indexed_tasks on backend."""
+        if backend == "sequential" or self.effective_jobs == 1:
+            return (
+                _guarded_call(index, func, args, kwargs)
+                for index, (func, args, kwargs) in indexed_tasks
+            )
+        return Parallel(n_jobs=self.n_jobs, backend=backend, return_as="generator")(
+            delayed(_guarded_call)(index, func, args, kwargs)
+            for index, (func, args, kwargs) in indexed_tasks
+        )
+
+    def imap(self, tasks):
+        """
+        Run tasks and yield (task index, result) as results arrive.
+
+        The first pass yields in task order; retried tasks follow once
+        resubmitted. A task that failed on every backend yields a
+        TaskFailure. Closing the generator cancels the pending tasks.
+        """
+        tasks = list(tasks)
+        pending = list(range(len(tasks)))
+        every = self.progress_every or max(1, len(tasks) // 20)
+        task_seconds = []
+        n_retried = 0
+        backend_used = None
+        t_start = time.perf_counter()
+
+        for backend in self.backends:
+            label = BACKEND_LABELS[backend]
+            attempt = 0
+            while pending and attempt <= self.max_retries:
+                if attempt > 0:
+                    n_retried += len(pending)
+                    logging.info(
+                        "%s: re-submitting %d task(s) on %s backend (retry %d/%d).",
+                        self.label,
+                        len(pending),
+                        label,
+                        attempt,
+                        self.max_retries,
+                    )
+                attempt += 1
+                failed = []
+                received = set()
+                source = self._submit(backend, [(i, tasks[i]) for i in pending])
+                try:
+                    for index, result, seconds in source:
+                        received.add(index)
+                        if isinstance(result, TaskFailure):
+                            logging.warning(
+                                "%s: task %d failed on %s backend: %s",
+                                self.label,
+                                index,
+                                label,
+                                result.error,
+                            )
+                            failed.append(index)
+                            continue
+                        task_seconds.append(seconds)
+                        backend_used = label
+                        if len(task_seconds) % every == 0 or len(task_seconds) == len(tasks):
+                            logging.info(
+                                "%s progress: %d/%d tasks (%.0f%%)",
+                                self.label,
+                                len(task_seconds),
+                                len(tasks),
+                                len(task_seconds) / len(tasks) * 100,
+                            )
+                        yield index, result
+                except GeneratorExit:
+                    source.close()
+                    raise
+                except Exception as exc:
+                    # The pool itself failed: results received so far are
+                    # kept, only the missing tasks are re-submitted (loky
+                    # starts fresh workers), then the next backend.
+                    logging.warning(
+                        "%s: %s backend failed after %d/%d task(s): %s",
+                        self.label,
+                        label,
+                        len(received),
+                        len(pending),
+                        exc,
+                    )
+                    pending = failed + [i for i in pending if i not in received]
+                    continue
+                pending = failed
+            if not pending:
+                break
+
+        for index in pending:
+            yield index, TaskFailure("failed on every backend")
+
+        elapsed = time.perf_counter() - t_start
+        self.stats = {
+            "n_tasks": len(tasks),
+            "n_failed": len(pending),
+            "n_retried": n_retried,
+            "backend": backend_used,
+            "elapsed": elapsed,
+            "task_seconds": task_seconds,
+        }
+        if task_seconds:
+            logging.info(
+                "%s completed using %s backend (%d jobs): %d tasks in %.1fs "
+                "(task mean %.2fs, max %.2fs, %d retried, %d failed).",
+                self.label,
+                backend_used,
+                self.effective_jobs if backend_used != "sequential" else 1,
+                len(tasks),
+                elapsed,
+                sum(task_seconds) / len(task_seconds),
+                max(task_seconds),
+                n_retried,
+                len(pending),
+            )
+        if pending:
+            logging.error("%s: %d task(s) failed on every backend.", self.label, len(pending))
+
+    def map(self, tasks):
+        """
+        Run tasks and return their results in task order (TaskFailure for
+        a task that failed on every backend).
+        """
+        tasks = list(tasks)
+        results = [None] * len(tasks)
+        for index, result in self.imap(tasks):
+            results[index] = result
+        return results
@@ -29,16 +29,17 @@ import numpy as np
 import pandas as pd
 
 # Import funkcji, od których te moduły zależą
-from moj_system.core.strategy_engine import (  # (Zakładając, że download_csv_old jest chwilowo potrzebny)
-    download_csv_old,
-    load_csv,
-)
+from moj_system.core.strategy_engine import load_csv
 
 
 def download_fund_navs(fund_codes: dict, tmp_dir: str) -> dict:
     """
     Download fund NAV series from stooq.pl and build the FUND_FILES dict.
     """
+    # download_csv_old nie istnieje już w strategy_engine — import tutaj, żeby
+    # reszta modułu (compute_fund_breadth_signal) dała się importować.
+    from moj_system.core.strategy_engine import download_csv_old
+
     BASE_URL = "https://stooq.pl/q/d/l/?s={code}.n&i=d"
     fund_files = {}
 
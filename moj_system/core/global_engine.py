@@ -83,6 +83,7 @@ except ImportError:
 
 
 from moj_system.core.strategy_engine import compute_metrics
+from moj_system.core.utils import simulate_reallocation_gate_batch
 
 # ============================================================
 # CONSTANTS
@@ -1306,8 +1307,9 @@ def allocation_weight_robustness_n(
 
     results = []
 
+    # ── Build per-window perturbed weight dicts of every step ───────────
+    step_sets = []
     for step in perturb_steps:
-        # ── Build per-window perturbed weight dicts ───────────────────────
         perturbed_windows = []
         n_floor_clamped = 0
         n_ceil_clamped = 0
@@ -1366,96 +1368,100 @@ def allocation_weight_robustness_n(
                 max_weight,
             )
 
-        # ── Simulate OOS with perturbed weights ───────────────────────────
-        oos_equity_slices = []
-        n_reallocations = 0
-        current_weights = {k: 0.0 for k in asset_keys}
-        current_weights["mmf"] = 1.0
-        last_change_date = None
-        annual_counter = {}
+        step_sets.append((step, perturbed_windows, n_floor_clamped, n_ceil_clamped))
 
-        for pw in perturbed_windows:
-            window_start = pw["TestStart"]
-            window_end = pw["TestEnd"]
-
-            # Target weights from the perturbed window
-            target = {k: pw[k] for k in asset_keys}
-            target["mmf"] = pw["w_mmf"]
-
-            # Slice the OOS index to this window
-            window_idx = all_signal_idx[
-                (all_signal_idx >= window_start) & (all_signal_idx <= window_end)
-            ]
-            if window_idx.empty:
-                continue
-
-            window_ret_vals = []
-            for date in window_idx:
-                # Signals on this date
-                sigs_today = {k: int(sig_aligned[k].get(date, 0)) for k in asset_keys}
-                n_on = sum(sigs_today.values())
-
-                # Apply 3-state portfolio weights (mirrors signals_to_target_weights_n)
-                if n_on == 0:
-                    effective = {k: 0.0 for k in asset_keys}
-                    effective["mmf"] = 1.0
-                elif n_on == 1:
-                    on_key = next(k for k in asset_keys if sigs_today[k] == 1)
-                    effective = {k: 0.0 for k in asset_keys}
-                    effective[on_key] = 1.0
-                    effective["mmf"] = 0.0
-                else:
-                    # Distribute signal-off assets to MMF within each weight bucket
-                    effective = {}
-                    extra_mmf = 0.0
-                    for k in asset_keys:
-                        if sigs_today[k] == 1:
-                            effective[k] = target[k]
-                        else:
-                            effective[k] = 0.0
-                            extra_mmf += target[k]
-                    effective["mmf"] = target["mmf"] + extra_mmf
-
-                # Gate
-                accepted, did_reallocate = reallocation_gate_n(
-                    current_weights=current_weights,
-                    target_weights=effective,
-                    last_change_date=last_change_date,
-                    current_date=date,
-                    cooldown_days=cooldown_days,
-                    min_delta=0.10,
-                    annual_cap=annual_cap,
-                    annual_counter=annual_counter,
-                )
-                if did_reallocate:
-                    current_weights = accepted
-                    last_change_date = date
-                    n_reallocations += 1
-
-                # Daily portfolio return
-                r = sum(
-                    current_weights[k] * float(ret_aligned[k].get(date, 0.0)) for k in asset_keys
-                )
-                r += current_weights["mmf"] * float(mmf_aligned.get(date, 0.0))
-                window_ret_vals.append((date, r))
+    # ── Simulate OOS for every step at once ──────────────────────────────
+    # One column per step; gate state per column is carried continuously
+    # across windows. Weight / return arrays are in asset_keys + mmf order.
+    n_assets = len(asset_keys)
+    n_cols = len(step_sets)
+    sig_int = np.column_stack([sig_aligned[k].to_numpy() for k in asset_keys]).astype(int)
+    ret_arr = np.column_stack([ret_aligned[k].to_numpy() for k in asset_keys])
+    mmf_arr = mmf_aligned.to_numpy()
+
+    current_weights = np.zeros((n_cols, n_assets + 1))
+    current_weights[:, n_assets] = 1.0
+    last_change_dates = None
+    annual_counter = {}
+    n_reallocations = np.zeros(n_cols, dtype=int)
+    equity_parts = []
+    index_parts = []
 
-            if not window_ret_vals:
-                continue
+    for w_idx, (_, row) in enumerate(alloc_results_df.iterrows()):
+        window_start = pd.Timestamp(row["TestStart"])
+        window_end = pd.Timestamp(row["TestEnd"])
 
-            dates, rets = zip(*window_ret_vals)
-            port_r = pd.Series(list(rets), index=list(dates))
-            eq = (1 + port_r).cumprod()
-            eq = eq / eq.iloc[0]
-            if oos_equity_slices:
-                eq = eq * oos_equity_slices[-1].iloc[-1]
-            oos_equity_slices.append(eq)
+        # Slice the OOS index to this window
+        in_window = (all_signal_idx >= window_start) & (all_signal_idx <= window_end)
+        if not in_window.any():
+            continue
+        window_idx = all_signal_idx[in_window]
+        sig = sig_int[in_window]
 
-        if not oos_equity_slices:
+        # Perturbed target weights of this window, one row per step
+        w_target = np.array(
+            [[windows[w_idx][k] for k in asset_keys] for _, windows, _, _ in step_sets],
+        )
+        w_target_mmf = np.array([windows[w_idx]["w_mmf"] for _, windows, _, _ in step_sets])
+
+        # 3-state effective weights (mirrors signals_to_target_weights_n)
+        n_on = sig.sum(axis=1)
+        on = sig == 1
+        effective = np.zeros((len(window_idx), n_cols, n_assets + 1))
+        # n_on >= 2: signal-off assets go to MMF within each weight bucket
+        multi = n_on >= 2
+        effective[multi, :, :n_assets] = np.where(on[multi][:, None, :], w_target[None], 0.0)
+        extra_mmf = np.zeros((int(multi.sum()), n_cols))
+        for j in range(n_assets):
+            extra_mmf = extra_mmf + np.where(~on[multi][:, j : j + 1], w_target[None, :, j], 0.0)
+        effective[multi, :, n_assets] = w_target_mmf[None] + extra_mmf
+        # n_on == 1: 100% the single on-asset
+        single = np.flatnonzero(n_on == 1)
+        effective[single, :, on[single].argmax(axis=1)] = 1.0
+        # n_on == 0: 100% MMF
+        effective[n_on == 0, :, n_assets] = 1.0
+
+        # Gate
+        weights, n_window, gate_state = simulate_reallocation_gate_batch(
+            targets=effective,
+            dates=window_idx,
+            current_weights=current_weights,
+            last_change_dates=last_change_dates,
+            annual_counter=annual_counter,
+            cooldown_days=cooldown_days,
+            min_delta=0.10,
+            annual_cap=annual_cap,
+        )
+        current_weights = gate_state["current_weights"]
+        last_change_dates = gate_state["last_change_dates"]
+        n_reallocations += n_window
+
+        # Daily portfolio returns, summed asset by asset then MMF
+        rets = ret_arr[in_window]
+        port_r = weights[:, :, 0] * rets[:, :1]
+        for j in range(1, n_assets):
+            port_r = port_r + weights[:, :, j] * rets[:, j : j + 1]
+        port_r = port_r + weights[:, :, n_assets] * mmf_arr[in_window][:, None]
+
+        eq = np.cumprod(1 + port_r, axis=0)
+        eq = eq / eq[0]
+        if equity_parts:
+            eq = eq * equity_parts[-1][-1]
+        equity_parts.append(eq)
+        index_parts.append(window_idx)
+
+    if equity_parts:
+        portfolio_equity = pd.DataFrame(
+            np.concatenate(equity_parts),
+            index=index_parts[0].append(index_parts[1:]),
+        ).sort_index()
+
+    for col, (step, perturbed_windows, n_floor_clamped, n_ceil_clamped) in enumerate(step_sets):
+        if not equity_parts:
             logging.warning("step=%+.2f: no OOS slices produced — skipped.", step)
             continue
 
-        portfolio_equity = pd.concat(oos_equity_slices).sort_index()
-        m = compute_metrics(portfolio_equity)
+        m = compute_metrics(portfolio_equity[col])
         focus_mean = np.mean([pw[focus_asset] for pw in perturbed_windows])
 
         results.append(
@@ -1471,7 +1477,7 @@ def allocation_weight_robustness_n(
                 "MaxDD": m.get("MaxDD", np.nan),
                 "CalMAR": m.get("CalMAR", np.nan),
                 "Sortino": m.get("Sortino", np.nan),
-                "n_reallocations": n_reallocations,
+                "n_reallocations": int(n_reallocations[col]),
             },
         )
 
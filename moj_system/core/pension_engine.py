@@ -51,16 +51,56 @@ import numpy as np
 import pandas as pd
 
 from moj_system.core.strategy_engine import (
+    METRIC_COLUMNS,
     compute_metrics,
+    compute_metrics_array,
 )
 
 # --- DODAJ TEN IMPORT ---
-from moj_system.core.utils import build_mmf_extended, reallocation_gate, signals_to_target_weights
+from moj_system.core.utils import (
+    build_mmf_extended,
+    signals_to_target_weights,
+    simulate_reallocation_gate,
+    simulate_reallocation_gate_batch,
+)
 
 # ============================================================
 # LAYER 2 — WEIGHT MAPPING
 # ============================================================
 
+# Column order of the weight / return arrays of the allocation simulation
+ALLOCATION_ASSETS = ("equity", "bond", "mmf")
+
+
+def _signal_states(sig_equity, sig_bond) -> np.ndarray:
+    """Signal state per date as a row index of _target_weight_table (2*equity + bond)."""
+    return 2 * (np.asarray(sig_equity) != 0) + (np.asarray(sig_bond) != 0)
+
+
+def _target_weight_table(weights_both_on: dict) -> np.ndarray:
+    """
+    signals_to_target_weights of the four signal states as a (4, 3) array:
+    rows both off, bond only, equity only, both on; columns ALLOCATION_ASSETS.
+    """
+    return np.array(
+        [
+            [signals_to_target_weights(e, b, weights_both_on)[a] for a in ALLOCATION_ASSETS]
+            for e, b in ((0, 0), (0, 1), (1, 0), (1, 1))
+        ],
+    )
+
+
+def _weighted_returns(weights: np.ndarray, returns: np.ndarray) -> np.ndarray:
+    """
+    Daily portfolio returns of (T, 3) weights and returns, summed in the
+    order equity + bond + mmf of the per-date scalar expression.
+    """
+    return (
+        weights[:, 0] * returns[:, 0]
+        + weights[:, 1] * returns[:, 1]
+        + weights[:, 2] * returns[:, 2]
+    )
+
 
 # ============================================================
 # LAYER 2 — ALLOCATION OPTIMISATION (both-signals-on state)
@@ -92,6 +132,36 @@ def _feasible_weight_grid(step: float = 0.10) -> list:
     return combos
 
 
+def _weight_grid_metrics(returns, weights, both_on, eq_only, bd_only, both_off):
+    """
+    Metrics of every weight combination of the both-signals-on grid at once.
+
+    returns  : np.ndarray (T, 3) — equity, bond, mmf daily returns
+    weights  : np.ndarray (3, C) — one (equity, bond, mmf) column per combination
+    both_on, eq_only, bd_only, both_off : np.ndarray (T,) bool — signal states
+
+    Rows outside the four states keep a zero return. The blend is formed
+    term by term in the order of the scalar expression (not as a BLAS
+    product) so every column is bit-identical to building it per combo.
+
+    Returns
+    -------
+    np.ndarray (C, 6) — compute_metrics_array of the compounded curves
+    """
+    n_combos = weights.shape[1]
+    port_r = np.zeros((len(returns), n_combos))
+    blend = returns[both_on]
+    port_r[both_on] = (
+        blend[:, :1] * weights[0] + blend[:, 1:2] * weights[1] + blend[:, 2:] * weights[2]
+    )
+    port_r[eq_only] = returns[eq_only, :1]
+    port_r[bd_only] = returns[bd_only, 1:2]
+    port_r[both_off] = returns[both_off, 2:]
+
+    equity_curves = np.cumprod(1 + port_r, axis=0)
+    return compute_metrics_array(np.ascontiguousarray(equity_curves.T))
+
+
 def optimise_both_on_weights(
     equity_returns: pd.Series,
     bond_returns: pd.Series,
@@ -145,57 +215,49 @@ def optimise_both_on_weights(
     s_bd = sig_bond.loc[common]
 
     # Days when both signals are on — only these rows differ across combos
-    both_on = (s_eq == 1) & (s_bd == 1)
+    both_on = ((s_eq == 1) & (s_bd == 1)).to_numpy()
+    eq_only = ((s_eq == 1) & (s_bd == 0)).to_numpy()
+    bd_only = ((s_eq == 0) & (s_bd == 1)).to_numpy()
+    both_off = ((s_eq == 0) & (s_bd == 0)).to_numpy()
 
     best_score = -np.inf
     best_combo = combos[0]
 
-    for combo in combos:
-        # Build daily portfolio returns for the full period
-        # When both on: weighted blend
-        # When equity only: 100% equity
-        # When bond only: 100% bond
-        # When both off: 100% mmf
-        port_r = pd.Series(0.0, index=common)
-
-        eq_only = (s_eq == 1) & (s_bd == 0)
-        bd_only = (s_eq == 0) & (s_bd == 1)
-        both_off = (s_eq == 0) & (s_bd == 0)
-
-        port_r[both_on] = (combo["equity"] * eq_r + combo["bond"] * bd_r + combo["mmf"] * mf_r)[
-            both_on
-        ]
-        port_r[eq_only] = eq_r[eq_only]
-        port_r[bd_only] = bd_r[bd_only]
-        port_r[both_off] = mf_r[both_off]
-
-        equity_curve = (1 + port_r).cumprod()
-        if len(equity_curve) < 2:
-            continue
-
-        m = compute_metrics(equity_curve)
+    if len(common) >= 2:
+        metrics = _weight_grid_metrics(
+            np.column_stack([eq_r.to_numpy(), bd_r.to_numpy(), mf_r.to_numpy()]),
+            np.array([[c["equity"], c["bond"], c["mmf"]] for c in combos]).T,
+            both_on,
+            eq_only,
+            bd_only,
+            both_off,
+        )
+        calmar = metrics[:, METRIC_COLUMNS.index("CalMAR")]
+        sharpe = metrics[:, METRIC_COLUMNS.index("Sharpe")]
+        sortino = metrics[:, METRIC_COLUMNS.index("Sortino")]
 
         if objective == "calmar":
-            score = m["CalMAR"]
+            scores = calmar
         elif objective == "sharpe":
-            score = m["Sharpe"]
+            scores = sharpe
         elif objective == "sortino":
-            score = m["Sortino"]
+            scores = sortino
         elif objective == "calmar_sortino":
-            if m["CalMAR"] is None or m["Sortino"] is None:
-                return None
-            score = 0.5 * m["CalMAR"] + 0.5 * m["Sortino"]
+            scores = 0.5 * calmar + 0.5 * sortino
         elif objective == "calmar_sharpe":
-            if m["CalMAR"] is None or m["Sharpe"] is None:
-                return None
-            score = 0.5 * m["CalMAR"] + 0.5 * m["Sharpe"]
-
+            scores = 0.5 * calmar + 0.5 * sharpe
         else:
             raise ValueError(f"Unknown objective: {objective!r}")
 
-        if score > best_score:
-            best_score = score
-            best_combo = combo
+        # First combination with the highest score (NaN never wins), as the
+        # strict ">" of a sequential scan over the grid
+        valid = ~np.isnan(scores)
+        if valid.any():
+            top = np.max(scores[valid])
+            if top > best_score:
+                best_idx = int(np.flatnonzero(valid & (scores == top))[0])
+                best_score = float(scores[best_idx])
+                best_combo = combos[best_idx]
 
     logging.info(
         "Both-on weight optimisation: best equity=%.0f%% bond=%.0f%% mmf=%.0f%% "
@@ -236,29 +298,37 @@ def build_signal_series(wf_equity: pd.Series, wf_trades: pd.DataFrame) -> pd.Ser
     -------
     pd.Series — binary 0/1 series aligned to wf_equity.index
     """
-    signal = pd.Series(0, index=wf_equity.index, dtype=int)
+    index = wf_equity.index
+    signal = pd.Series(0, index=index, dtype=int)
 
     if wf_trades.empty:
         return signal
 
     boundary = {"CARRY", "SAMPLE_END"}
-    closed_trades = wf_trades[~wf_trades["Exit Reason"].isin(boundary)].copy()
+    closed_trades = wf_trades[~wf_trades["Exit Reason"].isin(boundary)]
+
+    # Each trade paints the date positions [start, end): +1 at start and -1
+    # at end of a difference array, whose cumsum is > 0 inside any trade.
+    entries = pd.DatetimeIndex(pd.to_datetime(closed_trades["EntryDate"]))
+    exits = pd.DatetimeIndex(pd.to_datetime(closed_trades["ExitDate"]))
+    dated = ~(entries.isna() | exits.isna())
+    starts = index.searchsorted(entries[dated], side="left")
+    ends = index.searchsorted(exits[dated], side="right")
 
     # Also include the currently open trade if the last record is CARRY
     last = wf_trades.iloc[-1]
     if last["Exit Reason"] in boundary:
         # Position is open to end of data — mark to end
         entry = pd.Timestamp(last["EntryDate"])
-        mask = signal.index >= entry
-        signal.loc[mask] = 1
+        if not pd.isna(entry):
+            starts = np.append(starts, index.searchsorted(entry, side="left"))
+            ends = np.append(ends, len(index))
 
-    for _, row in closed_trades.iterrows():
-        entry = pd.Timestamp(row["EntryDate"])
-        exit_ = pd.Timestamp(row["ExitDate"])
-        mask = (signal.index >= entry) & (signal.index <= exit_)
-        signal.loc[mask] = 1
-
-    return signal
+    painted = ends > starts
+    diff = np.zeros(len(index) + 1, dtype=np.int64)
+    np.add.at(diff, starts[painted], 1)
+    np.add.at(diff, ends[painted], -1)
+    return pd.Series((np.cumsum(diff[:-1]) > 0).astype(int), index=index)
 
 
 # ============================================================
@@ -368,8 +438,9 @@ def allocation_walk_forward(
     all_weights = {}
     alloc_results = []
 
-    # Reallocation gate state persists across windows
-    current_weights = {"equity": 0.0, "bond": 0.0, "mmf": 1.0}
+    # Reallocation gate state persists across windows (weights in
+    # ALLOCATION_ASSETS order)
+    current_weights = np.array([0.0, 0.0, 1.0])
     last_change_date = None
     annual_counter = {}
     all_realloc_log = []
@@ -452,73 +523,61 @@ def allocation_walk_forward(
         eq_r = test_eq_r.loc[common]
         bd_r = test_bd_r.loc[common]
         mf_r = test_mf_r.loc[common]
-        s_eq = test_s_eq.reindex(common).fillna(0).astype(int)
-        s_bd = test_s_bd.reindex(common).fillna(0).astype(int)
-
-        window_equity_vals = []
+        if common.empty:
+            continue
 
-        for date in common:
-            target = signals_to_target_weights(
-                sig_equity=int(s_eq[date]),
-                sig_bond=int(s_bd[date]),
-                weights_both_on=best_combo,
+        s_eq = test_s_eq.reindex(common).fillna(0).astype(int).to_numpy()
+        s_bd = test_s_bd.reindex(common).fillna(0).astype(int).to_numpy()
+        states = _signal_states(s_eq, s_bd)
+        table = _target_weight_table(best_combo)
+
+        weights, realloc_rows, gate_state = simulate_reallocation_gate(
+            targets=table[states],
+            dates=common,
+            current_weights=current_weights,
+            last_change_date=last_change_date,
+            annual_counter=annual_counter,
+            cooldown_days=cooldown_days,
+            annual_cap=annual_cap,
+        )
+        if gate_state["n_cap_blocked"]:
+            logging.warning(
+                "Gate BLOCKED (annual cap) on %d date(s) in window %s–%s",
+                gate_state["n_cap_blocked"],
+                test_start.date(),
+                test_end.date(),
             )
 
-            accepted, reallocated, annual_counter = reallocation_gate(
-                current_weights=current_weights,
-                target_weights=target,
-                last_change_date=last_change_date,
-                current_date=date,
-                cooldown_days=cooldown_days,
-                annual_cap=annual_cap,
-                annual_counter=annual_counter,
+        # Reallocation log: weights before each change are the weights
+        # after the previous one (or those entering the window)
+        befores = np.vstack([current_weights, weights[realloc_rows]])[:-1]
+        param_updated = prev_best_combo is not None and prev_best_combo != best_combo
+        for row, before in zip(realloc_rows.tolist(), befores.tolist(), strict=True):
+            if row == 0 and param_updated:
+                # Would the target have been the same under the old weights?
+                old_target = _target_weight_table(prev_best_combo)[states[0]]
+                signal_also_changed = (old_target != table[states[0]]).any()
+                reason = "BOTH" if signal_also_changed else "PARAM_UPDATE"
+            else:
+                reason = "SIGNAL_CHANGE"
+            after = weights[row].tolist()
+            all_realloc_log.append(
+                {
+                    "Date": common[row],
+                    **{f"{a}_before": w for a, w in zip(ALLOCATION_ASSETS, before, strict=True)},
+                    **{f"{a}_after": w for a, w in zip(ALLOCATION_ASSETS, after, strict=True)},
+                    "reason": reason,
+                },
             )
 
-            if reallocated:
-                param_updated = (
-                    date == common[0]
-                    and prev_best_combo is not None
-                    and prev_best_combo != best_combo
-                )
-
-                if param_updated:
-                    # Would the target have been the same under the old weights?
-                    old_target = signals_to_target_weights(
-                        sig_equity=int(s_eq[date]),
-                        sig_bond=int(s_bd[date]),
-                        weights_both_on=prev_best_combo,
-                    )
-                    signal_also_changed = old_target != target
-                    reason = "BOTH" if signal_also_changed else "PARAM_UPDATE"
-                else:
-                    reason = "SIGNAL_CHANGE"
-
-                all_realloc_log.append(
-                    {
-                        "Date": date,
-                        "equity_before": current_weights["equity"],
-                        "bond_before": current_weights["bond"],
-                        "mmf_before": current_weights["mmf"],
-                        "equity_after": accepted["equity"],
-                        "bond_after": accepted["bond"],
-                        "mmf_after": accepted["mmf"],
-                        "reason": reason,
-                    },
-                )
-                current_weights = accepted
-                last_change_date = date
+        for date, row in zip(common, weights.tolist(), strict=True):
+            all_weights[date] = dict(zip(ALLOCATION_ASSETS, row, strict=True))
 
-            all_weights[date] = dict(current_weights)
+        current_weights = gate_state["current_weights"]
+        last_change_date = gate_state["last_change_date"]
 
-            w = current_weights
-            r = w["equity"] * eq_r[date] + w["bond"] * bd_r[date] + w["mmf"] * mf_r[date]
-            window_equity_vals.append((date, r))
-
-        if not window_equity_vals:
-            continue
-
-        dates, rets = zip(*window_equity_vals)
-        window_port_r = pd.Series(list(rets), index=list(dates))
+        returns = np.column_stack([eq_r.to_numpy(), bd_r.to_numpy(), mf_r.to_numpy()])
+        window_port_r = pd.Series(_weighted_returns(weights, returns), index=common)
         window_equity = (1 + window_port_r).cumprod()
         window_equity = window_equity / window_equity.iloc[0]
 
@@ -844,8 +903,9 @@ def allocation_weight_robustness(
 
     results = []
 
+    # Build the perturbed weight set of every step — one dict per window
+    step_sets = []
     for step in perturb_steps:
-        # Build perturbed weight set — one dict per window
         perturbed_windows = []
         n_floor_clamped = 0
         n_ceil_clamped = 0
@@ -902,89 +962,96 @@ def allocation_weight_robustness(
                 total_windows,
             )
 
-        # Simulate full OOS — gate state carried continuously across windows
-        current_weights = {"equity": 0.0, "bond": 0.0, "mmf": 1.0}
-        last_change_date = None
-        annual_counter = {}
-        n_reallocations = 0
-        oos_equity_slices = []
-
-        for pw in perturbed_windows:
-            test_start = pw["TestStart"]
-            test_end = pw["TestEnd"]
-            combo = {"equity": pw["w_equity"], "bond": pw["w_bond"], "mmf": pw["w_mmf"]}
-
-            test_eq_r = _slice(equity_returns, test_start, test_end)
-            test_bd_r = _slice(bond_returns, test_start, test_end)
-            test_mf_r = _slice(mmf_returns, test_start, test_end)
-            test_s_eq = _slice(sig_equity_oos, test_start, test_end)
-            test_s_bd = _slice(sig_bond_oos, test_start, test_end)
-
-            if len(test_eq_r) < 5:
-                continue
-
-            common = test_eq_r.index.intersection(test_bd_r.index).intersection(test_mf_r.index)
-            common = common.sort_values()
-
-            eq_r = test_eq_r.loc[common]
-            bd_r = test_bd_r.loc[common]
-            mf_r = test_mf_r.loc[common]
-            s_eq = test_s_eq.reindex(common).fillna(0).astype(int)
-            s_bd = test_s_bd.reindex(common).fillna(0).astype(int)
-
-            window_rets = []
-
-            for date in common:
-                target = signals_to_target_weights(
-                    sig_equity=int(s_eq[date]),
-                    sig_bond=int(s_bd[date]),
-                    weights_both_on=combo,
-                )
+        step_sets.append((step, perturbed_windows, n_floor_clamped, n_ceil_clamped))
 
-                accepted, reallocated, annual_counter = reallocation_gate(
-                    current_weights=current_weights,
-                    target_weights=target,
-                    last_change_date=last_change_date,
-                    current_date=date,
-                    cooldown_days=cooldown_days,
-                    annual_cap=annual_cap,
-                    annual_counter=annual_counter,
-                )
+    # Simulate full OOS for every step at once — one column per step, gate
+    # state per column carried continuously across windows
+    n_cols = len(step_sets)
+    current_weights = np.tile([0.0, 0.0, 1.0], (n_cols, 1))
+    last_change_dates = None
+    annual_counter = {}
+    n_reallocations = np.zeros(n_cols, dtype=int)
+    equity_parts = []
+    index_parts = []
 
-                if reallocated:
-                    current_weights = accepted
-                    last_change_date = date
-                    n_reallocations += 1
-
-                w = current_weights
-                window_rets.append(
-                    (
-                        date,
-                        w["equity"] * eq_r[date] + w["bond"] * bd_r[date] + w["mmf"] * mf_r[date],
-                    ),
-                )
+    for w_idx, (_, row) in enumerate(alloc_results_df.iterrows()):
+        test_start = pd.Timestamp(row["TestStart"])
+        test_end = pd.Timestamp(row["TestEnd"])
+
+        test_eq_r = _slice(equity_returns, test_start, test_end)
+        test_bd_r = _slice(bond_returns, test_start, test_end)
+        test_mf_r = _slice(mmf_returns, test_start, test_end)
+        test_s_eq = _slice(sig_equity_oos, test_start, test_end)
+        test_s_bd = _slice(sig_bond_oos, test_start, test_end)
 
-            if not window_rets:
-                continue
+        if len(test_eq_r) < 5:
+            continue
 
-            dates, rets = zip(*window_rets)
-            port_r = pd.Series(list(rets), index=list(dates))
-            eq_curve = (1 + port_r).cumprod()
-            eq_curve = eq_curve / eq_curve.iloc[0]
+        common = test_eq_r.index.intersection(test_bd_r.index).intersection(test_mf_r.index)
+        common = common.sort_values()
+        if common.empty:
+            continue
 
-            if oos_equity_slices:
-                eq_curve = eq_curve * oos_equity_slices[-1].iloc[-1]
-            oos_equity_slices.append(eq_curve)
+        s_eq = test_s_eq.reindex(common).fillna(0).astype(int).to_numpy()
+        s_bd = test_s_bd.reindex(common).fillna(0).astype(int).to_numpy()
+        tables = np.stack(
+            [
+                _target_weight_table(
+                    {
+                        "equity": windows[w_idx]["w_equity"],
+                        "bond": windows[w_idx]["w_bond"],
+                        "mmf": windows[w_idx]["w_mmf"],
+                    },
+                )
+                for _, windows, _, _ in step_sets
+            ],
+        )
+        # (C, 4, 3) tables -> (T, C, 3) targets
+        targets = tables[:, _signal_states(s_eq, s_bd)].transpose(1, 0, 2)
+
+        weights, n_window, gate_state = simulate_reallocation_gate_batch(
+            targets=targets,
+            dates=common,
+            current_weights=current_weights,
+            last_change_dates=last_change_dates,
+            annual_counter=annual_counter,
+            cooldown_days=cooldown_days,
+            annual_cap=annual_cap,
+        )
+        current_weights = gate_state["current_weights"]
+        last_change_dates = gate_state["last_change_dates"]
+        n_reallocations += n_window
 
-        if not oos_equity_slices:
+        returns = np.column_stack(
+            [test_eq_r.loc[common], test_bd_r.loc[common], test_mf_r.loc[common]]
+        )
+        port_r = (
+            weights[:, :, 0] * returns[:, :1]
+            + weights[:, :, 1] * returns[:, 1:2]
+            + weights[:, :, 2] * returns[:, 2:]
+        )
+        eq_curve = np.cumprod(1 + port_r, axis=0)
+        eq_curve = eq_curve / eq_curve[0]
+        if equity_parts:
+            eq_curve = eq_curve * equity_parts[-1][-1]
+        equity_parts.append(eq_curve)
+        index_parts.append(common)
+
+    if equity_parts:
+        portfolio_equity = pd.DataFrame(
+            np.concatenate(equity_parts),
+            index=index_parts[0].append(index_parts[1:]),
+        ).sort_index()
+
+    for col, (step, perturbed_windows, n_floor_clamped, n_ceil_clamped) in enumerate(step_sets):
+        if not equity_parts:
             logging.warning(
                 "Perturbation step=%.2f produced no OOS slices — skipped.",
                 step,
             )
             continue
 
-        portfolio_equity = pd.concat(oos_equity_slices).sort_index()
-        m = compute_metrics(portfolio_equity)
+        m = compute_metrics(portfolio_equity[col])
 
         w_eq_mean = np.mean([pw["w_equity"] for pw in perturbed_windows])
 
@@ -1000,7 +1067,7 @@ def allocation_weight_robustness(
                 "MaxDD": m["MaxDD"],
                 "CalMAR": m["CalMAR"],
                 "Sortino": m["Sortino"],
-                "n_reallocations": n_reallocations,
+                "n_reallocations": int(n_reallocations[col]),
             },
         )
 
@@ -1188,6 +1255,24 @@ def build_spread_prefilter(
     return prefilter
 
 
+def _bond_price_from_yield(ytm, coupon, n_years, freq):
+    """
+    Price of a par-100 fixed coupon bond at yield(s) ytm (decimal).
+
+    ytm and n_years broadcast against each other (e.g. ytm[:, None] with an
+    array of maturities gives one column per maturity). NaN where the yield
+    is missing or <= 0.
+    """
+    ytm = np.asarray(ytm, dtype=float)
+    c = coupon / freq * 100
+    r = ytm / freq
+    n = np.asarray(n_years) * freq
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        discount = (1 + r) ** -n
+        price = c * (1 - discount) / r + 100 * discount
+    return np.where(ytm > 0, price, np.nan)
+
+
 def build_yield_price_proxy(
     pl10y: pd.DataFrame,
     coupon: float = 0.05,
@@ -1217,15 +1302,10 @@ def build_yield_price_proxy(
     """
     ytm_series = pl10y.iloc[:, 1].copy() / 100  # convert % to decimal
 
-    def _price(ytm):
-        if pd.isna(ytm) or ytm <= 0:
-            return np.nan
-        c = coupon / freq * 100
-        r = ytm / freq
-        n = n_years * freq
-        return c * (1 - (1 + r) ** -n) / r + 100 * (1 + r) ** -n
-
-    prices = ytm_series.apply(_price)
+    prices = pd.Series(
+        _bond_price_from_yield(ytm_series.to_numpy(dtype=float), coupon, n_years, freq),
+        index=ytm_series.index,
+    )
 
     out = pd.DataFrame({"Zamkniecie": prices}, index=pl10y.index)
 
@@ -1243,6 +1323,46 @@ def build_yield_price_proxy(
     return out
 
 
+def build_yield_price_proxies(
+    pl10y: pd.DataFrame,
+    maturities=(2, 5, 10),
+    coupon: float = 0.05,
+    freq: int = 2,
+) -> dict:
+    """
+    Constant-maturity bond price proxies for several maturities at once.
+
+    Same pricing as build_yield_price_proxy, computed for every maturity
+    in one array call over the yield series.
+
+    Parameters
+    ----------
+    pl10y      : pd.DataFrame — PL 10Y yield (stooq CSV, close col = col index 1)
+    maturities : iterable of int — bond maturities in years
+    coupon     : float        — annual coupon rate (default 5%)
+    freq       : int          — coupon frequency per year (2 = semi-annual)
+
+    Returns
+    -------
+    dict {n_years: pd.DataFrame} — each frame as build_yield_price_proxy
+    returns it (index of pl10y, single column "Zamkniecie").
+    """
+    maturities = list(maturities)
+    ytm = pl10y.iloc[:, 1].to_numpy(dtype=float) / 100  # convert % to decimal
+    prices = _bond_price_from_yield(ytm[:, None], coupon, np.array(maturities), freq)
+
+    logging.info(
+        "Yield price proxies: %d rows x %d maturities %s",
+        len(pl10y),
+        len(maturities),
+        maturities,
+    )
+    return {
+        n_years: pd.DataFrame({"Zamkniecie": prices[:, j]}, index=pl10y.index)
+        for j, n_years in enumerate(maturities)
+    }
+
+
 def build_yield_momentum_prefilter(
     pl10y: pd.DataFrame,
     rise_threshold_bp: float = 50.0,
@@ -21,17 +21,50 @@ from moj_system.core.robustness_engine import (
     run_block_bootstrap_robustness,
     run_monte_carlo_robustness,
 )
+from moj_system.core.robustness_stats import RobustnessAggregator
 
 # Importujemy oryginalny silnik
 
 
 class RobustnessEngine:
-    def __init__(self, n_jobs=-1):
+    def __init__(
+        self,
+        n_jobs=-1,
+        adaptive=False,
+        store=None,
+        stream=False,
+        reservoir_size=500,
+        curve_reservoir_size=0,
+    ):
         self.n_jobs = n_jobs
+        # adaptive=True: n_samples becomes a cap, runs stop once the
+        # verdict against the thresholds is statistically settled
+        self.adaptive = adaptive
+        # RobustnessSampleStore: reuse per-sample results across runs
+        self.store = store
+        # stream=True: results stream into a RobustnessAggregator (flat
+        # memory) keeping reservoir_size rows and curve_reservoir_size
+        # equity curves; the tests then return the aggregator
+        self.stream = stream
+        self.reservoir_size = reservoir_size
+        self.curve_reservoir_size = curve_reservoir_size
 
-    def run_mc_test(self, wf_results, df, cash_df, n_samples=100, perturb_pct=0.20):
-        """Runs Monte Carlo parameter perturbation."""
+    def _new_aggregator(self):
+        if not self.stream:
+            return None
+        return RobustnessAggregator(
+            reservoir_size=self.reservoir_size, curve_reservoir_size=self.curve_reservoir_size,
+        )
+
+    def run_mc_test(
+        self, wf_results, df, cash_df, n_samples=100, perturb_pct=0.20, thresholds=None,
+    ):
+        """
+        Runs Monte Carlo parameter perturbation. Returns the results
+        DataFrame, or the RobustnessAggregator when streaming.
+        """
         logging.info(f"Starting MC Perturbation Test (n={n_samples})...")
+        aggregator = self._new_aggregator()
 
         windows = extract_windows_from_wf_results(wf_results)
         best_params = extract_best_params_from_wf_results(wf_results)
@@ -47,18 +80,31 @@ class RobustnessEngine:
             n_jobs=self.n_jobs,
             perturb_pct=perturb_pct,
             price_col="Zamkniecie",
+            adaptive=self.adaptive,
+            thresholds=thresholds,
+            store=self.store,
+            aggregator=aggregator,
         )
-        return mc_results_df
+        return mc_results_df if aggregator is None else aggregator
 
-    def run_bootstrap_test(self, df, cash_df, n_samples=500, **wf_kwargs):
-        """Runs Block Bootstrap history reshuffling."""
+    def run_bootstrap_test(self, df, cash_df, n_samples=500, thresholds=None, **wf_kwargs):
+        """
+        Runs Block Bootstrap history reshuffling. Returns the results
+        DataFrame, or the RobustnessAggregator when streaming.
+        """
         logging.info(f"Starting Block Bootstrap Test (n={n_samples})...")
+        aggregator = self._new_aggregator()
 
         bb_results_df = run_block_bootstrap_robustness(
             df=df,
             cash_df=cash_df,
             n_samples=n_samples,
             block_size=250,
+            adaptive=self.adaptive,
+            thresholds=thresholds,
+            store=self.store,
+            n_jobs=self.n_jobs,
+            aggregator=aggregator,
             **wf_kwargs,
         )
-        return bb_results_df
+        return bb_results_df if aggregator is None else aggregator
@@ -21,16 +21,26 @@ execution, analysis/reporting) is unchanged.
 
 import itertools
 import logging
-import os
-import random
-import sys
 import time
+from functools import partial
+from statistics import NormalDist
 
 import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
-
-from moj_system.core.strategy_engine import compute_metrics, run_strategy_with_trades, walk_forward
+from joblib import delayed
+
+from moj_system.core.executor import TaskExecutor, TaskFailure
+from moj_system.core.robustness_stats import RobustnessAggregator
+from moj_system.core.robustness_store import robustness_run_key, sample_seed_sequence
+from moj_system.core.strategy_engine import (
+    _frame_filter_on,
+    _prepare_strategy_frame,
+    _simulate_batch,
+    compute_metrics,
+    run_strategy_with_trades,
+    walk_forward,
+    walk_forward_paths,
+)
 
 
 # Hack for legacy code compatibility
@@ -61,6 +71,25 @@ MIN_VALUES = {
     "stop_loss": 0.01,
 }
 
+# Default pass/fail thresholds of analyze_robustness / analyze_bootstrap
+DEFAULT_THRESHOLDS_MC = {
+    "CAGR": {"p05_min": 0.00, "label": "p05 CAGR > 0%"},
+    "Sharpe": {"p05_min": 0.00, "label": "p05 Sharpe > 0"},
+    "MaxDD": {"p05_min": -0.35, "label": "p05 MaxDD > -35%"},
+}
+
+DEFAULT_THRESHOLDS_BOOTSTRAP = {
+    "CAGR": {"p05_min": -0.01, "label": "p05 CAGR > -1%"},
+    "Sharpe": {"p05_min": -0.10, "label": "p05 Sharpe > -0.10"},
+    "MaxDD": {"p05_min": -0.40, "label": "p05 MaxDD > -40%"},
+    "p_loss": {"max": 0.20, "label": "P(CAGR < 0) < 20%"},
+}
+
+# Fixed gates applied on top of the thresholds dicts
+MC_MAX_P_LOSS = 0.10
+MC_MIN_MEDIAN_CAGR = 0.02
+BOOTSTRAP_MIN_MEDIAN_CAGR = 0.01
+
 
 # ---------------------------------------------------------------------------
 # Step 1 — Build perturbation grid for a single window
@@ -151,7 +180,10 @@ def build_all_perturbation_grids(best_params, pct=0.20):
 
 
 def sample_universe(window_variants, rng):
-    return {w_id: rng.choice(variants) for w_id, variants in window_variants.items()}
+    """Draw one perturbed param dict per window with a NumPy Generator."""
+    return {
+        w_id: variants[rng.integers(len(variants))] for w_id, variants in window_variants.items()
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -159,8 +191,78 @@ def sample_universe(window_variants, rng):
 # ---------------------------------------------------------------------------
 
 
+def _carry_state_digest(carry_state):
+    """Exact text fingerprint of a carry state dict (None when flat)."""
+    if carry_state is None:
+        return None
+    return repr(sorted(carry_state.items()))
+
+
+def prepare_window_slices(windows, df, cash_df, funds_df=None):
+    """
+    Locate the per-window inputs of run_universe once for all samples.
+
+    Windows and data are the same for every universe, so the warmup / OOS
+    rows are resolved to integer offsets into df (sorted by date) and the
+    business-day cash calendar is built and aligned once per window.
+
+    Returns
+    -------
+    list[dict] — one entry per window:
+        i_warm, i_test, i_end   : int — df rows [i_warm, i_test) are the
+                                  warmup, [i_test, i_end) the OOS slice
+        cash_slice              : pd.DataFrame — cash_df aligned to
+                                  df.index[i_warm:i_end]
+        f_start, f_end          : int — funds_df rows of the window
+                                  (0, 0 without funds_df)
+    """
+    slices = []
+    for w in windows:
+        test_start = w["test_start"]
+        test_end = w["test_end"]
+        warmup_start = w["warmup_start"]
+
+        i_warm = int(df.index.searchsorted(warmup_start, side="left"))
+        i_test = int(df.index.searchsorted(test_start, side="left"))
+        i_end = int(df.index.searchsorted(test_end, side="left"))
+
+        cash_slice = cash_df.reindex(
+            pd.date_range(warmup_start, test_end, freq="B"),
+            method="ffill",
+        ).reindex(
+            df.index[i_warm:i_end],
+            method="ffill",
+        )
+
+        f_start = f_end = 0
+        if funds_df is not None:
+            f_start = int(funds_df.index.searchsorted(warmup_start, side="left"))
+            f_end = int(funds_df.index.searchsorted(test_end, side="left"))
+
+        slices.append(
+            {
+                "i_warm": i_warm,
+                "i_test": i_test,
+                "i_end": i_end,
+                "cash_slice": cash_slice,
+                "f_start": f_start,
+                "f_end": f_end,
+            },
+        )
+    return slices
+
+
 def run_universe(
-    universe, windows, df, cash_df, vol_window, selected_mode, funds_df=None, price_col="Zamkniecie",
+    universe,
+    windows,
+    df,
+    cash_df,
+    vol_window,
+    selected_mode,
+    funds_df=None,
+    price_col="Zamkniecie",
+    memo=None,
+    window_slices=None,
 ):
     """
     Stitch the full OOS equity curve using perturbed params — no retraining.
@@ -168,7 +270,20 @@ def run_universe(
     ATR parameters (use_atr_stop, N_atr, atr_window) are read from each
     window's param dict and forwarded to run_strategy_with_trades, so
     ATR mode is handled transparently without additional arguments.
+
+    memo : dict or None — window simulation memo shared between universes.
+        A window's OOS result depends only on the window, its params and
+        the carry state entering it, so entries are keyed on
+        (window id, params, carry state digest) and hold the normalised
+        equity slice, trade records and end state. Universes that reach
+        an already-simulated (window, params, state) reuse it.
+
+    window_slices : list or None — output of prepare_window_slices for
+        these windows; built here when None.
     """
+    if window_slices is None:
+        window_slices = prepare_window_slices(windows, df, cash_df, funds_df)
+
     equity_parts = []
     all_trades = []
     carry_state = None
@@ -177,32 +292,33 @@ def run_universe(
     for w_id, w in enumerate(windows):
         params = universe[w_id]
 
-        test_start = w["test_start"]
-        test_end = w["test_end"]
-        warmup_start = w["warmup_start"]
-
-        oos_slice = df.loc[(df.index >= test_start) & (df.index < test_end)].copy()
-
-        warmup_slice = df.loc[(df.index >= warmup_start) & (df.index < test_start)].copy()
+        memo_key = None
+        if memo is not None:
+            memo_key = (w_id, repr(sorted(params.items())), _carry_state_digest(carry_state))
+            if memo_key in memo:
+                cached = memo[memo_key]
+                if cached is None:
+                    continue
+                norm_eq, trades, end_state = cached
+                eq = norm_eq * prev_equity
+                equity_parts.append(eq)
+                all_trades.extend(trades)
+                prev_equity = eq.iloc[-1]
+                carry_state = end_state
+                continue
 
-        cash_slice = cash_df.reindex(
-            pd.date_range(warmup_start, test_end, freq="B"),
-            method="ffill",
-        ).reindex(
-            pd.concat([warmup_slice, oos_slice]).index,
-            method="ffill",
-        )
+        ws = window_slices[w_id]
+        oos_slice = df.iloc[ws["i_test"] : ws["i_end"]]
+        warmup_slice = df.iloc[ws["i_warm"] : ws["i_test"]]
+        cash_slice = ws["cash_slice"]
 
         fund_signal = None
         if params.get("filter_mode") == "fund" and funds_df is not None:
-            fund_slice = funds_df.loc[
-                (funds_df.index >= warmup_start) & (funds_df.index < test_end)
-            ]
             full_signal = compute_fund_breadth_signal(
-                fund_slice,
+                funds_df.iloc[ws["f_start"] : ws["f_end"]],
                 **params["fund_params"],
             )
-            fund_signal = full_signal.loc[full_signal.index >= test_start]
+            fund_signal = full_signal.loc[full_signal.index >= w["test_start"]]
 
         result = run_strategy_with_trades(
             oos_slice,
@@ -228,16 +344,25 @@ def run_universe(
 
         if result is None or result[0] is None:
             logging.debug("run_universe: window %d returned None, skipping", w_id)
+            if memo_key is not None:
+                memo[memo_key] = None
             continue
 
         result_df, _, trades_df, end_state = result
 
-        eq = result_df["equity"]
-        eq = eq / eq.iloc[0] * prev_equity
+        norm_eq = result_df["equity"]
+        norm_eq = norm_eq / norm_eq.iloc[0]
+        eq = norm_eq * prev_equity
 
-        equity_parts.append(eq)
+        trades = []
         if trades_df is not None and len(trades_df) > 0:
-            all_trades.extend(trades_df.to_dict("records"))
+            trades = trades_df.to_dict("records")
+
+        if memo_key is not None:
+            memo[memo_key] = (norm_eq, trades, end_state)
+
+        equity_parts.append(eq)
+        all_trades.extend(trades)
 
         prev_equity = eq.iloc[-1]
         carry_state = end_state
@@ -248,15 +373,317 @@ def run_universe(
     return pd.concat(equity_parts), all_trades
 
 
+def _window_group_key(params):
+    """Settings that shape a window's indicator frame (shared by a kernel pass)."""
+    fund_key = None
+    if params.get("filter_mode") == "fund":
+        fund_key = repr(sorted(params.get("fund_params", {}).items()))
+    return (
+        int(params["fast"]),
+        int(params["slow"]),
+        params.get("filter_mode"),
+        params.get("atr_window", 20),
+        fund_key,
+    )
+
+
+def run_universes_batch(
+    universes,
+    windows,
+    df,
+    cash_df,
+    vol_window,
+    selected_mode,
+    funds_df=None,
+    price_col="Zamkniecie",
+    window_slices=None,
+):
+    """
+    Window-major run_universe of many universes at once (equity only).
+
+    All universes advance together one window at a time. Within a window
+    the universes are grouped by the settings that shape the indicator
+    frame (fast, slow, filter mode, ATR window, fund params); each group's
+    frame is built once and a single _simulate_batch pass steps every
+    distinct (params, carry state) column of the group. Between windows
+    only the per-universe carry state (position, entry price, M, m) and
+    the last equity value are kept.
+
+    The equity curves are identical to run_universe's; no trade log is
+    built, which the Monte Carlo metrics do not need.
+
+    Returns
+    -------
+    (equities, n_passes)
+        equities : list of pd.Series or None — stitched OOS equity per universe
+        n_passes : int — _simulate_batch passes run
+    """
+    if window_slices is None:
+        window_slices = prepare_window_slices(windows, df, cash_df, funds_df)
+
+    n_universes = len(universes)
+    position = np.zeros(n_universes)
+    entry_price = np.full(n_universes, np.nan)
+    M = np.full(n_universes, np.nan)
+    m = np.full(n_universes, np.nan)
+    prev_equity = np.ones(n_universes)
+    value_parts = [[] for _ in range(n_universes)]
+    index_parts = [[] for _ in range(n_universes)]
+    n_passes = 0
+
+    for w_id, w in enumerate(windows):
+        ws = window_slices[w_id]
+        oos_slice = df.iloc[ws["i_test"] : ws["i_end"]]
+        warmup_slice = df.iloc[ws["i_warm"] : ws["i_test"]]
+        if len(oos_slice) == 0:
+            # No OOS rows: run_universe skips the window, carry state unchanged
+            continue
+
+        groups = {}
+        for u, universe in enumerate(universes):
+            groups.setdefault(_window_group_key(universe[w_id]), []).append(u)
+
+        for members in groups.values():
+            params = universes[members[0]][w_id]
+            fund_signal = None
+            if params.get("filter_mode") == "fund" and funds_df is not None:
+                full_signal = compute_fund_breadth_signal(
+                    funds_df.iloc[ws["f_start"] : ws["f_end"]],
+                    **params["fund_params"],
+                )
+                fund_signal = full_signal.loc[full_signal.index >= w["test_start"]]
+
+            frame, _, _, _ = _prepare_strategy_frame(
+                oos_slice,
+                price_col=price_col,
+                fast=int(params["fast"]),
+                slow=int(params["slow"]),
+                vol_window=vol_window,
+                filter_mode=params.get("filter_mode"),
+                cash_df=ws["cash_slice"],
+                warmup_df=warmup_slice if len(warmup_slice) > 0 else None,
+                fund_signal=fund_signal,
+                atr_window=params.get("atr_window", 20),
+            )
+            warmup = frame["_warmup"].to_numpy(dtype=bool)
+            if (~warmup).sum() == 0:
+                # Only warm-up rows left: skipped as in run_universe
+                continue
+
+            # One kernel column per distinct (params, carry state): early
+            # windows, entered flat by every universe, repeat many columns.
+            columns = {}
+            member_column = []
+            for u in members:
+                p = universes[u][w_id]
+                use_atr = bool(p.get("use_atr_stop", False))
+                key = (
+                    p.get("N_atr", 0.10) if use_atr else p.get("X", 0.10),
+                    p["Y"],
+                    p["stop_loss"],
+                    # "N/A" / None in full mode, where target vol is unused
+                    pd.to_numeric(p.get("target_vol"), errors="coerce"),
+                    use_atr,
+                    position[u],
+                    entry_price[u],
+                    M[u],
+                    m[u],
+                )
+                member_column.append(columns.setdefault(key, len(columns)))
+            cols = np.array(list(columns), dtype=float).T
+            member_column = np.array(member_column)
+            members = np.array(members)
+
+            curve, state = _simulate_batch(
+                frame["price"].to_numpy(),
+                frame["ret"].to_numpy(),
+                frame["cash_ret"].to_numpy(),
+                _frame_filter_on(frame, params.get("filter_mode"), fund_signal),
+                frame["vol"].to_numpy(),
+                frame["atr"].to_numpy(),
+                stop_vals=cols[0],
+                Y_vals=cols[1],
+                stop_losses=cols[2],
+                target_vols=cols[3],
+                use_atr_stop=cols[4].astype(bool),
+                position_mode=selected_mode,
+                warmup=warmup if warmup.any() else None,
+                initial_state={
+                    "position": cols[5],
+                    "entry_price": cols[6],
+                    "M": cols[7],
+                    "m": cols[8],
+                },
+            )
+            n_passes += 1
+
+            # Same normalisation as run_strategy_with_trades + run_universe
+            curve = curve[:, ~warmup]
+            first_val = curve[:, :1]
+            curve = np.divide(curve, first_val, out=curve.copy(), where=first_val != 0)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                curve = curve / curve[:, :1]
+            oos_index = frame.index[~warmup]
+
+            # A flat end state is not carried (run_universe passes None)
+            held = state["position"] > 0
+            position[members] = np.where(held, state["position"], 0.0)[member_column]
+            entry_price[members] = np.where(held, state["entry_price"], np.nan)[member_column]
+            M[members] = np.where(held, state["M"], np.nan)[member_column]
+            m[members] = np.where(held, state["m"], np.nan)[member_column]
+
+            for u, col in zip(members, member_column, strict=True):
+                eq = curve[col] * prev_equity[u]
+                value_parts[u].append(eq)
+                index_parts[u].append(oos_index)
+                prev_equity[u] = eq[-1]
+
+    equities = []
+    for values, indexes in zip(value_parts, index_parts, strict=True):
+        if not values:
+            equities.append(None)
+            continue
+        equities.append(
+            pd.Series(np.concatenate(values), index=indexes[0].append(indexes[1:]), name="equity"),
+        )
+    return equities, n_passes
+
+
+# ---------------------------------------------------------------------------
+# Sequential early stopping (MC and bootstrap)
+# ---------------------------------------------------------------------------
+
+
+def robustness_gates(thresholds, kind="mc"):
+    """
+    Sample-statistic gates of analyze_robustness (kind="mc") or
+    analyze_bootstrap (kind="bootstrap") that early stopping tracks.
+
+    Returns a list of (stat, metric, q, limit) tuples:
+        ("quantile", metric, q, limit)   — passes when quantile q >= limit
+        ("p_loss", "CAGR", None, limit)  — passes when P(CAGR < 0) < limit
+
+    The baseline comparisons (P(worse than baseline), baseline vs p95)
+    and the MC CAGR range ratio are not tracked: their verdict can change
+    with the baseline rather than with the sample count.
+    """
+    gates = [
+        ("quantile", metric, 0.05, cfg["p05_min"])
+        for metric, cfg in thresholds.items()
+        if "p05_min" in cfg
+    ]
+    if kind == "mc":
+        gates.append(("p_loss", "CAGR", None, MC_MAX_P_LOSS))
+        gates.append(("quantile", "CAGR", 0.50, MC_MIN_MEDIAN_CAGR))
+    else:
+        gates.append(("p_loss", "CAGR", None, thresholds["p_loss"]["max"]))
+        gates.append(("quantile", "CAGR", 0.50, BOOTSTRAP_MIN_MEDIAN_CAGR))
+    return gates
+
+
+def gates_settled(results_df, gates, confidence=0.95):
+    """
+    True when every gate's pass/fail decision is stable at confidence.
+
+    A quantile gate is settled when the distribution-free (order
+    statistic, normal approximation of the binomial rank) confidence
+    interval of the quantile lies entirely on one side of the limit; the
+    loss-probability gate uses the Wilson interval of P(CAGR < 0).
+    A p05 interval needs about 80 samples at 95% before it can close.
+
+    results_df may also be a RobustnessAggregator; order statistics and
+    the loss count then come from its sketches (exact while uncompressed).
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+
+    for stat, metric, q, limit in gates:
+        if isinstance(results_df, RobustnessAggregator):
+            if not results_df.has_metric(metric):
+                continue
+            sketch = results_df.sketches[metric]
+            n = sketch.count
+            value_at_rank = sketch.value_at_rank
+            count_below = sketch.count_below
+        else:
+            if metric not in results_df.columns:
+                continue
+            x = np.sort(results_df[metric].dropna().to_numpy())
+            n = len(x)
+            value_at_rank = x.__getitem__
+            count_below = partial(np.searchsorted, x, side="left")
+        if n == 0:
+            return False
+
+        if stat == "quantile":
+            half = z * np.sqrt(n * q * (1 - q))
+            lo_rank = int(np.floor(n * q - half))
+            hi_rank = int(np.ceil(n * q + half))
+            if lo_rank < 0 or hi_rank > n - 1:
+                return False
+            if value_at_rank(lo_rank) < limit <= value_at_rank(hi_rank):
+                return False
+        else:
+            p = float(count_below(0.0)) / n
+            centre = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+            half = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+            if centre - half <= limit <= centre + half:
+                return False
+
+    return True
+
+
+def _feed_aggregator(aggregator, samples, curves, start, stop):
+    """
+    Feed samples[start:stop] (None = failed) with their curves in index
+    order and drop them from samples / curves; return the new start.
+    """
+    for i in range(start, stop):
+        aggregator.update(samples.pop(i, None), curve=curves.pop(i, None))
+    return max(start, stop)
+
+
+def _as_aggregator(results):
+    """RobustnessAggregator of a results DataFrame (aggregators pass through)."""
+    if isinstance(results, RobustnessAggregator):
+        return results
+    return RobustnessAggregator.from_frame(results)
+
+
+def _log_effective_samples(results_df):
+    """Log the effective sample count of an early-stopped run."""
+    if results_df.attrs.get("stopped_early"):
+        logging.info(
+            "Sequential stopping: verdict settled after %d of %d requested samples.",
+            len(results_df),
+            results_df.attrs["n_requested"],
+        )
+
+
 # ---------------------------------------------------------------------------
 # Step 5 — Single sample runner
 # ---------------------------------------------------------------------------
 
 
 def _run_single_sample(
-    seed, window_variants, windows, df, cash_df, vol_window, selected_mode, funds_df, price_col,
+    index,
+    base_seed,
+    window_variants,
+    windows,
+    df,
+    cash_df,
+    vol_window,
+    selected_mode,
+    funds_df,
+    price_col,
+    memo=None,
+    window_slices=None,
+    return_curve=False,
 ):
-    rng = random.Random(seed)
+    """
+    Metrics row of Monte Carlo sample index (None without OOS equity);
+    with return_curve=True a (row, equity) pair.
+    """
+    rng = np.random.default_rng(sample_seed_sequence(base_seed, index))
     universe = sample_universe(window_variants, rng)
 
     equity, trades = run_universe(
@@ -268,15 +695,97 @@ def _run_single_sample(
         selected_mode,
         funds_df,
         price_col=price_col,
+        memo=memo,
+        window_slices=window_slices,
     )
 
     if equity is None:
-        return None
+        return (None, None) if return_curve else None
 
     metrics = compute_metrics(equity)
     metrics = {k: float(v) for k, v in metrics.items()}
-    metrics["seed"] = seed
-    return metrics
+    metrics["sample"] = index
+    return (metrics, equity) if return_curve else metrics
+
+
+def _run_sample_chunk(
+    indices,
+    base_seed,
+    window_variants,
+    windows,
+    df,
+    cash_df,
+    vol_window,
+    selected_mode,
+    funds_df,
+    price_col,
+    window_slices=None,
+    window_major=True,
+    return_curves=False,
+):
+    """
+    Run a block of samples.
+
+    window_major=True advances all universes of the block together through
+    run_universes_batch; otherwise each sample walks the windows on its
+    own against one window memo shared by the block.
+
+    Returns ({sample index: result}, n_simulated, {sample index: equity})
+    where n_simulated is the number of window simulations actually run
+    for the block (kernel passes in window-major mode); the equity curves
+    are only collected with return_curves=True.
+    """
+    results = {}
+    curves = {}
+    if window_major:
+        universes = [
+            sample_universe(
+                window_variants, np.random.default_rng(sample_seed_sequence(base_seed, i))
+            )
+            for i in indices
+        ]
+        equities, n_passes = run_universes_batch(
+            universes,
+            windows,
+            df,
+            cash_df,
+            vol_window,
+            selected_mode,
+            funds_df,
+            price_col=price_col,
+            window_slices=window_slices,
+        )
+        for i, equity in zip(indices, equities, strict=True):
+            if equity is None:
+                results[i] = None
+                continue
+            metrics = {k: float(v) for k, v in compute_metrics(equity).items()}
+            metrics["sample"] = i
+            results[i] = metrics
+            if return_curves:
+                curves[i] = equity
+        return results, n_passes, curves
+
+    memo = {}
+    for i in indices:
+        results[i], curve = _run_single_sample(
+            index=i,
+            base_seed=base_seed,
+            window_variants=window_variants,
+            windows=windows,
+            df=df,
+            cash_df=cash_df,
+            vol_window=vol_window,
+            selected_mode=selected_mode,
+            funds_df=funds_df,
+            price_col=price_col,
+            memo=memo,
+            window_slices=window_slices,
+            return_curve=True,
+        )
+        if return_curves and curve is not None:
+            curves[i] = curve
+    return results, len(memo), curves
 
 
 # ---------------------------------------------------------------------------
@@ -297,12 +806,48 @@ def run_monte_carlo_robustness(
     perturb_pct=0.20,
     seed=42,
     price_col="Zamkniecie",
+    adaptive=False,
+    thresholds=None,
+    batch_size=50,
+    confidence=0.95,
+    min_samples=100,
+    store=None,
+    aggregator=None,
+    window_major=True,
 ):
     """
     Run the full Monte Carlo robustness test.
 
     ATR stop mode is detected automatically from best_params — no
     additional arguments are required from the caller.
+
+    Sample i draws its universe from SeedSequence(seed, spawn_key=(i,)),
+    independent of n_samples. With store (a RobustnessSampleStore) the
+    results of already computed indices of this configuration are
+    reused and only the missing ones are run; every finished batch of
+    batch_size samples is written back as it completes.
+
+    adaptive=True runs the sample indices in batches of batch_size and
+    stops once at least min_samples are done and every analyze_robustness
+    gate (robustness_gates of thresholds, default DEFAULT_THRESHOLDS_MC)
+    is settled at confidence; n_samples is then the cap. Samples are
+    always the index prefix 0, 1, ... so a stopped run equals the first
+    samples of a full one. results_df.attrs holds n_requested and
+    stopped_early.
+
+    aggregator (a fresh RobustnessAggregator) switches to streaming: each
+    finished chunk is fed to it in index order (interim percentiles are
+    logged as it fills) and its per-sample results, and equity curves
+    when aggregator.keep_curves, are dropped once fed, so memory stays
+    flat in n_samples. Adaptive gates are then read from its sketches,
+    and the returned results_df holds only its reservoir rows; pass the
+    aggregator to analyze_robustness for the report.
+
+    window_major=True (default) simulates each worker's block of samples
+    window by window, all universes of the block in one batched kernel
+    pass per frame setting (run_universes_batch); False walks every
+    sample through run_universe with a per-block window memo. Results
+    are identical either way.
     """
     t_start = time.time()
 
@@ -333,75 +878,181 @@ def run_monte_carlo_robustness(
             len(variants),
         )
 
-    logging.info("Timing single sample...")
-    t0 = time.time()
-    _run_single_sample(
-        seed=seed,
-        window_variants=window_variants,
-        windows=windows,
-        df=df,
-        cash_df=cash_df,
-        vol_window=vol_window,
-        selected_mode=selected_mode,
-        funds_df=funds_df,
-        price_col=price_col,
-    )
-    single_ms = (time.time() - t0) * 1000
-    est_total_s = 2 * single_ms * n_samples / max(n_jobs, 1) / 1000
-    logging.info(
-        "Single sample: %.0fms -> estimated total (x2): %.0fs (~%.1f min) on %d jobs",
-        single_ms,
-        est_total_s,
-        est_total_s / 60,
-        n_jobs,
-    )
+    # Window offsets and aligned cash are sample-independent: build them
+    # once here instead of once per sample and window.
+    window_slices = prepare_window_slices(windows, df, cash_df, funds_df)
+
+    samples = {}
+    curves = {}
+    stream = aggregator is not None
+    keep_curves = stream and aggregator.keep_curves
+    if store is not None:
+        store_key = robustness_run_key(
+            "mc",
+            best_params=best_params,
+            windows=windows,
+            df=df,
+            cash_df=cash_df,
+            funds_df=funds_df,
+            vol_window=vol_window,
+            selected_mode=selected_mode,
+            perturb_pct=perturb_pct,
+            seed=seed,
+            price_col=price_col,
+        )
+        samples = {i: r for i, r in store.load(store_key).items() if i < n_samples}
+        logging.info("Sample store: %d of %d samples already computed.", len(samples), n_samples)
+
+    chunk_kwargs = {
+        "base_seed": seed,
+        "window_variants": window_variants,
+        "windows": windows,
+        "df": df,
+        "cash_df": cash_df,
+        "vol_window": vol_window,
+        "selected_mode": selected_mode,
+        "funds_df": funds_df,
+        "price_col": price_col,
+        "window_slices": window_slices,
+    }
+
+    missing = [i for i in range(n_samples) if i not in samples]
+    n_computed = 0
+    unsaved = {}
+    if missing:
+        logging.info("Timing single sample...")
+        t0 = time.time()
+        result, curve = _run_single_sample(index=missing[0], return_curve=True, **chunk_kwargs)
+        samples[missing[0]] = unsaved[missing[0]] = result
+        if keep_curves and curve is not None:
+            curves[missing[0]] = curve
+        n_computed += 1
+        single_ms = (time.time() - t0) * 1000
+        est_total_s = 2 * single_ms * len(missing) / max(n_jobs, 1) / 1000
+        logging.info(
+            "Single sample: %.0fms -> estimated total (x2): %.0fs (~%.1f min) on %d jobs",
+            single_ms,
+            est_total_s,
+            est_total_s / 60,
+            n_jobs,
+        )
 
-    try:
-        raw_results = Parallel(n_jobs=n_jobs, backend="loky")(
-            delayed(_run_single_sample)(
-                seed=seed + i,
-                window_variants=window_variants,
-                windows=windows,
-                df=df,
-                cash_df=cash_df,
-                vol_window=vol_window,
-                selected_mode=selected_mode,
-                funds_df=funds_df,
-                price_col=price_col,
+    # One contiguous block of missing indices per worker (per batch): in
+    # window-major mode the block's universes advance together through the
+    # batched kernel, otherwise each block has its own window memo and its
+    # samples share every (window, params, carry state) simulation already
+    # run for an earlier sample of the block.
+    # With a store every batch is flushed to disk as it completes, so an
+    # interrupted run resumes from the last finished batch. When streaming,
+    # blocks hold at most batch_size samples and the aggregator takes each
+    # one as soon as the index prefix before it is complete.
+    indices = list(range(n_samples))
+    executor = TaskExecutor(n_jobs=n_jobs, label="Monte Carlo")
+    n_chunks = max(1, min(n_samples, executor.effective_jobs))
+    log_every = max(1, n_samples // 20)
+    if adaptive:
+        gates = robustness_gates(thresholds or DEFAULT_THRESHOLDS_MC, kind="mc")
+    if adaptive or store is not None:
+        batches = [indices[i : i + batch_size] for i in range(0, n_samples, batch_size)]
+    else:
+        batches = [indices]
+
+    def _run_batches(run_chunks):
+        n_simulated = 0
+        n_fed = 0
+        for batch in batches:
+            n_done = batch[-1] + 1
+            todo = [i for i in batch if i not in samples]
+            for chunk_samples, n_sim, chunk_curves in run_chunks(todo):
+                samples.update(chunk_samples)
+                unsaved.update(chunk_samples)
+                curves.update(chunk_curves)
+                n_simulated += n_sim
+                if stream:
+                    prefix = n_fed
+                    while prefix < n_done and prefix in samples:
+                        prefix += 1
+                    n_before = n_fed
+                    n_fed = _feed_aggregator(aggregator, samples, curves, n_fed, prefix)
+                    if n_fed // log_every > n_before // log_every:
+                        logging.info("Monte Carlo interim: %s", aggregator.partial_report())
+            if store is not None and unsaved:
+                store.save(store_key, unsaved)
+                unsaved.clear()
+            if stream:
+                # Samples of a chunk that failed everywhere are fed as failed
+                n_fed = _feed_aggregator(aggregator, samples, curves, n_fed, n_done)
+            if adaptive and min_samples <= n_done < n_samples:
+                if stream:
+                    settled = gates_settled(aggregator, gates, confidence)
+                else:
+                    done = [samples[i] for i in range(n_done) if samples.get(i) is not None]
+                    settled = gates_settled(pd.DataFrame(done), gates, confidence)
+                if settled:
+                    return n_done, n_simulated, True
+        return n_samples, n_simulated, False
+
+    def _todo_chunks(todo):
+        chunk_size = -(-len(todo) // n_chunks)
+        if stream:
+            chunk_size = min(chunk_size, batch_size)
+        return [todo[i : i + chunk_size] for i in range(0, len(todo), chunk_size)]
+
+    # A failed chunk is re-submitted on its own and a failed pool hands
+    # only the chunks still missing to the next backend; samples of a
+    # chunk that failed everywhere count as failed (and are not stored).
+    def _run_chunks(todo):
+        nonlocal n_computed
+        if not todo:
+            return
+        chunk_results = executor.imap(
+            delayed(_run_sample_chunk)(
+                chunk, window_major=window_major, return_curves=keep_curves, **chunk_kwargs,
             )
-            for i in range(n_samples)
+            for chunk in _todo_chunks(todo)
         )
-        logging.info("Monte Carlo completed using multiprocessing backend.")
-    except Exception as e:
-        logging.warning(
-            "Parallel execution failed (%s) — falling back to sequential.",
-            e,
+        for _, result in chunk_results:
+            if not isinstance(result, TaskFailure):
+                n_computed += len(result[0])
+                yield result
+
+    n_run, n_simulated, stopped_early = _run_batches(_run_chunks)
+
+    logging.info(
+        "%s: %d window simulations run for %d sample-windows (%.1fx reuse)",
+        "Window-major kernel" if window_major else "Window memo",
+        n_simulated,
+        n_computed * len(windows),
+        n_computed * len(windows) / max(n_simulated, 1),
+    )
+    if stopped_early:
+        logging.info(
+            "Sequential stopping: all gates settled at %.0f%% confidence after %d of %d samples.",
+            confidence * 100,
+            n_run,
+            n_samples,
         )
-        raw_results = [
-            _run_single_sample(
-                seed=seed + i,
-                window_variants=window_variants,
-                windows=windows,
-                df=df,
-                cash_df=cash_df,
-                vol_window=vol_window,
-                selected_mode=selected_mode,
-                funds_df=funds_df,
-            )
-            for i in range(n_samples)
-        ]
 
-    valid = [r for r in raw_results if r is not None]
-    n_failed = n_samples - len(valid)
+    if stream:
+        n_valid = len(aggregator)
+        n_failed = aggregator.n_failed
+        results_df = aggregator.frame()
+        aggregator.attrs.update(n_requested=n_samples, stopped_early=stopped_early)
+    else:
+        valid = [samples[i] for i in range(n_run) if samples.get(i) is not None]
+        n_valid = len(valid)
+        n_failed = n_run - n_valid
+        results_df = pd.DataFrame(valid)
     if n_failed > 0:
         logging.warning("%d samples returned None and were dropped.", n_failed)
 
-    results_df = pd.DataFrame(valid)
+    results_df.attrs["n_requested"] = n_samples
+    results_df.attrs["stopped_early"] = stopped_early
 
     elapsed = time.time() - t_start
     logging.info(
         "Monte Carlo finished: %d valid samples in %.1fs (%.1f min)",
-        len(valid),
+        n_valid,
         elapsed,
         elapsed / 60,
     )
@@ -415,18 +1066,21 @@ def run_monte_carlo_robustness(
 
 
 def analyze_robustness(results_df, baseline_metrics, thresholds=None):
+    """
+    Monte Carlo report and verdict. results_df is the DataFrame of
+    run_monte_carlo_robustness or a RobustnessAggregator fed while the run
+    streams (percentiles then come from its sketches).
+    """
     if thresholds is None:
-        thresholds = {
-            "CAGR": {"p05_min": 0.00, "label": "p05 CAGR > 0%"},
-            "Sharpe": {"p05_min": 0.00, "label": "p05 Sharpe > 0"},
-            "MaxDD": {"p05_min": -0.35, "label": "p05 MaxDD > -35%"},
-        }
+        thresholds = DEFAULT_THRESHOLDS_MC
+    agg = _as_aggregator(results_df)
 
     metrics_to_show = ["CAGR", "Vol", "Sharpe", "MaxDD", "CalMAR"]
     summary = {}
 
     logging.info("=" * 80)
     logging.info("MONTE CARLO ROBUSTNESS REPORT  (n=%d samples)", len(results_df))
+    _log_effective_samples(results_df)
     logging.info("=" * 80)
 
     header = f"{'Metric':<10} {'Baseline':>10} {'Mean':>10} {'p05':>10} "
@@ -435,30 +1089,19 @@ def analyze_robustness(results_df, baseline_metrics, thresholds=None):
     logging.info("-" * 90)
 
     for col in metrics_to_show:
-        if col not in results_df.columns:
+        if not agg.has_metric(col):
             continue
 
         base = baseline_metrics.get(col, float("nan"))
-        mean = results_df[col].mean()
-        p05 = results_df[col].quantile(0.05)
-        p25 = results_df[col].quantile(0.25)
-        med = results_df[col].median()
-        p75 = results_df[col].quantile(0.75)
-        p95 = results_df[col].quantile(0.95)
-
-        if col == "MaxDD":
-            p_worse = (results_df[col] < base).mean()
-        else:
-            p_worse = (results_df[col] < base).mean()
+        stats = agg.describe(col)
+        mean, p05, p25, med, p75, p95 = (
+            stats[k] for k in ("mean", "p05", "p25", "median", "p75", "p95")
+        )
+        p_worse = agg.fraction_below(col, base)
 
         summary[col] = {
             "baseline": base,
-            "mean": mean,
-            "p05": p05,
-            "p25": p25,
-            "median": med,
-            "p75": p75,
-            "p95": p95,
+            **stats,
             "p_worse_than_baseline": p_worse,
         }
 
@@ -491,13 +1134,13 @@ def analyze_robustness(results_df, baseline_metrics, thresholds=None):
                 f"{cfg['label']}  [actual p05={p05_val:.3f}]",
             )
 
-    p_loss = (results_df["CAGR"] < 0).mean()
+    p_loss = agg.p_loss
     summary["p_loss"] = p_loss
     loss_label = f"P(CAGR < 0) = {p_loss:.1%}"
-    if p_loss < 0.10:
+    if p_loss < MC_MAX_P_LOSS:
         passes.append(loss_label)
     else:
-        fails.append(f"P(CAGR < 0) < 10%  [actual {p_loss:.1%}]")
+        fails.append(f"P(CAGR < 0) < {MC_MAX_P_LOSS:.0%}  [actual {p_loss:.1%}]")
 
     for metric in ["CAGR", "Sharpe"]:
         if metric not in summary:
@@ -514,12 +1157,13 @@ def analyze_robustness(results_df, baseline_metrics, thresholds=None):
             )
 
     median_cagr = summary["CAGR"]["median"]
-    if median_cagr < 0.02:
+    if median_cagr < MC_MIN_MEDIAN_CAGR:
         fails.append(
-            f"Median CAGR = {median_cagr:.1%}  [typical universe performs poorly, threshold 2%]",
+            f"Median CAGR = {median_cagr:.1%}  "
+            f"[typical universe performs poorly, threshold {MC_MIN_MEDIAN_CAGR:.0%}]",
         )
     else:
-        passes.append(f"Median CAGR = {median_cagr:.1%}  [> 2% threshold]")
+        passes.append(f"Median CAGR = {median_cagr:.1%}  [> {MC_MIN_MEDIAN_CAGR:.0%} threshold]")
 
     cagr_range = summary["CAGR"]["p95"] - summary["CAGR"]["p05"]
     cagr_median = summary["CAGR"]["median"]
@@ -546,6 +1190,7 @@ def analyze_robustness(results_df, baseline_metrics, thresholds=None):
     logging.info("=" * 80)
 
     summary["verdict"] = verdict
+    summary["n_samples"] = len(results_df)
     return summary
 
 
@@ -606,71 +1251,124 @@ def extract_best_params_from_wf_results(wf_results):
 # =====================================================================
 
 
-def block_bootstrap_history(df, price_col, cash_col, block_size=250, seed=None):
+def bootstrap_return_arrays(df, price_col, cash_col):
     """
-    Reshuffle (index_return, cash_return) pairs in blocks.
-    """
-    rng = np.random.default_rng(seed)
+    Aligned (index_return, cash_return) pairs that block bootstrap samples.
 
+    Returns
+    -------
+    (index, idx_ret, cash_ret)
+        index    : pd.DatetimeIndex — dates of the aligned return pairs
+        idx_ret  : np.ndarray — index returns
+        cash_ret : np.ndarray — cash returns
+    """
     idx_ret = df[price_col].pct_change().dropna()
     cash_ret = df[cash_col].pct_change().dropna()
 
     aligned = pd.concat([idx_ret, cash_ret], axis=1).dropna()
     aligned.columns = ["idx_ret", "cash_ret"]
+    return (
+        aligned.index,
+        aligned["idx_ret"].to_numpy(),
+        aligned["cash_ret"].to_numpy(),
+    )
 
-    n = len(aligned)
-    block_starts = list(range(0, n - block_size + 1, block_size))
-    n_blocks_needed = int(np.ceil(n / block_size))
-    sampled_idx = rng.choice(len(block_starts), size=n_blocks_needed, replace=True)
 
-    reshuffled = pd.concat(
-        [aligned.iloc[block_starts[i] : block_starts[i] + block_size] for i in sampled_idx],
+def block_bootstrap_indices(n, block_size, seeds):
+    """
+    Gather indices of block-bootstrapped histories, one row per seed.
+
+    Row k reshuffles the n return pairs in non-overlapping blocks of
+    block_size drawn with np.random.default_rng(seeds[k]), truncated to n.
+    A synthetic path is then a single fancy-index: returns[indices[k]].
+
+    Returns
+    -------
+    np.ndarray — int array of shape (len(seeds), n)
+    """
+    if len(seeds) == 0:
+        return np.empty((0, n), dtype=int)
+    block_starts = np.arange(0, n - block_size + 1, block_size)
+    n_blocks_needed = int(np.ceil(n / block_size))
+    picks = np.stack(
+        [
+            np.random.default_rng(s).choice(len(block_starts), size=n_blocks_needed, replace=True)
+            for s in seeds
+        ],
     )
+    gather = block_starts[picks][:, :, None] + np.arange(block_size)
+    return gather.reshape(len(seeds), -1)[:, :n]
 
-    reshuffled = reshuffled.iloc[:n].reset_index(drop=True)
 
-    synthetic_price = (1 + reshuffled["idx_ret"]).cumprod()
-    synthetic_cash = (1 + reshuffled["cash_ret"]).cumprod()
+def block_bootstrap_history(df, price_col, cash_col, block_size=250, seed=None):
+    """
+    Reshuffle (index_return, cash_return) pairs in blocks.
+    """
+    index, idx_ret, cash_ret = bootstrap_return_arrays(df, price_col, cash_col)
+    gather = block_bootstrap_indices(len(index), block_size, [seed])[0]
 
-    out = df.loc[aligned.index].copy().reset_index(drop=True)
-    out[price_col] = synthetic_price.values
-    out[cash_col] = synthetic_cash.values
-    out.index = aligned.index
+    out = df.loc[index].copy()
+    out[price_col] = np.cumprod(1 + idx_ret[gather])
+    out[cash_col] = np.cumprod(1 + cash_ret[gather])
     return out
 
 
+def _synthetic_history(gather, dates, idx_ret, cash_ret, price_col, cash_price_col):
+    """(synthetic_df, synthetic_cash) of one gather row, stamped with dates."""
+    synthetic_df = pd.DataFrame(
+        {price_col: np.cumprod(1 + idx_ret[gather])},
+        index=dates,
+    )
+    synthetic_cash = pd.DataFrame(
+        {cash_price_col: np.cumprod(1 + cash_ret[gather])},
+        index=dates,
+    )
+    return synthetic_df, synthetic_cash
+
+
+def _bootstrap_result(i, equity):
+    """Metrics row of bootstrap sample i, or None without OOS equity."""
+    if equity is None or equity.empty:
+        return None
+
+    m = compute_metrics(equity)
+    return {
+        "sample": i,
+        "CAGR": m["CAGR"],
+        "Sharpe": m["Sharpe"],
+        "MaxDD": m["MaxDD"],
+        "CalMAR": m["CalMAR"],
+        "Sortino": m.get("Sortino", np.nan),
+    }
+
+
 def _bootstrap_single_sample(
     i,
-    combined,
-    df,
-    cash_df,
+    gather,
+    dates,
+    idx_ret,
+    cash_ret,
     price_col,
     cash_price_col,
-    block_size,
     wf_kwargs,
+    return_curve=False,
 ):
     """
     Single bootstrap sample — designed for joblib.Parallel dispatch.
     ATR parameters are forwarded via wf_kwargs transparently.
+
+    gather is this sample's row of block_bootstrap_indices; idx_ret and
+    cash_ret are the shared return arrays (memmapped by joblib for large
+    histories), and the synthetic history is stamped with dates.
+    With return_curve=True a (result, OOS equity) pair is returned.
     """
     wf_kwargs_inner = {**wf_kwargs, "n_jobs": 1}
 
     try:
-        synthetic = block_bootstrap_history(
-            combined,
-            price_col,
-            "cash_price",
-            block_size=block_size,
-            seed=i,
+        synthetic_df, synthetic_cash = _synthetic_history(
+            gather, dates, idx_ret, cash_ret, price_col, cash_price_col,
         )
 
-        n_synth = len(synthetic)
-        synthetic_df = combined.iloc[:n_synth, [combined.columns.get_loc(price_col)]].copy()
-        synthetic_df[price_col] = synthetic[price_col].values
-        synthetic_cash = combined.iloc[:n_synth][["cash_price"]].copy()
-        synthetic_cash = synthetic_cash.rename(columns={"cash_price": cash_price_col})
-        synthetic_cash[cash_price_col] = synthetic["cash_price"].values
-
         logging.debug(
             "Bootstrap %d: synthetic_df=%d, synthetic_cash=%d, "
             "synthetic_df.index[0]=%s, synthetic_df.index[-1]=%s",
@@ -686,25 +1384,88 @@ def _bootstrap_single_sample(
             cash_df=synthetic_cash,
             **wf_kwargs_inner,
         )
-
-        if equity is None or equity.empty:
-            return None
-
-        m = compute_metrics(equity)
-        return {
-            "sample": i,
-            "CAGR": m["CAGR"],
-            "Sharpe": m["Sharpe"],
-            "MaxDD": m["MaxDD"],
-            "CalMAR": m["CalMAR"],
-            "Sortino": m.get("Sortino", np.nan),
-        }
+        result = _bootstrap_result(i, equity)
+        if return_curve:
+            return result, equity if result is not None else None
+        return result
 
     except Exception as e:
         import traceback
 
         logging.warning("Bootstrap sample %d failed: %s\n%s", i, e, traceback.format_exc())
-        return None
+        return (None, None) if return_curve else None
+
+
+def _bootstrap_sample_chunk(
+    indices,
+    gathers,
+    dates,
+    idx_ret,
+    cash_ret,
+    price_col,
+    cash_price_col,
+    wf_kwargs,
+    return_curves=False,
+):
+    """
+    Several bootstrap samples in one task — designed for joblib.Parallel
+    dispatch. The synthetic histories share dates, so walk_forward_paths
+    evaluates the grid of every window across all of them in stacked
+    kernel passes. If that fails, the samples are run one by one
+    (_bootstrap_single_sample), so one bad sample does not drop the chunk.
+
+    Returns
+    -------
+    (results, curves) — result (or None) per index, as
+    _bootstrap_single_sample, and the OOS equity per index (None for a
+    failed sample, all None unless return_curves=True)
+    """
+    wf_kwargs_inner = {**wf_kwargs, "n_jobs": 1}
+
+    try:
+        histories = [
+            _synthetic_history(gather, dates, idx_ret, cash_ret, price_col, cash_price_col)
+            for gather in gathers
+        ]
+        outputs = walk_forward_paths(
+            [synthetic_df for synthetic_df, _ in histories],
+            [synthetic_cash for _, synthetic_cash in histories],
+            **wf_kwargs_inner,
+        )
+        results = [
+            _bootstrap_result(i, equity)
+            for i, (equity, _, _) in zip(indices, outputs, strict=True)
+        ]
+        curves = [
+            equity if return_curves and result is not None else None
+            for result, (equity, _, _) in zip(results, outputs, strict=True)
+        ]
+        return results, curves
+
+    except Exception as e:
+        logging.warning(
+            "Stacked bootstrap samples %d-%d failed: %s - running them one by one.",
+            indices[0],
+            indices[-1],
+            e,
+        )
+        pairs = [
+            _bootstrap_single_sample(
+                i,
+                gather,
+                dates,
+                idx_ret,
+                cash_ret,
+                price_col,
+                cash_price_col,
+                wf_kwargs,
+                return_curve=return_curves,
+            )
+            for i, gather in zip(indices, gathers, strict=True)
+        ]
+        if not return_curves:
+            return pairs, [None] * len(pairs)
+        return [result for result, _ in pairs], [curve for _, curve in pairs]
 
 
 def run_block_bootstrap_robustness(
@@ -714,14 +1475,57 @@ def run_block_bootstrap_robustness(
     cash_price_col="Zamkniecie",
     n_samples=500,
     block_size=250,
+    adaptive=False,
+    thresholds=None,
+    batch_size=25,
+    confidence=0.95,
+    min_samples=50,
+    seed=42,
+    store=None,
+    n_jobs=None,
+    aggregator=None,
     **wf_kwargs,
 ):
     """
     Run full walk-forward re-optimisation on n_samples block-bootstrapped
     synthetic histories. ATR parameters are forwarded via wf_kwargs.
+    n_jobs sets the sample-level workers (None = get_n_jobs()); every
+    walk_forward inside runs with n_jobs=1.
+
+    Sample i draws its blocks from SeedSequence(seed, spawn_key=(i,)),
+    independent of n_samples. With store (a RobustnessSampleStore) the
+    already computed indices of this configuration are reused and only
+    the missing ones are run, then written back.
+
+    With a store, completed samples are flushed to disk every batch_size
+    results, so an interrupted run resumes from the last flush.
+
+    Samples are dispatched in chunks of consecutive indices (at most
+    batch_size each); the synthetic histories of a chunk share one date
+    index, so walk_forward_paths evaluates the grid of every window for
+    all of them in stacked kernel passes. Results are identical to one
+    walk_forward per sample.
+
+    adaptive=True checks at every batch_size samples of the finished index
+    prefix and stops once at least min_samples are done
+    and every analyze_bootstrap gate (robustness_gates of thresholds,
+    default DEFAULT_THRESHOLDS_BOOTSTRAP) is settled at confidence; the
+    remaining tasks are cancelled. results_df.attrs holds n_requested and
+    stopped_early.
+
+    Sample chunks run on the shared TaskExecutor (per-task retry, backend
+    fallback keeping finished chunks).
+
+    aggregator (a fresh RobustnessAggregator) switches to streaming: every
+    sample of the returned prefix is fed to it in index order as chunks
+    arrive (interim percentiles are logged with the progress) and its
+    result, and equity curve when aggregator.keep_curves, is dropped once
+    fed, so memory stays flat in n_samples. Adaptive gates are then read
+    from its sketches, and the returned results_df holds only its
+    reservoir rows; pass the aggregator to analyze_bootstrap for the report.
     """
-    _cpu_count = os.cpu_count() or 1
-    n_jobs = max(1, _cpu_count - 1) if _cpu_count > 3 and sys.platform == "win32" else _cpu_count
+    executor = TaskExecutor(n_jobs=n_jobs, label="Block bootstrap")
+    n_jobs = executor.effective_jobs
 
     logging.info("=" * 80)
     logging.info("BLOCK BOOTSTRAP ROBUSTNESS TEST")
@@ -737,128 +1541,213 @@ def run_block_bootstrap_robustness(
     combined = df.loc[common_idx, [price_col]].copy()
     combined["cash_price"] = cash_df.loc[common_idx, cash_price_col]
 
-    logging.info("Timing single sample...")
-    t0 = time.time()
-    _bootstrap_single_sample(
-        0,
-        combined,
-        df,
-        cash_df,
-        price_col,
-        cash_price_col,
-        block_size,
-        wf_kwargs,
-    )
-    single_time = time.time() - t0
-    estimated = single_time * n_samples / n_jobs
-    logging.info(
-        "Single sample: %.0fms -> estimated total: %.0fs (~%.1f min) on %d jobs",
-        single_time * 1000,
-        estimated,
-        estimated / 60,
-        n_jobs,
-    )
-    logging.info(
-        "Single sample: %.0fms -> realistic estimation (x2): %.0fs (~%.1f min) on %d jobs",
-        single_time * 1000,
-        2 * estimated,
-        2 * estimated / 60,
-        n_jobs,
+    samples = {}
+    curves = {}
+    stream = aggregator is not None
+    keep_curves = stream and aggregator.keep_curves
+    if store is not None:
+        store_key = robustness_run_key(
+            "bootstrap",
+            df=df,
+            cash_df=cash_df,
+            price_col=price_col,
+            cash_price_col=cash_price_col,
+            block_size=block_size,
+            seed=seed,
+            **wf_kwargs,
+        )
+        samples = {i: r for i, r in store.load(store_key).items() if i < n_samples}
+        logging.info("Sample store: %d of %d samples already computed.", len(samples), n_samples)
+
+    # All block draws up front: workers get one gather row each plus the
+    # shared return arrays, so the payload does not grow with n_samples.
+    # Synthetic histories are stamped with the first n dates of combined.
+    aligned_index, idx_ret, cash_ret = bootstrap_return_arrays(combined, price_col, "cash_price")
+    n_synth = len(aligned_index)
+    dates = combined.index[:n_synth]
+    missing = [i for i in range(n_samples) if i not in samples]
+    gather = dict(
+        zip(
+            missing,
+            block_bootstrap_indices(
+                n_synth, block_size, [sample_seed_sequence(seed, i) for i in missing],
+            ),
+        ),
     )
 
-    valid = []
-    failed = 0
+    unsaved = {}
+    if missing:
+        logging.info("Timing single sample...")
+        t0 = time.time()
+        result, curve = _bootstrap_single_sample(
+            missing[0],
+            gather[missing[0]],
+            dates,
+            idx_ret,
+            cash_ret,
+            price_col,
+            cash_price_col,
+            wf_kwargs,
+            return_curve=True,
+        )
+        samples[missing[0]] = unsaved[missing[0]] = result
+        if keep_curves and curve is not None:
+            curves[missing[0]] = curve
+        single_time = time.time() - t0
+        estimated = single_time * len(missing) / n_jobs
+        logging.info(
+            "Single sample: %.0fms -> estimated total: %.0fs (~%.1f min) on %d jobs",
+            single_time * 1000,
+            estimated,
+            estimated / 60,
+            n_jobs,
+        )
+        logging.info(
+            "Single sample: %.0fms -> realistic estimation (x2): %.0fs (~%.1f min) on %d jobs",
+            single_time * 1000,
+            2 * estimated,
+            2 * estimated / 60,
+            n_jobs,
+        )
+
+    n_run = n_samples
     log_every = max(1, n_samples // 20)
-    success = False
-
-    N_OUTER_JOBS = n_jobs
-    for backend, n_jobs, label in [
-        ("loky", N_OUTER_JOBS, "multiprocessing"),
-        ("threading", N_OUTER_JOBS, "threading"),
-        (None, 1, "sequential"),
-    ]:
-        try:
-            if backend is None:
-                source = (
-                    _bootstrap_single_sample(
-                        i,
-                        combined,
-                        df,
-                        cash_df,
-                        price_col,
-                        cash_price_col,
-                        block_size,
-                        wf_kwargs,
-                    )
-                    for i in range(n_samples)
-                )
-            else:
-                source = Parallel(n_jobs=n_jobs, backend=backend, return_as="generator")(
-                    delayed(_bootstrap_single_sample)(
-                        i,
-                        combined,
-                        df,
-                        cash_df,
-                        price_col,
-                        cash_price_col,
-                        block_size,
-                        wf_kwargs,
-                    )
-                    for i in range(n_samples)
+    stopped_early = False
+    if adaptive:
+        gates = robustness_gates(thresholds or DEFAULT_THRESHOLDS_BOOTSTRAP, kind="bootstrap")
+
+    # Consecutive samples per task, stacked by walk_forward_paths; at most
+    # batch_size, and small enough to keep every job busy. A failed chunk
+    # is re-submitted on its own and a failed pool hands only the chunks
+    # still missing to the next backend; samples of a chunk that failed
+    # everywhere count as failed (and are not stored).
+    todo = [i for i in range(n_samples) if i not in samples]
+    chunk_size = max(1, min(batch_size, -(-len(todo) // executor.effective_jobs)))
+    chunks = [todo[k : k + chunk_size] for k in range(0, len(todo), chunk_size)]
+    failed = set()
+    completed = len(samples)
+    n_valid = sum(r is not None for r in samples.values())
+    n_new = 0
+    prefix = 0
+    checked = 0
+    n_fed = 0
+    source = executor.imap(
+        delayed(_bootstrap_sample_chunk)(
+            chunk,
+            [gather[i] for i in chunk],
+            dates,
+            idx_ret,
+            cash_ret,
+            price_col,
+            cash_price_col,
+            wf_kwargs,
+            return_curves=keep_curves,
+        )
+        for chunk in chunks
+    )
+    for task_index, chunk_output in source:
+        chunk = chunks[task_index]
+        completed_before = completed
+        completed += len(chunk)
+        if isinstance(chunk_output, TaskFailure):
+            failed.update(chunk)
+        else:
+            chunk_results, chunk_curves = chunk_output
+            samples.update(zip(chunk, chunk_results, strict=True))
+            unsaved.update(zip(chunk, chunk_results, strict=True))
+            if keep_curves:
+                curves.update(
+                    (i, c) for i, c in zip(chunk, chunk_curves, strict=True) if c is not None
                 )
-
-            for idx, r in enumerate(source):
-                if r is not None:
-                    valid.append(r)
+            n_valid += sum(r is not None for r in chunk_results)
+            if store is not None and (n_new + len(chunk)) // batch_size > n_new // batch_size:
+                store.save(store_key, unsaved)
+                unsaved.clear()
+            n_new += len(chunk)
+
+        # Gates are checked, and the aggregator fed, along the prefix of
+        # finished indices (retried chunks may arrive late); in adaptive
+        # mode the aggregator only advances to the last checked multiple
+        # of batch_size so it never holds samples past a stop.
+        while prefix < n_samples and (prefix in samples or prefix in failed):
+            prefix += 1
+        if adaptive:
+            for n_done in range(checked + batch_size, prefix + 1, batch_size):
+                checked = n_done
+                if not min_samples <= n_done < n_samples:
+                    continue
+                if stream:
+                    n_fed = _feed_aggregator(aggregator, samples, curves, n_fed, n_done)
+                    settled = gates_settled(aggregator, gates, confidence)
                 else:
-                    failed += 1
-                completed = idx + 1
-                if completed % log_every == 0 or completed == n_samples:
-                    pct = completed / n_samples * 100
-                    bar = ("=" * (completed * 20 // n_samples)).ljust(20, "-")
-                    logging.info(
-                        "Bootstrap progress: [%s] %d/%d (%.0f%%) - %d valid, %d failed",
-                        bar,
-                        completed,
-                        n_samples,
-                        pct,
-                        len(valid),
-                        failed,
-                    )
+                    done = [samples[j] for j in range(n_done) if samples.get(j) is not None]
+                    settled = gates_settled(pd.DataFrame(done), gates, confidence)
+                if settled:
+                    stopped_early = True
+                    n_run = n_done
+                    break
+        if stream:
+            n_fed = _feed_aggregator(
+                aggregator, samples, curves, n_fed, min(checked, n_run) if adaptive else prefix,
+            )
 
+        if completed // log_every > completed_before // log_every or completed == n_samples:
+            bar = ("=" * (completed * 20 // n_samples)).ljust(20, "-")
             logging.info(
-                "Block bootstrap completed using %s backend (%d jobs).",
-                label,
-                n_jobs,
+                "Bootstrap progress: [%s] %d/%d (%.0f%%) - %d valid, %d failed",
+                bar,
+                completed,
+                n_samples,
+                completed / n_samples * 100,
+                n_valid,
+                completed - n_valid,
             )
-            success = True
+            if stream and len(aggregator):
+                logging.info("Bootstrap interim: %s", aggregator.partial_report())
+
+        if stopped_early:
+            source.close()
             break
 
-        except Exception as e:
-            logging.warning(
-                "Bootstrap backend '%s' failed: %s - trying next option.",
-                label,
-                e,
-            )
-            valid = []
-            failed = 0
+    if stream:
+        _feed_aggregator(aggregator, samples, curves, n_fed, n_run)
+        aggregator.attrs.update(n_requested=n_samples, stopped_early=stopped_early)
+
+    if stopped_early:
+        logging.info(
+            "Sequential stopping: all gates settled at %.0f%% confidence after %d of %d samples.",
+            confidence * 100,
+            n_run,
+            n_samples,
+        )
+
+    if store is not None and unsaved:
+        store.save(store_key, unsaved)
 
-    if not success:
+    if todo and len(failed) == len(todo):
         logging.error("All bootstrap backends failed.")
         return pd.DataFrame()
 
-    results_df = pd.DataFrame(valid)
-    n_valid = len(results_df)
-    n_failed = failed
+    if stream:
+        agg = aggregator
+        results_df = aggregator.frame()
+    else:
+        valid = [samples[i] for i in range(n_run) if samples.get(i) is not None]
+        results_df = pd.DataFrame(valid)
+        agg = _as_aggregator(results_df)
+    results_df.attrs["n_requested"] = n_samples
+    results_df.attrs["stopped_early"] = stopped_early
+    n_valid = len(agg)
+    n_failed = n_run - n_valid
 
     if n_failed > 0:
         logging.warning(
             "%d/%d bootstrap samples failed and were excluded.",
             n_failed,
-            n_samples,
+            n_run,
         )
 
-    if results_df.empty:
+    if n_valid == 0:
         logging.error("No valid bootstrap samples — cannot report.")
         return results_df
 
@@ -882,17 +1771,19 @@ def run_block_bootstrap_robustness(
     )
     logging.info("-" * 80)
     for col in ["CAGR", "Sharpe", "MaxDD", "CalMAR", "Sortino"]:
-        s = results_df[col]
+        stats = agg.describe(col)
+        sketch = agg.sketches[col]
+        n_positive = sketch.count - sketch.count_below(np.nextafter(0.0, 1.0))
         logging.info(
             "%-10s %8.2f%% %8.2f%% %8.2f%% %8.2f%% %8.2f%% %8.2f%% %8.1f%%",
             col,
-            s.mean() * 100,
-            s.quantile(0.05) * 100,
-            s.quantile(0.25) * 100,
-            s.median() * 100,
-            s.quantile(0.75) * 100,
-            s.quantile(0.95) * 100,
-            (s > 0).mean() * 100,
+            stats["mean"] * 100,
+            stats["p05"] * 100,
+            stats["p25"] * 100,
+            stats["median"] * 100,
+            stats["p75"] * 100,
+            stats["p95"] * 100,
+            n_positive / n_valid * 100,
         )
     logging.info("-" * 80)
 
@@ -905,13 +1796,12 @@ def run_block_bootstrap_robustness(
 
 
 def analyze_bootstrap(results_df, baseline_metrics, thresholds=None):
+    """
+    Block bootstrap report and verdict; results_df as in analyze_robustness.
+    """
     if thresholds is None:
-        thresholds = {
-            "CAGR": {"p05_min": -0.01, "label": "p05 CAGR > -1%"},
-            "Sharpe": {"p05_min": -0.10, "label": "p05 Sharpe > -0.10"},
-            "MaxDD": {"p05_min": -0.40, "label": "p05 MaxDD > -40%"},
-            "p_loss": {"max": 0.20, "label": "P(CAGR < 0) < 20%"},
-        }
+        thresholds = DEFAULT_THRESHOLDS_BOOTSTRAP
+    agg = _as_aggregator(results_df)
 
     metrics_to_show = ["CAGR", "Vol", "Sharpe", "MaxDD", "CalMAR"]
     summary = {}
@@ -922,6 +1812,7 @@ def analyze_bootstrap(results_df, baseline_metrics, thresholds=None):
         "Note: block reshuffling suppresses multi-year trends — "
         "thresholds are set lower than MC to account for this structural bias.",
     )
+    _log_effective_samples(results_df)
     logging.info("=" * 80)
 
     header = f"{'Metric':<10} {'Baseline':>10} {'Mean':>10} {'p05':>10} "
@@ -929,29 +1820,19 @@ def analyze_bootstrap(results_df, baseline_metrics, thresholds=None):
     logging.info(header)
     logging.info("-" * 90)
 
-    p_loss = (results_df["CAGR"] < 0).mean() if "CAGR" in results_df.columns else float("nan")
+    p_loss = agg.p_loss if agg.has_metric("CAGR") else float("nan")
 
     for col in metrics_to_show:
-        if col not in results_df.columns:
+        if not agg.has_metric(col):
             continue
 
         base = baseline_metrics.get(col, float("nan"))
-        mean = results_df[col].mean()
-        p05 = results_df[col].quantile(0.05)
-        p25 = results_df[col].quantile(0.25)
-        med = results_df[col].median()
-        p75 = results_df[col].quantile(0.75)
-        p95 = results_df[col].quantile(0.95)
+        stats = agg.describe(col)
+        mean, p05, p25, med, p75, p95 = (
+            stats[k] for k in ("mean", "p05", "p25", "median", "p75", "p95")
+        )
 
-        summary[col] = {
-            "baseline": base,
-            "mean": mean,
-            "p05": p05,
-            "p25": p25,
-            "median": med,
-            "p75": p75,
-            "p95": p95,
-        }
+        summary[col] = {"baseline": base, **stats}
 
         p_loss_display = f"{p_loss:.1%}" if col == "CAGR" else ""
 
@@ -1002,14 +1883,14 @@ def analyze_bootstrap(results_df, baseline_metrics, thresholds=None):
         )
 
     median_cagr = summary["CAGR"]["median"]
-    if median_cagr < 0.01:
+    if median_cagr < BOOTSTRAP_MIN_MEDIAN_CAGR:
         fails.append(
             f"Median CAGR = {median_cagr:.1%}  "
             f"[procedure fails to find positive strategy on typical synthetic history]",
         )
     else:
         passes.append(
-            f"Median CAGR = {median_cagr:.1%}  [> 1% threshold]",
+            f"Median CAGR = {median_cagr:.1%}  [> {BOOTSTRAP_MIN_MEDIAN_CAGR:.0%} threshold]",
         )
 
     base_cagr = baseline_metrics.get("CAGR", float("nan"))
@@ -1038,4 +1919,5 @@ def analyze_bootstrap(results_df, baseline_metrics, thresholds=None):
     logging.info("=" * 80)
 
     summary["verdict"] = verdict
+    summary["n_samples"] = len(results_df)
     return summary
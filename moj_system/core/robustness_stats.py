@@ -0,0 +1,335 @@
+# -*- coding: utf-8 -*-
+"""
+moj_system/core/robustness_stats.py
+===================================
+Streaming aggregation of Monte Carlo / block bootstrap sample results.
+
+RobustnessAggregator consumes sample result dicts one at a time (as they
+arrive from the workers) and keeps, per metric, a mergeable quantile
+sketch, plus exact counters (samples, failures, P(CAGR < 0)) and fixed size
+reservoirs of result rows and (optionally) sample equity curves for the
+charts. analyze_robustness / analyze_bootstrap read their percentiles
+from it, so a report can be produced mid-run and memory does not grow
+with the sample count.
+
+QuantileSketch is exact while it holds at most exact_size values (the
+percentiles then equal pandas' Series.quantile); beyond that it
+compresses into a merging t-digest of about `compression` centroids.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Metrics tracked by default — the columns of the robustness reports
+AGGREGATED_METRICS = ("CAGR", "Vol", "Sharpe", "Sortino", "MaxDD", "CalMAR")
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of a stream of floats (NaN values ignored).
+
+    Parameters
+    ----------
+    compression : float — t-digest delta; more centroids, smaller error
+    exact_size  : int — values kept verbatim before the first compression
+    """
+
+    def __init__(self, compression=200, exact_size=2048):
+        self.compression = compression
+        self.exact_size = exact_size
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self.buffer = []
+        self.exact = True
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def add(self, value):
+        """Add one value (NaN is skipped)."""
+        if value is None or np.isnan(value):
+            return
+        self.buffer.append(float(value))
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if self.exact and self.count > self.exact_size:
+            self.exact = False
+        if not self.exact and len(self.buffer) >= self.exact_size:
+            self._compress()
+
+    def merge(self, other):
+        """Fold another sketch into this one."""
+        self.buffer.extend(other.buffer)
+        self.means = np.concatenate([self.means, other.means])
+        self.weights = np.concatenate([self.weights, other.weights])
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        if not (self.exact and other.exact and self.count <= self.exact_size):
+            self.exact = False
+            self._compress()
+        return self
+
+    def _compress(self):
+        """Merge the buffer and centroids into at most ~compression centroids."""
+        values = np.concatenate([self.means, self.buffer])
+        weights = np.concatenate([self.weights, np.ones(len(self.buffer))])
+        self.buffer = []
+        if len(values) == 0:
+            return
+        order = np.argsort(values, kind="stable")
+        values = values[order]
+        weights = weights[order]
+
+        # k1 scale function: centroids are small in the tails, large mid-body
+        total = weights.sum()
+        cum = np.cumsum(weights) / total
+        k = self.compression / (2 * np.pi) * np.arcsin(2 * np.clip(cum, 0, 1) - 1)
+
+        means, sizes = [], []
+        k_start = k_prev = self.compression / (2 * np.pi) * np.arcsin(-1)
+        acc_w = 0.0
+        acc_wx = 0.0
+        for value, weight, k_right in zip(values, weights, k, strict=True):
+            if acc_w > 0 and k_right - k_start > 1:
+                means.append(acc_wx / acc_w)
+                sizes.append(acc_w)
+                k_start = k_prev
+                acc_w = 0.0
+                acc_wx = 0.0
+            acc_w += weight
+            acc_wx += weight * value
+            k_prev = k_right
+        means.append(acc_wx / acc_w)
+        sizes.append(acc_w)
+
+        self.means = np.array(means)
+        self.weights = np.array(sizes)
+
+    def _sorted_exact(self):
+        return np.sort(np.asarray(self.buffer, dtype=float))
+
+    def value_at_rank(self, rank):
+        """Value of 0-based order statistic rank (estimated when compressed)."""
+        if self.exact:
+            return float(self._sorted_exact()[rank])
+        if self.buffer:
+            self._compress()
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centres, [self.count]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(rank + 0.5, positions, means))
+
+    def mean(self):
+        """Mean of the added values (NaN when empty)."""
+        if self.count == 0:
+            return float("nan")
+        if self.exact:
+            return float(np.mean(self.buffer))
+        return self.total / self.count
+
+    def quantile(self, q):
+        """Quantile q in [0, 1] (linear interpolation as pandas)."""
+        if self.count == 0:
+            return float("nan")
+        if self.exact:
+            return float(np.quantile(self._sorted_exact(), q))
+        if self.buffer:
+            self._compress()
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centres, [self.count]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(q * self.count, positions, means))
+
+    def count_below(self, x):
+        """Number of added values strictly below x (estimated when compressed)."""
+        if self.count == 0 or np.isnan(x):
+            return 0.0
+        if self.exact:
+            return float(np.searchsorted(self._sorted_exact(), x, side="left"))
+        if x <= self.min:
+            return 0.0
+        if x > self.max:
+            return float(self.count)
+        if self.buffer:
+            self._compress()
+        centres = np.cumsum(self.weights) - self.weights / 2
+        positions = np.concatenate([[0.0], centres, [self.count]])
+        means = np.concatenate([[self.min], self.means, [self.max]])
+        return float(np.interp(x, means, positions))
+
+
+class RobustnessAggregator:
+    """
+    Streaming summary of robustness sample results.
+
+    Parameters
+    ----------
+    metrics              : metric names to sketch (others are ignored)
+    reservoir_size       : int — result rows kept (uniform reservoir sample)
+    seed                 : int — seed of the reservoir sampling
+    compression, exact_size : QuantileSketch settings
+    curve_reservoir_size : int — sample equity curves kept for the charts
+                           (uniform reservoir sample; 0 = none)
+    """
+
+    def __init__(
+        self,
+        metrics=AGGREGATED_METRICS,
+        reservoir_size=500,
+        seed=0,
+        compression=200,
+        exact_size=2048,
+        curve_reservoir_size=0,
+    ):
+        self.metrics = tuple(metrics)
+        self.reservoir_size = reservoir_size
+        self.curve_reservoir_size = curve_reservoir_size
+        self.sketches = {m: QuantileSketch(compression, exact_size) for m in self.metrics}
+        self.columns = set()
+        self.n_results = 0
+        self.n_failed = 0
+        self.n_loss = 0
+        self.reservoir = []
+        self.n_curves = 0
+        self.curves = []
+        self.attrs = {}
+        self._rng = np.random.default_rng(seed)
+        self._curve_rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(1,)))
+
+    def __len__(self):
+        return self.n_results
+
+    @classmethod
+    def from_frame(cls, results_df, **kwargs):
+        """Aggregator holding every row (and the attrs) of a results DataFrame."""
+        n_rows = len(results_df)
+        agg = cls(**{"reservoir_size": n_rows, "exact_size": max(n_rows, 2048), **kwargs})
+        for row in results_df.to_dict("records"):
+            agg.update(row)
+        agg.columns.update(results_df.columns)
+        agg.attrs = dict(results_df.attrs)
+        return agg
+
+    @property
+    def keep_curves(self):
+        """True when sample equity curves should be passed to update."""
+        return self.curve_reservoir_size > 0
+
+    def update(self, result, curve=None):
+        """
+        Add one sample result dict (None = failed sample) and, optionally,
+        its equity curve (pd.Series).
+        """
+        if result is None:
+            self.n_failed += 1
+            return
+        self.n_results += 1
+        self.columns.update(result)
+        for metric, sketch in self.sketches.items():
+            if metric in result:
+                sketch.add(result[metric])
+        if result.get("CAGR", np.nan) < 0:
+            self.n_loss += 1
+
+        # Algorithm R: row k (1-based) replaces a random slot with p = size/k
+        if len(self.reservoir) < self.reservoir_size:
+            self.reservoir.append(result)
+        else:
+            slot = self._rng.integers(self.n_results)
+            if slot < self.reservoir_size:
+                self.reservoir[slot] = result
+
+        if curve is None or not self.keep_curves:
+            return
+        self.n_curves += 1
+        curve = curve.rename(result.get("sample"))
+        if len(self.curves) < self.curve_reservoir_size:
+            self.curves.append(curve)
+        else:
+            slot = self._curve_rng.integers(self.n_curves)
+            if slot < self.curve_reservoir_size:
+                self.curves[slot] = curve
+
+    def merge(self, other):
+        """Fold another aggregator (e.g. from another worker) into this one."""
+        for metric, sketch in self.sketches.items():
+            if metric in other.sketches:
+                sketch.merge(other.sketches[metric])
+        self.columns |= other.columns
+        total = self.n_results + other.n_results
+        if total:
+            # Weighted reservoir union: each side keeps its share of rows
+            n_self = round(self.reservoir_size * self.n_results / total)
+            keep_self = self._sample_rows(self.reservoir, n_self)
+            keep_other = self._sample_rows(other.reservoir, self.reservoir_size - len(keep_self))
+            self.reservoir = keep_self + keep_other
+        n_curves = self.n_curves + other.n_curves
+        if n_curves:
+            n_self = round(self.curve_reservoir_size * self.n_curves / n_curves)
+            keep_self = self._sample_rows(self.curves, n_self)
+            keep_other = self._sample_rows(other.curves, self.curve_reservoir_size - len(keep_self))
+            self.curves = keep_self + keep_other
+        self.n_curves = n_curves
+        self.n_results = total
+        self.n_failed += other.n_failed
+        self.n_loss += other.n_loss
+        return self
+
+    def _sample_rows(self, rows, n):
+        if n >= len(rows):
+            return list(rows)
+        picks = self._rng.choice(len(rows), size=n, replace=False)
+        return [rows[i] for i in sorted(picks)]
+
+    def has_metric(self, metric):
+        """True when some result carried metric."""
+        return metric in self.columns and metric in self.sketches
+
+    def describe(self, metric):
+        """mean, p05, p25, median, p75, p95 of one metric."""
+        sketch = self.sketches[metric]
+        return {
+            "mean": sketch.mean(),
+            "p05": sketch.quantile(0.05),
+            "p25": sketch.quantile(0.25),
+            "median": sketch.quantile(0.50),
+            "p75": sketch.quantile(0.75),
+            "p95": sketch.quantile(0.95),
+        }
+
+    def fraction_below(self, metric, x):
+        """Share of results with metric < x (a missing value is not below)."""
+        if self.n_results == 0:
+            return float("nan")
+        return self.sketches[metric].count_below(x) / self.n_results
+
+    @property
+    def p_loss(self):
+        """P(CAGR < 0) over the valid results (exact)."""
+        return self.n_loss / self.n_results if self.n_results else float("nan")
+
+    def frame(self):
+        """Reservoir rows as a DataFrame."""
+        return pd.DataFrame(self.reservoir)
+
+    def curve_frame(self):
+        """Reservoir equity curves as a DataFrame (one column per sample)."""
+        if not self.curves:
+            return pd.DataFrame()
+        return pd.concat(self.curves, axis=1)
+
+    def partial_report(self):
+        """One-line interim summary for progress logs."""
+        if not self.has_metric("CAGR"):
+            return f"n={self.n_results} valid, {self.n_failed} failed"
+        cagr = self.sketches["CAGR"]
+        return (
+            f"n={self.n_results} valid, {self.n_failed} failed | "
+            f"CAGR p05={cagr.quantile(0.05):.1%} median={cagr.quantile(0.50):.1%} | "
+            f"P(CAGR<0)={self.p_loss:.1%}"
+        )
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+moj_system/core/robustness_store.py
+===================================
+Persistent per-sample results of Monte Carlo and block bootstrap
+robustness runs.
+
+Every robustness sample draws its randomness from its own
+SeedSequence(base_seed, spawn_key=(index,)), so sample i of a run is
+the same whatever n_samples is. The store keeps the result of every
+computed sample index under a SHA-256 key of everything else the run
+depends on (input data, window definitions / walk_forward arguments,
+perturbation or block settings, base seed, WALK_FORWARD_VERSION). A
+later run of the same configuration with a larger n_samples computes
+only the missing indices and merges them.
+
+Entries are gzip-compressed pickles of {sample index: result dict or
+None} written atomically. Failed samples are stored as None: a sample
+is deterministic, so it would fail again.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from moj_system.core.strategy_engine import WALK_FORWARD_VERSION
+from moj_system.core.wf_cache import NON_RESULT_ARGS, hash_value, write_pickle
+
+
+def sample_seed_sequence(base_seed, index):
+    """SeedSequence of robustness sample index (child index of base_seed)."""
+    return np.random.SeedSequence(base_seed, spawn_key=(index,))
+
+
+def robustness_run_key(kind, **inputs) -> str:
+    """
+    Content-addressed key of a robustness run configuration.
+
+    kind   : str — "mc" or "bootstrap"
+    inputs : every argument the sample results depend on, except
+             n_samples; walk_forward arguments that never change results
+             (n_jobs, fast_mode, ...) are ignored.
+    """
+    parts = [f"kind={kind}", f"engine={WALK_FORWARD_VERSION}"]
+    for name, value in sorted(inputs.items()):
+        if name in NON_RESULT_ARGS - {"df", "cash_df"}:
+            continue
+        if isinstance(value, dict):
+            items = ", ".join(f"{k!r}: {hash_value(v)}" for k, v in sorted(value.items()))
+            value = "{" + items + "}"
+        parts.append(f"{name}={hash_value(value)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class RobustnessSampleStore:
+    """
+    On-disk store of per-sample robustness results, one file per run key.
+
+    Parameters
+    ----------
+    store_dir : str or Path — directory holding the store entries
+    """
+
+    SUFFIX = ".pkl.gz"
+
+    def __init__(self, store_dir):
+        self.store_dir = Path(store_dir)
+
+    def _path(self, key) -> Path:
+        return self.store_dir / f"{key}{self.SUFFIX}"
+
+    def load(self, key) -> dict:
+        """Return {sample index: result} of every stored sample of key."""
+        path = self._path(key)
+        if not path.exists():
+            return {}
+        try:
+            return pd.read_pickle(path, compression="gzip")
+        except Exception as exc:
+            logging.warning(f"RobustnessSampleStore: dropping unreadable entry {path.name} - {exc}")
+            path.unlink(missing_ok=True)
+            return {}
+
+    def save(self, key, samples):
+        """Merge {sample index: result} into the stored samples of key."""
+        if not samples:
+            return
+        merged = {**self.load(key), **samples}
+        path = self._path(key)
+        try:
+            write_pickle(path, merged)
+        except Exception as exc:
+            logging.warning(f"RobustnessSampleStore: could not write {path.name} - {exc}")
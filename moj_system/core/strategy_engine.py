@@ -1,46 +1,15 @@
 import datetime as dt
+import inspect
 import logging
 import os
-import sys
+import tempfile
 
 import numpy as np
 import pandas as pd
-from joblib import Parallel, delayed
-
-# ============================================================
-# CANONICAL N_JOBS CALCULATION
-# ============================================================
-
-
-def get_n_jobs() -> int:
-    """
-    Return the recommended number of parallel jobs for this machine.
-
-    Logic:
-      - On Windows with > 3 cores: use (cpu_count - 1) to keep the UI
-        responsive (loky/spawn overhead is higher on Windows).
-      - All other platforms: use all logical cores.
-      - Always returns at least 1.
-
-    Replaces the following block that was duplicated verbatim in ~8 files::
-
-        _cpu_count = os.cpu_count() or 1
-        N_JOBS = max(1, _cpu_count - 1) if _cpu_count > 3 and sys.platform == "win32" else _cpu_count
-
-    Returns
-    -------
-    int — recommended n_jobs value for joblib.Parallel / walk_forward
-
-    Example
-    -------
-    >>> from strategy_test_library import get_n_jobs
-    >>> N_JOBS = get_n_jobs()
-    """
-    cpu_count = os.cpu_count() or 1
-    if cpu_count > 3 and sys.platform == "win32":
-        return max(1, cpu_count - 1)
-    return cpu_count
+from joblib import delayed, dump, effective_n_jobs, load
 
+# get_n_jobs lives with the shared executor; re-exported for the scripts
+from moj_system.core.executor import TaskExecutor, TaskFailure, get_n_jobs  # noqa: F401
 
 # ============================================================
 # ANNUAL PERFORMANCE UTILITIES  (moved from objective_review.py)
@@ -306,6 +275,136 @@ def compute_momentum(
     return blended
 
 
+def build_indicator_store(
+    df,
+    price_col="Zamkniecie",
+    ma_lengths=(),
+    mom_lookbacks=(),
+    mom_blend=False,
+    vol_window=20,
+    atr_window=20,
+    high_col="Najwyzszy",
+    low_col="Najnizszy",
+):
+    """
+    Precompute the strategy indicators of one price window so they can be
+    shared by every parameter combination evaluated on it.
+
+    All series are shifted by one bar (no look-ahead) exactly as in
+    run_strategy_with_trades, which looks them up via the indicators=
+    argument instead of recomputing them when the store covers the
+    requested (fast, slow, mom_lookback, vol_window, atr_window).
+
+    Parameters
+    ----------
+    df            : pd.DataFrame — price window (DatetimeIndex)
+    price_col     : str          — close price column
+    ma_lengths    : iterable[int] — every fast / slow MA length needed
+    mom_lookbacks : iterable[int] — single-horizon momentum lookbacks
+    mom_blend     : bool         — also compute the blended momentum signal
+    vol_window    : int          — rolling window for realised vol
+    atr_window    : int          — rolling window for the ATR estimate
+    high_col, low_col : str or None — high / low columns; the close-only
+                    ATR fallback is used if missing or entirely NaN
+
+    Returns
+    -------
+    dict — {"index", "vol_window", "atr_window", "ret", "vol",
+            "ma": {length: Series}, "mom": {lookback: Series},
+            "mom_blend": Series or None, "atr": Series,
+            "relative_tr": Series (only when high / low are available)}
+    """
+    price = df[price_col]
+    has_hl = (
+        high_col is not None
+        and low_col is not None
+        and high_col in df.columns
+        and low_col in df.columns
+        and not df[high_col].isna().all()
+        and not df[low_col].isna().all()
+    )
+
+    ret = price.pct_change()
+    store = {
+        "index": df.index,
+        "vol_window": vol_window,
+        "atr_window": atr_window,
+        "ret": ret,
+        "vol": (ret.rolling(vol_window).std() * np.sqrt(252)).shift(1),
+        "ma": {n: price.rolling(n).mean().shift(1) for n in sorted(set(ma_lengths))},
+        "mom": {
+            lb: compute_momentum(price, lookback=lb, blend=False).shift(1)
+            for lb in sorted(set(mom_lookbacks))
+        },
+        "mom_blend": compute_momentum(price, blend=True).shift(1) if mom_blend else None,
+    }
+
+    # -------------------------------------------------------
+    # ATR series — rolling mean of |daily return| (close-only,
+    # normalised to price, i.e. |ΔP / P_prev| * 100 as fallback, if
+    # high and low are available - use high-low ATR:
+    #    [max(high, close(-1)) - min(low, close(-1))]/close(-1) * 100
+    #
+    # Expressed as a dimensionless fraction in pct pts so that
+    #   stop_level = M * (1 - N_atr * atr_val)
+    # is directly comparable to the fixed-% stop
+    #   stop_level = M * (1 - X)
+    # and N_atr has the same units as X (a fraction of price).
+    #
+    # This means N_ATR_GRID values are directly comparable to
+    # X_GRID values:  N_atr=0.10 trails by 10% of M when
+    # the average daily move equals 1% — and more in high-vol
+    # regimes, less in low-vol regimes (the adaptive benefit).
+    #
+    # Shifted by 1 so today's stop uses yesterday's ATR estimate
+    # (no look-ahead). Computed regardless of use_atr_stop so it
+    # is always available in the pre-extracted numpy arrays.
+    # -------------------------------------------------------
+
+    if has_hl:
+        prev_close = price.shift(1)
+        tr = np.maximum(df[high_col], prev_close) - np.minimum(df[low_col], prev_close)
+        store["relative_tr"] = tr / prev_close
+        store["atr"] = (
+            store["relative_tr"].rolling(atr_window).mean().shift(1)  # avoid lookahead
+            * 100
+        )
+    else:
+        # fallback: absolute daily % move * 100 to use 0.08 etc grid
+        store["atr"] = (price.diff().abs() / price.shift(1)).rolling(
+            atr_window,
+        ).mean().shift(1) * 100
+
+    return store
+
+
+def indicator_store_covers(
+    indicators,
+    df,
+    fast=50,
+    slow=200,
+    filter_mode="ma",
+    mom_lookback=252,
+    vol_window=20,
+    atr_window=20,
+):
+    """
+    True if an indicator store was built on df's index with the same
+    windows and holds every series needed for the given parameters.
+    """
+    if indicators is None:
+        return False
+    if indicators["vol_window"] != vol_window or indicators["atr_window"] != atr_window:
+        return False
+    if fast not in indicators["ma"] or slow not in indicators["ma"]:
+        return False
+    if filter_mode == "mom" and mom_lookback not in indicators["mom"]:
+        return False
+    if filter_mode == "mom_blend" and indicators["mom_blend"] is None:
+        return False
+    return indicators["index"].equals(df.index)
+
+
 # ============================
 # Performance Metrics
 # ============================
@@ -345,6 +444,59 @@ def compute_metrics(equity, risk_free_rate=0, freq=252):
     }
 
 
+# Column order of the arrays returned by compute_metrics_array / run_strategy_batch
+METRIC_COLUMNS = ("CAGR", "Vol", "Sharpe", "Sortino", "MaxDD", "CalMAR")
+
+
+def compute_metrics_array(equity, risk_free_rate=0, freq=252):
+    """
+    Row-wise NumPy counterpart of compute_metrics.
+
+    Parameters
+    ----------
+    equity         : np.ndarray — (P, T) equity curves, one per row
+                     (a 1-D array is treated as a single row)
+    risk_free_rate : float      — annualised risk-free rate
+    freq           : int        — bars per year
+
+    Returns
+    -------
+    np.ndarray — (P, 6) metrics, columns in METRIC_COLUMNS order. Same
+                 formulas and zero-division conventions as compute_metrics.
+    """
+    equity = np.atleast_2d(np.asarray(equity, dtype=float))
+    ret = equity[:, 1:] / equity[:, :-1] - 1
+    zeros = np.zeros(len(equity))
+
+    years = ret.shape[1] / freq
+    # Scalar pow per row: vectorised np.power may use a SIMD routine that
+    # differs from compute_metrics in the last ulp, which is enough to flip
+    # ties in the walk-forward selection.
+    growth = (equity[:, -1] / equity[:, 0]).tolist()
+    cagr = np.array([g ** (1 / years) for g in growth]) - 1
+    vol = ret.std(axis=1, ddof=1) * np.sqrt(freq)
+
+    excess_return = cagr - risk_free_rate
+    sharpe = np.divide(excess_return, vol, out=zeros.copy(), where=vol > 0)
+
+    daily_rf = (1 + risk_free_rate) ** (1 / 252) - 1
+    # Downside mean over the selected returns only (padding with zeros would
+    # change the pairwise summation order relative to compute_metrics)
+    downside_var = zeros.copy()
+    for row, row_ret in enumerate(ret):
+        downside = row_ret[row_ret < daily_rf] - daily_rf
+        if len(downside) > 0:
+            downside_var[row] = (downside**2).mean()
+    downside_vol = np.sqrt(downside_var) * np.sqrt(252)
+    sortino = np.divide(excess_return, downside_vol, out=zeros.copy(), where=downside_vol > 0)
+
+    drawdown = equity / np.maximum.accumulate(equity, axis=1) - 1
+    max_dd = drawdown.min(axis=1)
+    calmar = np.divide(cagr, np.abs(max_dd), out=zeros.copy(), where=max_dd != 0)
+
+    return np.column_stack([cagr, vol, sharpe, sortino, max_dd, calmar])
+
+
 # ============================================================
 # PARAMETER STABILITY
 # ============================================================
@@ -401,6 +553,111 @@ def neighbour_mean(key, scores, stop_grid, Y_grid):
     return np.mean(neighbours) if neighbours else scores[key]
 
 
+def neighbour_mean_array(keys, raw_scores, stop_grid, Y_grid):
+    """
+    Vectorised neighbour_mean for every key of a grid search at once.
+
+    Scores are scattered into a dense tensor indexed by the grid axes
+    (filter_mode, fund_idx, stop, Y, fast, slow, tv, stop_loss,
+    mom_lookback), missing combinations as NaN. The stop and Y axes are
+    padded by one NaN cell on each side and the 3x3 stop/Y window around
+    every key is gathered in one pass, so the cost is linear in the number
+    of keys instead of quadratic.
+
+    The window mean is accumulated in the same neighbour order and with
+    the same summation scheme as np.mean over the neighbour list in
+    neighbour_mean, so the results are bit-identical to calling
+    neighbour_mean(key, same_mode_scores, stop_grid, Y_grid) per key.
+
+    Parameters
+    ----------
+    keys       : list[tuple] — key tuples as produced by evaluate_params
+    raw_scores : array-like  — objective score of each key (same order)
+    stop_grid  : list[float] — stop parameter grid (X_grid or N_atr_grid)
+    Y_grid     : list[float] — breakout threshold grid
+
+    Returns
+    -------
+    np.ndarray — neighbourhood mean (including the key itself) per key
+    """
+    raw_scores = np.asarray(raw_scores, dtype=float)
+    if len(keys) == 0:
+        return raw_scores.copy()
+
+    stop_arr = np.asarray(stop_grid, dtype=float)
+    y_arr = np.asarray(Y_grid, dtype=float)
+
+    # Integer coordinates of every key along each tensor axis. Stop / Y use
+    # the nearest grid index (first on ties), exactly as neighbour_mean does.
+    coords = []
+    shape = []
+    for axis in range(9):
+        values = [key[axis] for key in keys]
+        if axis == 2:
+            idx = np.abs(np.asarray(values, dtype=float)[:, None] - stop_arr).argmin(axis=1)
+            size = len(stop_arr)
+        elif axis == 3:
+            idx = np.abs(np.asarray(values, dtype=float)[:, None] - y_arr).argmin(axis=1)
+            size = len(y_arr)
+        else:
+            positions = {}
+            idx = np.array([positions.setdefault(v, len(positions)) for v in values])
+            size = len(positions)
+        coords.append(idx)
+        shape.append(size)
+
+    # neighbour_mean looks neighbours up by exact grid value, so a key only
+    # fills its tensor cell when its stop / Y value sits exactly on the grid.
+    on_grid = (stop_arr[coords[2]] == np.asarray([k[2] for k in keys], dtype=float)) & (
+        y_arr[coords[3]] == np.asarray([k[3] for k in keys], dtype=float)
+    )
+
+    shape[2] += 2
+    shape[3] += 2
+    tensor = np.full(shape, np.nan)
+    filled = np.zeros(shape, dtype=bool)
+    cell = list(coords)
+    cell[2] = coords[2] + 1
+    cell[3] = coords[3] + 1
+    tensor[tuple(c[on_grid] for c in cell)] = raw_scores[on_grid]
+    filled[tuple(c[on_grid] for c in cell)] = True
+
+    window = []
+    present = []
+    for ds in [-1, 0, 1]:
+        for dy in [-1, 0, 1]:
+            shifted = list(cell)
+            shifted[2] = cell[2] + ds
+            shifted[3] = cell[3] + dy
+            window.append(tensor[tuple(shifted)])
+            present.append(filled[tuple(shifted)])
+    window = np.column_stack(window)
+    present = np.column_stack(present)
+
+    # An off-grid key is never found as its own neighbour; neighbour_mean
+    # then falls back to the key's raw score when nothing else is present.
+    count = present.sum(axis=1)
+
+    # Compact the present neighbours to the left, preserving their order,
+    # then reproduce np.mean: sequential sum below 8 values, 8-way
+    # unrolled pairwise sum (plus the 9th value) otherwise.
+    order = np.argsort(~present, axis=1, kind="stable")
+    packed = np.take_along_axis(window, order, axis=1)
+
+    sequential = np.zeros(len(keys))
+    for j in range(9):
+        sequential = np.where(j < count, sequential + packed[:, j], sequential)
+    unrolled = ((packed[:, 0] + packed[:, 1]) + (packed[:, 2] + packed[:, 3])) + (
+        (packed[:, 4] + packed[:, 5]) + (packed[:, 6] + packed[:, 7])
+    )
+    unrolled = np.where(count == 9, unrolled + packed[:, 8], unrolled)
+    total = np.where(count >= 8, unrolled, sequential)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = total / count
+    return np.where(count > 0, means, raw_scores)
+
+
 def calc_position(vol, position_mode, target_vol, max_leverage):
     if position_mode == "full":
         return 1.0
@@ -433,63 +690,41 @@ def compute_buy_and_hold(df, price_col="Zamkniecie", start=None, end=None):
 # ============================
 # Strategy Engine
 # ============================
-def run_strategy_with_trades(
+def _prepare_strategy_frame(
     df,
     price_col="price",
-    X=0.1,
-    Y=0.1,
-    stop_loss=0.1,
     fast=50,
     slow=200,
     vol_window=20,
-    target_vol=0.10,
-    max_leverage=1.0,
-    position_mode="vol_entry",
     filter_mode="ma",
     mom_lookback=252,
     cash_df=None,
     safe_rate=0.0,
-    initial_state=None,
     warmup_df=None,
     fund_signal=None,
     entry_gate=None,
-    # -------------------------------------------------------
-    # ATR trailing stop parameters
-    # -------------------------------------------------------
-    use_atr_stop=False,  # False = fixed % (X), True = ATR-scaled (N_atr)
-    N_atr=3.0,  # ATR multiplier for trailing stop (used when use_atr_stop=True)
-    atr_window=20,  # Rolling window for close-only ATR estimate (days)
-    # -------------------------------------------------------
-    fast_mode=True,
+    atr_window=20,
+    indicators=None,
 ):
     """
-    Run the trend-following strategy on a single price series and return
-    the equity curve, performance metrics, and trade log.
-
-    TRAILING STOP MODES
-    -------------------
-    use_atr_stop=False (default, backward-compatible):
-        stop_level = (1 - X) * M
-        X is the fixed fraction below the running peak. Identical to the
-        original implementation. X is searched over X_grid in walk_forward.
-
-    use_atr_stop=True (normalised ATR Chandelier exit):
-        stop_level = M * (1 - N_atr * ATR_pct)
-        ATR_pct is the rolling mean of |close_t - close_{t-1}| / close_{t-1}
-        over atr_window bars — a dimensionless daily-return ATR. This makes
-        N_atr directly comparable to X: N_atr=0.10 means trail by 10% of M
-        when the average daily move equals 10% of price, with the stop
-        widening in high-vol regimes and tightening in low-vol regimes.
-        N_atr is searched over N_atr_grid in walk_forward; values are the
-        same order of magnitude as X_grid (e.g. 0.08 to 0.20 for equity).
+    Build the indicator frame consumed by the day loop of
+    run_strategy_with_trades and by run_strategy_batch.
 
-    The absolute stop (stop_loss, ABSOLUTE_STOP exit) is always a fixed
-    fraction below entry price regardless of ATR mode — it is a backstop
-    for gap-down events and is not made volatility-adaptive.
+    Concatenates the warmup rows, merges cash returns and the fund filter,
+    takes ret / vol / moving averages / momentum / ATR (all shifted by
+    one bar, no look-ahead) from the indicator store — building a minimal
+    one when indicators is None or does not cover this frame — and drops
+    the incomplete leading rows.
 
-    All other parameters and the carry-state mechanism are unchanged.
+    Returns
+    -------
+    (df, gate_aligned, test_start, rf_rate)
+        df           : pd.DataFrame — indicator frame after dropna
+        gate_aligned : pd.Series or None — entry gate aligned to the
+                       pre-dropna index
+        test_start   : pd.Timestamp — first non-warmup date
+        rf_rate      : float — annualised cash return over the test rows
     """
-
     df = df.copy()
     df["price"] = df[price_col]
 
@@ -561,71 +796,146 @@ def run_strategy_with_trades(
     else:
         df["fund_filter"] = 1
 
-    df["ret"] = df["price"].pct_change()
-    vol = df["ret"].rolling(vol_window).std() * np.sqrt(252)
-    df["vol"] = vol.shift(1)
-    df["ma_fast"] = df["price"].rolling(fast).mean().shift(1)
-    df["ma_slow"] = df["price"].rolling(slow).mean().shift(1)
+    if not indicator_store_covers(
+        indicators,
+        df,
+        fast=fast,
+        slow=slow,
+        filter_mode=filter_mode,
+        mom_lookback=mom_lookback,
+        vol_window=vol_window,
+        atr_window=atr_window,
+    ):
+        indicators = build_indicator_store(
+            df,
+            price_col="price",
+            ma_lengths=(fast, slow),
+            mom_lookbacks=(mom_lookback,) if filter_mode == "mom" else (),
+            mom_blend=filter_mode == "mom_blend",
+            vol_window=vol_window,
+            atr_window=atr_window,
+            high_col="high" if has_hl else None,
+            low_col="low" if has_hl else None,
+        )
+
+    df["ret"] = indicators["ret"]
+    df["vol"] = indicators["vol"]
+    df["ma_fast"] = indicators["ma"][fast]
+    df["ma_slow"] = indicators["ma"][slow]
     df["trend"] = (df["ma_fast"] > df["ma_slow"]).astype(int)
 
     if filter_mode == "mom":
-        df["MOM"] = compute_momentum(df["price"], lookback=mom_lookback, blend=False).shift(1)
+        df["MOM"] = indicators["mom"][mom_lookback]
     elif filter_mode == "mom_blend":
-        df["MOM"] = compute_momentum(df["price"], blend=True).shift(1)
+        df["MOM"] = indicators["mom_blend"]
     else:
         df["MOM"] = 1
 
-    # -------------------------------------------------------
-    # ATR series — rolling mean of |daily return| (close-only,
-    # normalised to price, i.e. |ΔP / P_prev| * 100 as fallback, if
-    # high and low are available - use high-low ATR:
-    #    [max(high, close(-1)) - min(low, close(-1))]/close(-1) * 100
-    #
-    # Expressed as a dimensionless fraction in pct pts so that
-    #   stop_level = M * (1 - N_atr * atr_val)
-    # is directly comparable to the fixed-% stop
-    #   stop_level = M * (1 - X)
-    # and N_atr has the same units as X (a fraction of price).
-    #
-    # This means N_ATR_GRID values are directly comparable to
-    # X_GRID values:  N_atr=0.10 trails by 10% of M when
-    # the average daily move equals 1% — and more in high-vol
-    # regimes, less in low-vol regimes (the adaptive benefit).
-    #
-    # Shifted by 1 so today's stop uses yesterday's ATR estimate
-    # (no look-ahead). Computed regardless of use_atr_stop so it
-    # is always available in the pre-extracted numpy arrays.
-    # -------------------------------------------------------
+    if "relative_tr" in indicators:
+        df["relative_tr"] = indicators["relative_tr"]
+    df["atr"] = indicators["atr"]
 
-    if has_hl:
-        prev_close = df["price"].shift(1)
+    df.dropna(inplace=True)
 
-        tr = np.maximum(df["high"], prev_close) - np.minimum(df["low"], prev_close)
+    return df, gate_aligned, test_start, rf_rate
 
-        df["relative_tr"] = tr / prev_close
 
-        df["atr"] = (
-            df["relative_tr"].rolling(atr_window).mean().shift(1)  # avoid lookahead
-            * 100
-        )
+def run_strategy_with_trades(
+    df,
+    price_col="price",
+    X=0.1,
+    Y=0.1,
+    stop_loss=0.1,
+    fast=50,
+    slow=200,
+    vol_window=20,
+    target_vol=0.10,
+    max_leverage=1.0,
+    position_mode="vol_entry",
+    filter_mode="ma",
+    mom_lookback=252,
+    cash_df=None,
+    safe_rate=0.0,
+    initial_state=None,
+    warmup_df=None,
+    fund_signal=None,
+    entry_gate=None,
+    # -------------------------------------------------------
+    # ATR trailing stop parameters
+    # -------------------------------------------------------
+    use_atr_stop=False,  # False = fixed % (X), True = ATR-scaled (N_atr)
+    N_atr=3.0,  # ATR multiplier for trailing stop (used when use_atr_stop=True)
+    atr_window=20,  # Rolling window for close-only ATR estimate (days)
+    # -------------------------------------------------------
+    fast_mode=True,
+    indicators=None,
+    metrics_only=False,
+):
+    """
+    Run the trend-following strategy on a single price series and return
+    the equity curve, performance metrics, and trade log.
 
-    else:
-        # fallback: absolute daily % move * 100 to use 0.08 etc grid
-        df["atr"] = (df["price"].diff().abs() / df["price"].shift(1)).rolling(
-            atr_window,
-        ).mean().shift(1) * 100
+    TRAILING STOP MODES
+    -------------------
+    use_atr_stop=False (default, backward-compatible):
+        stop_level = (1 - X) * M
+        X is the fixed fraction below the running peak. Identical to the
+        original implementation. X is searched over X_grid in walk_forward.
 
-    df.dropna(inplace=True)
+    use_atr_stop=True (normalised ATR Chandelier exit):
+        stop_level = M * (1 - N_atr * ATR_pct)
+        ATR_pct is the rolling mean of |close_t - close_{t-1}| / close_{t-1}
+        over atr_window bars — a dimensionless daily-return ATR. This makes
+        N_atr directly comparable to X: N_atr=0.10 means trail by 10% of M
+        when the average daily move equals 10% of price, with the stop
+        widening in high-vol regimes and tightening in low-vol regimes.
+        N_atr is searched over N_atr_grid in walk_forward; values are the
+        same order of magnitude as X_grid (e.g. 0.08 to 0.20 for equity).
 
-    # -----------------------
-    # Initialise state
-    # -----------------------
+    The absolute stop (stop_loss, ABSOLUTE_STOP exit) is always a fixed
+    fraction below entry price regardless of ATR mode — it is a backstop
+    for gap-down events and is not made volatility-adaptive.
 
-    equity = 1.0
-    equity_curve = []
-    trades = []
+    All other parameters and the carry-state mechanism are unchanged.
 
-    if initial_state is not None:
+    indicators (optional) is a store from build_indicator_store built on
+    the same price frame; when it covers the requested fast / slow /
+    momentum settings the rolling indicators are looked up instead of
+    recomputed. It is ignored (and the indicators computed as usual)
+    whenever warmup_df is given or the store was built on another index.
+
+    metrics_only=True is the grid-search path: equity is kept in a
+    preallocated NumPy buffer, no trade log is built and the metrics are
+    computed with compute_metrics_array. Returns (None, metrics, None,
+    end_state). Implies fast_mode.
+    """
+
+    df, gate_aligned, test_start, rf_rate = _prepare_strategy_frame(
+        df,
+        price_col=price_col,
+        fast=fast,
+        slow=slow,
+        vol_window=vol_window,
+        filter_mode=filter_mode,
+        mom_lookback=mom_lookback,
+        cash_df=cash_df,
+        safe_rate=safe_rate,
+        warmup_df=warmup_df,
+        fund_signal=fund_signal,
+        entry_gate=entry_gate,
+        atr_window=atr_window,
+        indicators=indicators,
+    )
+
+    # -----------------------
+    # Initialise state
+    # -----------------------
+
+    equity = 1.0
+    equity_curve = []
+    trades = []
+
+    if initial_state is not None:
         position = initial_state["position"]
         entry_price = initial_state["entry_price"]
         entry_date = initial_state["entry_date"]
@@ -657,6 +967,9 @@ def run_strategy_with_trades(
     else:
         filter_mode_active = "ma"
 
+    # metrics_only always takes the fast path (no DataFrame iteration)
+    fast_mode = fast_mode or metrics_only
+
     if fast_mode:
         _prices = df["price"].to_numpy()
         _rets = df["ret"].to_numpy()
@@ -673,6 +986,7 @@ def run_strategy_with_trades(
         )
         _fund_vals = df["fund_filter"].to_numpy() if "fund_filter" in df.columns else None
         _index = df.index
+        equity_curve = np.empty(len(_prices))
 
     if fast_mode:
         # ------------------------------------------------------------------
@@ -697,7 +1011,7 @@ def run_strategy_with_trades(
 
             is_warmup_row = bool(_warmups[_n])
             if is_warmup_row:
-                equity_curve.append(equity)
+                equity_curve[_n] = equity
                 continue
 
             if position > 0:
@@ -753,23 +1067,24 @@ def run_strategy_with_trades(
             exit_reason = " + ".join(exit_reasons) if exit_reasons else None
 
             if position > 0 and exit_reason:
-                COST = 0.0020
-                trade_ret = price / entry_price - 1 - COST
-                days = (i - entry_date).days
-                trades.append(
-                    {
-                        "EntryDate": entry_date,
-                        "ExitDate": i,
-                        "EntryPrice": entry_price,
-                        "Position": entry_pos,
-                        "ExitPrice": price,
-                        "Return": trade_ret,
-                        "Days": days,
-                        "Entry Reason": entry_reason,
-                        "Exit Reason": exit_reason,
-                        "CrossWindow": entry_carried,
-                    },
-                )
+                if not metrics_only:
+                    COST = 0.0020
+                    trade_ret = price / entry_price - 1 - COST
+                    days = (i - entry_date).days
+                    trades.append(
+                        {
+                            "EntryDate": entry_date,
+                            "ExitDate": i,
+                            "EntryPrice": entry_price,
+                            "Position": entry_pos,
+                            "ExitPrice": price,
+                            "Return": trade_ret,
+                            "Days": days,
+                            "Entry Reason": entry_reason,
+                            "Exit Reason": exit_reason,
+                            "CrossWindow": entry_carried,
+                        },
+                    )
                 position = 0
                 entry_price = None
                 entry_date = None
@@ -791,7 +1106,7 @@ def run_strategy_with_trades(
                     M = price
                     entry_carried = False
 
-            equity_curve.append(equity)
+            equity_curve[_n] = equity
 
     else:
         # ------------------------------------------------------------------
@@ -916,7 +1231,7 @@ def run_strategy_with_trades(
 
     end_state = None
 
-    if position > 0 and entry_price is not None:
+    if position > 0 and entry_price is not None and not metrics_only:
         last_date = df.index[-1]
         last_price = df["price"].iloc[-1]
         trade_ret = last_price / entry_price - 1
@@ -945,6 +1260,7 @@ def run_strategy_with_trades(
             },
         )
 
+    if position > 0 and entry_price is not None:
         end_state = {
             "position": position,
             "entry_price": entry_price,
@@ -957,6 +1273,17 @@ def run_strategy_with_trades(
             "rebal_cost_total": rebal_cost_total,
         }
 
+    if metrics_only:
+        # Equity-only path: metrics straight from the NumPy buffer, no
+        # trade log or output DataFrame.
+        oos_equity = equity_curve[~_warmups]
+        first_val = oos_equity[0]
+        if first_val != 0:
+            oos_equity = oos_equity / first_val
+        metrics_row = compute_metrics_array(oos_equity, risk_free_rate=rf_rate)[0]
+        metrics = {k: float(v) for k, v in zip(METRIC_COLUMNS, metrics_row, strict=True)}
+        return None, metrics, None, end_state
+
     df["equity"] = equity_curve
     df = df[~df["_warmup"]].copy()
     df.drop(columns=["_warmup"], inplace=True)
@@ -983,11 +1310,483 @@ def run_strategy_with_trades(
     return df, metrics, trades_df, end_state
 
 
+# -------------------------------------------------------
+# Batched kernel — many (stop, Y, stop_loss) combinations per pass
+# -------------------------------------------------------
+
+
+def _calc_position_array(vol, position_mode, target_vols, max_leverage):
+    """
+    Vectorised calc_position for one bar and an array of target vols;
+    vol is a scalar or one value per target vol (stacked paths).
+    """
+    if position_mode == "full":
+        return np.ones_like(target_vols)
+    if np.ndim(vol) > 0:
+        valid = ~np.isnan(vol) & (vol > 0)
+        pos = np.where(valid, target_vols / np.where(valid, vol, 1.0), 1.0)
+    elif pd.notna(vol) and vol > 0:
+        pos = target_vols / vol
+    else:
+        pos = np.ones_like(target_vols)
+    return np.minimum(pos, max_leverage)
+
+
+def _simulate_batch(
+    prices,
+    rets,
+    cash_rets,
+    filter_on,
+    vols,
+    atrs,
+    stop_vals,
+    Y_vals,
+    stop_losses,
+    target_vols,
+    use_atr_stop=False,
+    position_mode="full",
+    max_leverage=1.0,
+    warmup=None,
+    gate=None,
+    initial_state=None,
+):
+    """
+    Step the breakout / trailing-stop state machine of
+    run_strategy_with_trades for P parameter combinations at once.
+
+    The time loop stays sequential (the state machine is path dependent);
+    every bar is a handful of NumPy operations across the parameter axis,
+    so the per-combination Python overhead disappears. Per-bar arithmetic
+    is written in the same order as the scalar fast path so the equity
+    curves match it bit for bit.
+
+    The indicator arrays may also be (T, P), one column per combination,
+    so combinations on different price paths sharing one calendar (the
+    synthetic histories of a block bootstrap) run in the same pass.
+
+    Parameters
+    ----------
+    prices, rets, cash_rets, vols, atrs : np.ndarray (T,) or (T, P) —
+                  indicator arrays
+    filter_on   : np.ndarray (T,) or (T, P) bool — trend / momentum / fund filter
+    stop_vals   : np.ndarray (P,) — X in fixed mode, N_atr in ATR mode
+    Y_vals      : np.ndarray (P,) — breakout thresholds
+    stop_losses : np.ndarray (P,) — absolute stop fractions
+    target_vols : np.ndarray (P,) — target vol (ignored when position_mode="full")
+    use_atr_stop : bool or np.ndarray (P,) bool — trailing stop type, per
+                   combination when an array (fixed and ATR stops in one pass)
+    warmup      : np.ndarray (T,) bool or None — rows that only record equity
+    gate        : np.ndarray (T,) bool or None — entry gate (True = entries allowed)
+    initial_state : dict of np.ndarray (P,) or None — position, entry_price,
+                    M, m carried in from a previous window (NaN = None)
+
+    Returns
+    -------
+    (equity, state)
+        equity : np.ndarray (P, T) — equity after each bar (not normalised)
+        state  : dict of np.ndarray (P,) — position, entry_price, M, m
+                 after the last bar
+    """
+    n_params = len(stop_vals)
+    n_bars = len(prices)
+
+    if initial_state is not None:
+        position = np.array(initial_state["position"], dtype=float)
+        entry_price = np.array(initial_state["entry_price"], dtype=float)
+        M = np.array(initial_state["M"], dtype=float)
+        m = np.array(initial_state["m"], dtype=float)
+    else:
+        position = np.zeros(n_params)
+        entry_price = np.full(n_params, np.nan)
+        M = np.full(n_params, np.nan)
+        m = np.full(n_params, np.nan)
+
+    equity = np.ones(n_params)
+    curve = np.empty((n_params, n_bars))
+    no_breach = np.zeros(n_params, dtype=bool)
+
+    use_atr = np.broadcast_to(np.asarray(use_atr_stop, dtype=bool), (n_params,))
+    any_atr = use_atr.any()
+    all_atr = use_atr.all()
+
+    for t in range(n_bars):
+        if warmup is not None and warmup[t]:
+            curve[:, t] = equity
+            continue
+
+        price = prices[t]
+        ret = rets[t]
+        cash_ret = cash_rets[t]
+        vol = vols[t]
+        atr_val = atrs[t]
+
+        in_pos = position > 0
+        equity = equity * np.where(
+            in_pos, 1 + position * ret + (1 - position) * cash_ret, 1 + cash_ret,
+        )
+
+        abs_stop = in_pos & ((price - entry_price) / entry_price < -stop_losses)
+
+        if position_mode == "vol_dynamic":
+            new_pos = _calc_position_array(vol, position_mode, target_vols, max_leverage)
+            size_change = np.abs(new_pos - position)
+            rebal = in_pos & (size_change > 0.1)
+            REBAL_COST = 0.0005
+            equity = np.where(rebal, equity * (1 - size_change * REBAL_COST), equity)
+            position = np.where(rebal, new_pos, position)
+            in_pos = position > 0
+
+        M = np.where(in_pos, np.maximum(M, price), M)
+        if any_atr:
+            atr_ok = np.isfinite(atr_val) & (atr_val > 0)
+            if np.all(atr_ok):
+                trail_breached = price < M * (1 - stop_vals * atr_val)
+            elif np.any(atr_ok):
+                trail_breached = atr_ok & (price < M * (1 - stop_vals * atr_val))
+            else:
+                trail_breached = no_breach
+            if not all_atr:
+                trail_breached = np.where(use_atr, trail_breached, price < (1 - stop_vals) * M)
+        else:
+            trail_breached = price < (1 - stop_vals) * M
+
+        exiting = in_pos & (abs_stop | trail_breached | ~filter_on[t])
+        if exiting.any():
+            position = np.where(exiting, 0.0, position)
+            entry_price = np.where(exiting, np.nan, entry_price)
+            M = np.where(exiting, np.nan, M)
+            m = np.where(exiting, np.nan, m)
+
+        flat = position == 0
+        m = np.where(flat, np.where(np.isnan(m), price, np.minimum(m, price)), m)
+        allow = filter_on[t] if gate is None else filter_on[t] & gate[t]
+        if np.any(allow):
+            entering = flat & allow & (price > (1 + Y_vals) * m)
+            if entering.any():
+                new_pos = _calc_position_array(vol, position_mode, target_vols, max_leverage)
+                position = np.where(entering, new_pos, position)
+                entry_price = np.where(entering, price, entry_price)
+                M = np.where(entering, price, M)
+
+        curve[:, t] = equity
+
+    state = {"position": position, "entry_price": entry_price, "M": M, "m": m}
+    return curve, state
+
+
+def _frame_filter_on(frame, filter_mode, fund_signal):
+    """Entry / hold filter of an indicator frame as a bool array."""
+    if fund_signal is not None:
+        return frame["fund_filter"].to_numpy().astype(bool)
+    if filter_mode in ("mom", "mom_blend"):
+        return frame["MOM"].to_numpy() > 0
+    return frame["trend"].to_numpy() == 1
+
+
+def run_strategy_batch(
+    df,
+    stop_vals,
+    Y_vals,
+    stop_losses,
+    target_vols=0.10,
+    price_col="price",
+    fast=50,
+    slow=200,
+    vol_window=20,
+    max_leverage=1.0,
+    position_mode="vol_entry",
+    filter_mode="ma",
+    mom_lookback=252,
+    cash_df=None,
+    safe_rate=0.0,
+    warmup_df=None,
+    fund_signal=None,
+    entry_gate=None,
+    use_atr_stop=False,
+    atr_window=20,
+    indicators=None,
+):
+    """
+    Evaluate many (stop, Y, stop_loss[, target_vol]) combinations on one
+    price window in a single pass and return their metrics.
+
+    Equivalent to calling run_strategy_with_trades once per combination
+    (with the same fast/slow/filter settings and no initial_state) and
+    keeping only the metrics dict, but the indicator frame is built once
+    and the day loop runs over a (parameter × time) NumPy state instead of
+    one Python loop per combination. No trade log is produced — use
+    run_strategy_with_trades for the OOS run and for reporting.
+
+    Parameters
+    ----------
+    stop_vals   : array-like (P,) — X in fixed mode, N_atr in ATR mode
+    Y_vals      : array-like (P,) — breakout thresholds
+    stop_losses : array-like (P,) — absolute stop fractions
+    target_vols : float or array-like (P,) — target vol per combination
+    use_atr_stop : bool or array-like (P,) bool — stop type, per combination
+                   when an array
+    Remaining parameters as in run_strategy_with_trades.
+
+    Returns
+    -------
+    np.ndarray or None — (P, 6) metrics, columns in METRIC_COLUMNS order;
+                         None if the window has fewer than 2 usable rows.
+    """
+    frame, gate_aligned, test_start, rf_rate = _prepare_strategy_frame(
+        df,
+        price_col=price_col,
+        fast=fast,
+        slow=slow,
+        vol_window=vol_window,
+        filter_mode=filter_mode,
+        mom_lookback=mom_lookback,
+        cash_df=cash_df,
+        safe_rate=safe_rate,
+        warmup_df=warmup_df,
+        fund_signal=fund_signal,
+        entry_gate=entry_gate,
+        atr_window=atr_window,
+        indicators=indicators,
+    )
+
+    warmup = frame["_warmup"].to_numpy(dtype=bool)
+    if (~warmup).sum() < 2:
+        return None
+
+    stop_vals = np.asarray(stop_vals, dtype=float)
+    Y_vals = np.asarray(Y_vals, dtype=float)
+    stop_losses = np.asarray(stop_losses, dtype=float)
+    target_vols = np.broadcast_to(np.asarray(target_vols, dtype=float), stop_vals.shape)
+
+    filter_on = _frame_filter_on(frame, filter_mode, fund_signal)
+
+    gate = (
+        gate_aligned.reindex(frame.index).fillna(1).to_numpy().astype(int) == 1
+        if gate_aligned is not None
+        else None
+    )
+
+    curve, _ = _simulate_batch(
+        frame["price"].to_numpy(),
+        frame["ret"].to_numpy(),
+        frame["cash_ret"].to_numpy(),
+        filter_on,
+        frame["vol"].to_numpy(),
+        frame["atr"].to_numpy(),
+        stop_vals,
+        Y_vals,
+        stop_losses,
+        target_vols,
+        use_atr_stop=use_atr_stop,
+        position_mode=position_mode,
+        max_leverage=max_leverage,
+        warmup=warmup if warmup.any() else None,
+        gate=gate,
+    )
+
+    curve = curve[:, ~warmup]
+    first_val = curve[:, :1]
+    curve = np.divide(curve, first_val, out=curve.copy(), where=first_val != 0)
+
+    return compute_metrics_array(curve, risk_free_rate=rf_rate)
+
+
+# Columns (paths x combinations) of one stacked _simulate_batch pass in
+# run_strategy_batch_paths; bounds its (columns x time) equity buffer.
+_MAX_STACKED_COLUMNS = 4096
+
+
+def run_strategy_batch_paths(
+    dfs,
+    stop_vals,
+    Y_vals,
+    stop_losses,
+    target_vols=0.10,
+    price_col="price",
+    fast=50,
+    slow=200,
+    vol_window=20,
+    max_leverage=1.0,
+    position_mode="vol_entry",
+    filter_mode="ma",
+    mom_lookback=252,
+    cash_dfs=None,
+    safe_rate=0.0,
+    fund_signal=None,
+    use_atr_stop=False,
+    atr_window=20,
+    indicators=None,
+):
+    """
+    run_strategy_batch of the same combinations on several price paths
+    that share one calendar (e.g. block-bootstrapped histories).
+
+    Every path gets its own indicator frame; the frames are stacked into
+    (time × paths·combinations) arrays so one _simulate_batch pass covers
+    all paths (at most _MAX_STACKED_COLUMNS columns per pass). Metrics are
+    identical to one run_strategy_batch call per path, which is also the
+    fallback when the frames of the paths do not share one index.
+
+    Parameters
+    ----------
+    dfs        : list of pd.DataFrame — one price frame per path
+    cash_dfs   : list of pd.DataFrame or None — cash frame per path
+    indicators : list of indicator stores (or None) — one per path
+    Remaining parameters as in run_strategy_batch; the training-window
+    grid search uses neither warmup_df nor entry_gate, so they are not
+    supported here.
+
+    Returns
+    -------
+    list — per path, (P, 6) metrics or None as returned by run_strategy_batch
+    """
+    n_paths = len(dfs)
+    if cash_dfs is None:
+        cash_dfs = [None] * n_paths
+    if indicators is None:
+        indicators = [None] * n_paths
+
+    frame_kwargs = {
+        "price_col": price_col,
+        "fast": fast,
+        "slow": slow,
+        "vol_window": vol_window,
+        "filter_mode": filter_mode,
+        "mom_lookback": mom_lookback,
+        "safe_rate": safe_rate,
+        "fund_signal": fund_signal,
+        "atr_window": atr_window,
+    }
+    frames = []
+    rf_rates = []
+    for df, cash_df, path_indicators in zip(dfs, cash_dfs, indicators, strict=True):
+        frame, _, _, rf_rate = _prepare_strategy_frame(
+            df, cash_df=cash_df, indicators=path_indicators, **frame_kwargs,
+        )
+        frames.append(frame)
+        rf_rates.append(rf_rate)
+
+    batch_kwargs = {
+        "target_vols": target_vols,
+        "max_leverage": max_leverage,
+        "position_mode": position_mode,
+        "use_atr_stop": use_atr_stop,
+        **frame_kwargs,
+    }
+    if any(not frame.index.equals(frames[0].index) for frame in frames[1:]):
+        return [
+            run_strategy_batch(
+                df,
+                stop_vals,
+                Y_vals,
+                stop_losses,
+                cash_df=cash_df,
+                indicators=path_indicators,
+                **batch_kwargs,
+            )
+            for df, cash_df, path_indicators in zip(dfs, cash_dfs, indicators, strict=True)
+        ]
+
+    if n_paths == 0 or len(frames[0]) < 2:
+        return [None] * n_paths
+
+    stop_vals = np.asarray(stop_vals, dtype=float)
+    Y_vals = np.asarray(Y_vals, dtype=float)
+    stop_losses = np.asarray(stop_losses, dtype=float)
+    target_vols = np.broadcast_to(np.asarray(target_vols, dtype=float), stop_vals.shape)
+    use_atr_stop = np.asarray(use_atr_stop, dtype=bool)
+
+    columns = {
+        name: np.column_stack([frame[name].to_numpy() for frame in frames])
+        for name in ("price", "ret", "cash_ret", "vol", "atr")
+    }
+    columns["filter_on"] = np.column_stack(
+        [_frame_filter_on(frame, filter_mode, fund_signal) for frame in frames],
+    )
+
+    # Path-major columns: path k holds columns k*P .. (k+1)*P - 1
+    n_params = len(stop_vals)
+    paths_per_pass = max(1, _MAX_STACKED_COLUMNS // n_params)
+    results = []
+    for lo in range(0, n_paths, paths_per_pass):
+        hi = min(lo + paths_per_pass, n_paths)
+        stacked = {
+            name: np.repeat(values[:, lo:hi], n_params, axis=1)
+            for name, values in columns.items()
+        }
+        curve, _ = _simulate_batch(
+            stacked["price"],
+            stacked["ret"],
+            stacked["cash_ret"],
+            stacked["filter_on"],
+            stacked["vol"],
+            stacked["atr"],
+            np.tile(stop_vals, hi - lo),
+            np.tile(Y_vals, hi - lo),
+            np.tile(stop_losses, hi - lo),
+            np.tile(target_vols, hi - lo),
+            use_atr_stop=np.tile(use_atr_stop, hi - lo) if use_atr_stop.ndim else use_atr_stop,
+            position_mode=position_mode,
+            max_leverage=max_leverage,
+        )
+
+        first_val = curve[:, :1]
+        curve = np.divide(curve, first_val, out=curve.copy(), where=first_val != 0)
+        for k in range(hi - lo):
+            results.append(
+                compute_metrics_array(
+                    curve[k * n_params : (k + 1) * n_params],
+                    risk_free_rate=rf_rates[lo + k],
+                ),
+            )
+
+    return results
+
+
 # -------------------------------------------------------
 # walk_forward — threads state across windows
 # -------------------------------------------------------
 
 
+def objective_score(metrics, objective="calmar"):
+    """
+    Map a metrics dict to the walk-forward objective value.
+
+    Returns None when the objective involves Calmar and MaxDD is zero
+    (the combination is then dropped from the grid search).
+    """
+    max_dd = metrics.get("MaxDD", 0)
+    sharpe = metrics.get("Sharpe", 0)
+    calmar = metrics["CAGR"] / abs(max_dd) if max_dd != 0 else None
+    sortino = metrics.get("Sortino", 0)
+
+    if objective == "calmar":
+        return calmar
+    if objective == "sharpe":
+        return sharpe
+    if objective == "sortino":
+        return sortino
+    if objective == "calmar_sharpe":
+        if calmar is None:
+            return None
+        return 0.5 * calmar + 0.5 * sharpe
+    if objective == "calmar_sortino":
+        if calmar is None:
+            return None
+        return 0.5 * calmar + 0.5 * sortino
+    raise ValueError(f"Unknown objective: {objective!r}")
+
+
+def _objective_value(metrics, objective):
+    """
+    objective_score for one objective name, or a tuple of scores (None
+    where undefined) when objective is a sequence of names.
+    """
+    if isinstance(objective, str):
+        return objective_score(metrics, objective)
+    return tuple(objective_score(metrics, name) for name in objective)
+
+
 def evaluate_params(
     filter_mode,
     fund_idx,
@@ -1013,6 +1812,7 @@ def evaluate_params(
     use_atr_stop=False,
     N_atr=3.0,
     atr_window=20,
+    indicators=None,
 ):
     """
     Evaluate a single parameter combination on the training window.
@@ -1021,6 +1821,9 @@ def evaluate_params(
     (N_atr is used instead). X is still passed as part of the key tuple
     in position 2, but in ATR mode walk_forward substitutes N_atr values
     from N_atr_grid into that position so the key structure is consistent.
+
+    objective may be a tuple of objective names; the score is then a tuple
+    with one entry per objective (None where undefined).
     """
 
     # use_mom = (filter_mode == "mom")
@@ -1052,34 +1855,16 @@ def evaluate_params(
         use_atr_stop=use_atr_stop,
         N_atr=N_atr,
         atr_window=atr_window,
+        indicators=indicators,
+        metrics_only=fast_mode,
     )
 
     if metrics is None:
         return None
 
-    max_dd = metrics.get("MaxDD", 0)
-    sharpe = metrics.get("Sharpe", 0)
-    calmar = metrics["CAGR"] / abs(max_dd) if max_dd != 0 else None
-    sortino = metrics.get("Sortino", 0)
-
-    if objective == "calmar":
-        if calmar is None:
-            return None
-        obj_value = calmar
-    elif objective == "sharpe":
-        obj_value = sharpe
-    elif objective == "sortino":
-        obj_value = sortino
-    elif objective == "calmar_sharpe":
-        if calmar is None:
-            return None
-        obj_value = 0.5 * calmar + 0.5 * sharpe
-    elif objective == "calmar_sortino":
-        if calmar is None:
-            return None
-        obj_value = 0.5 * calmar + 0.5 * sortino
-    else:
-        raise ValueError(f"Unknown objective: {objective!r}")
+    obj_value = _objective_value(metrics, objective)
+    if obj_value is None:
+        return None
 
     # Key tuple: position 2 holds the stop parameter.
     # In fixed mode: X (a fraction).
@@ -1091,144 +1876,267 @@ def evaluate_params(
     return key, obj_value
 
 
-def walk_forward(
-    df,
-    cash_df,
-    train_years=8,
-    test_years=2,
-    vol_window=20,
-    funds_df=None,
-    fund_params_grid=None,
-    selected_mode="full",
-    filter_modes_override=None,
-    X_grid=[0.08, 0.10, 0.12, 0.15, 0.20],
-    Y_grid=[0.02, 0.03, 0.05, 0.07, 0.10],
-    fast_grid=[50, 75, 100],
-    slow_grid=[150, 200, 250],
-    tv_grid=[0.08, 0.10, 0.12, 0.15, 0.20],
-    sl_grid=[0.05, 0.08, 0.10, 0.15],
-    mom_lookback_grid=[126, 252],
+def evaluate_param_batch(
+    filter_mode,
+    fund_idx,
+    fund_params,
+    fast,
+    slow,
+    mom_lookback,
+    combos,
+    train,
+    cash_train,
+    vol_window,
+    selected_mode,
+    funds_df,
+    train_start,
+    train_end,
     objective="calmar",
-    n_jobs=1,
-    entry_gate_series=None,
-    fast_mode=True,
-    # -------------------------------------------------------
-    # ATR trailing stop parameters
-    # -------------------------------------------------------
-    use_atr_stop=False,  # False = fixed % X, True = ATR-scaled N_atr
-    N_atr_grid=None,  # ATR multiplier grid; replaces X_grid when
-    # use_atr_stop=True. Default: [2.0,3.0,4.0,5.0,6.0]
-    atr_window=20,  # Rolling window for ATR estimate (days)
+    use_atr_stop=False,
+    atr_window=20,
+    indicators=None,
 ):
     """
-    Run a rolling walk-forward optimisation and return a stitched
-    out-of-sample equity curve.
+    Batched counterpart of evaluate_params.
 
-    ATR STOP MODE
-    -------------
-    When use_atr_stop=True, the trailing stop parameter searched over is
-    N_atr (ATR multiplier) rather than X (fixed fraction). N_atr_grid
-    replaces X_grid in the parameter combinations loop. The key tuple
-    structure is unchanged — position 2 simply holds N_atr instead of X.
-    neighbour_mean receives N_atr_grid as the stop_grid argument.
+    Evaluates every (stop_val, Y, tv, stop_loss) tuple in combos that
+    shares the same filter settings (filter_mode, fund_idx, fast, slow,
+    mom_lookback) with one run_strategy_batch call on the training window.
 
-    All other walk-forward mechanics (carry state, warmup, stability
-    penalty, OOS stitching) are identical to the fixed-stop mode.
+    A combo may carry a fifth element, its own use_atr_stop flag, so fixed
+    and ATR stops share the pass; the flag is then appended to its key.
 
-    Backward compatibility: use_atr_stop defaults to False. Existing
-    callers that do not pass ATR parameters are completely unaffected.
+    Returns
+    -------
+    list — one entry per combo, each either (key, obj_value) with the same
+           key layout as evaluate_params, or None if the combination was
+           rejected by the objective. obj_value is a tuple when objective
+           is a tuple of names (see evaluate_params).
     """
+    train_fund_signal = None
+    if filter_mode == "fund" and fund_params is not None:
+        # Import here to avoid circular dependency (fund_filter imports this module)
+        from moj_system.core.fund_filter import compute_fund_breadth_signal
 
-    # Resolve ATR grid default
-    if N_atr_grid is None:
-        N_atr_grid = [0.08, 0.10, 0.12, 0.15, 0.20]
+        funds_train = funds_df.loc[(funds_df.index >= train_start) & (funds_df.index < train_end)]
+        train_fund_signal = compute_fund_breadth_signal(
+            funds_train,
+            **fund_params,
+        )
 
-    # The stop grid for neighbour_mean: X_grid in fixed mode, N_atr_grid in ATR mode
-    stop_grid = N_atr_grid if use_atr_stop else X_grid
+    stop_vals, Y_vals, tv_vals, sl_vals, use_atr_stop = _combo_arrays(combos, use_atr_stop)
 
-    data_end = df.index.max()
-    logging.info(
-        "walk_forward received data from %s to %s (%d rows)", df.index.min(), data_end, len(df),
+    metrics_arr = run_strategy_batch(
+        train,
+        stop_vals=stop_vals,
+        Y_vals=Y_vals,
+        stop_losses=sl_vals,
+        target_vols=tv_vals,
+        cash_df=cash_train,
+        price_col="Zamkniecie",
+        fast=fast,
+        slow=slow,
+        vol_window=vol_window,
+        position_mode=selected_mode,
+        filter_mode=filter_mode,
+        mom_lookback=mom_lookback,
+        fund_signal=train_fund_signal,
+        use_atr_stop=use_atr_stop,
+        atr_window=atr_window,
+        indicators=indicators,
     )
-    logging.info("Objective function: %s", objective)
-    logging.info(
-        "Trailing stop mode: %s  (ATR window=%d)",
-        "ATR-scaled (Chandelier)" if use_atr_stop else "fixed percentage",
-        atr_window,
+
+    return _batch_results(
+        filter_mode, fund_idx, fast, slow, mom_lookback, combos, metrics_arr, objective,
     )
 
-    oos_equity_slices = []
+
+def _combo_arrays(combos, use_atr_stop):
+    """
+    Split evaluate_param_batch combos into (stop_vals, Y_vals, tv_vals,
+    sl_vals, use_atr_stop); use_atr_stop becomes a per-combination array
+    when combos carry their own stop flag.
+    """
+    stop_vals, Y_vals, tv_vals, sl_vals = zip(*(combo[:4] for combo in combos), strict=True)
+    if any(len(combo) > 4 for combo in combos):
+        use_atr_stop = np.array(
+            [combo[4] if len(combo) > 4 else use_atr_stop for combo in combos], dtype=bool,
+        )
+    return stop_vals, Y_vals, tv_vals, sl_vals, use_atr_stop
+
+
+def _batch_results(filter_mode, fund_idx, fast, slow, mom_lookback, combos, metrics_arr, objective):
+    """(key, obj_value) or None per combo from run_strategy_batch metrics."""
+    if metrics_arr is None:
+        return [None] * len(combos)
+
     results = []
-    all_oos_trades = []
+    for combo, row in zip(combos, metrics_arr, strict=True):
+        obj_value = _objective_value(dict(zip(METRIC_COLUMNS, row, strict=True)), objective)
+        if obj_value is None:
+            results.append(None)
+            continue
+        stop_val, Y, tv, stop_loss = combo[:4]
+        key = (filter_mode, fund_idx, stop_val, Y, fast, slow, tv, stop_loss, mom_lookback)
+        results.append((key + tuple(combo[4:]), obj_value))
+    return results
 
-    start = df.index.min()
-    carry_state = None
 
-    if filter_modes_override is not None:
-        logging.info("filter_modes overridden to: %s", filter_modes_override)
+# -------------------------------------------------------
+# Worker-resident window data for the grid search
+# -------------------------------------------------------
 
-    while True:
-        gate_train = None
-        gate_oos = None
-        train_start = start
-        train_end = train_start + pd.DateOffset(years=train_years)
-        test_end = train_end + pd.DateOffset(years=test_years)
+# Per-process cache of published window data (path -> dict). loky reuses
+# worker processes across pools, so it is bounded; paths are unique per
+# pool, so stale entries are never hit.
+_WINDOW_DATA_CACHE = {}
+_WINDOW_DATA_CACHE_SIZE = 8
 
-        train = df.loc[(df.index >= train_start) & (df.index < train_end)]
 
-        next_window_has_enough = len(df.loc[df.index >= test_end]) >= (test_years * 252)
-        if not next_window_has_enough:
-            test_end = data_end + pd.DateOffset(days=1)
+def _load_window_data(data_path):
+    """Window data written by _window_grid_tasks, loaded once per process."""
+    data = _WINDOW_DATA_CACHE.get(data_path)
+    if data is None:
+        data = load(data_path)
+        _WINDOW_DATA_CACHE[data_path] = data
+        while len(_WINDOW_DATA_CACHE) > _WINDOW_DATA_CACHE_SIZE:
+            _WINDOW_DATA_CACHE.pop(next(iter(_WINDOW_DATA_CACHE)))
+    return data
 
-        test = df.loc[(df.index >= train_end) & (df.index < test_end)]
 
-        logging.info(
-            "Iteration: train=%s to %s (%d rows) | test=%s to %s (%d rows) | "
-            "next_window_has_enough=%s | data_end=%s",
-            train_start.date(),
-            train_end.date(),
-            len(train),
-            train_end.date(),
-            test_end.date(),
-            len(test),
-            next_window_has_enough,
-            data_end.date(),
-        )
+def _release_window_data(data_dir):
+    """Drop this process's cached window data published under data_dir."""
+    for data_path in [p for p in _WINDOW_DATA_CACHE if p.startswith(data_dir)]:
+        _WINDOW_DATA_CACHE.pop(data_path, None)
 
-        if train.empty or len(test) < 30:
-            logging.info("Breaking — train empty or test too short")
-            break
 
-        cash_train = cash_df.loc[(cash_df.index >= train_start) & (cash_df.index < train_end)]
+def evaluate_window_chunk(data_path, items):
+    """
+    Evaluate a chunk of grid search items against one published window.
 
-        gate_train = None
-        if entry_gate_series is not None:
-            gate_train = (
-                entry_gate_series.reindex(
-                    train.index,
-                    method="ffill",
-                )
-                .fillna(1)
-                .astype(int)
+    Items are (filter_mode, fund_idx, fund_params, fast, slow,
+    mom_lookback, combos) groups in batch mode, full combination tuples
+    otherwise.
+
+    Returns
+    -------
+    list — evaluate_param_batch / evaluate_params result per item
+    """
+    data = _load_window_data(data_path)
+    results = []
+
+    if data["batch_mode"]:
+        for filter_mode, fund_idx, fund_params, fast, slow, mom_lookback, combos in items:
+            results.append(
+                evaluate_param_batch(
+                    filter_mode,
+                    fund_idx,
+                    fund_params,
+                    fast,
+                    slow,
+                    mom_lookback,
+                    combos,
+                    data["train"],
+                    data["cash_train"],
+                    data["vol_window"],
+                    data["selected_mode"],
+                    data["funds_df"],
+                    data["train_start"],
+                    data["train_end"],
+                    objective=data["objective"],
+                    use_atr_stop=data["use_atr_stop"],
+                    atr_window=data["atr_window"],
+                    indicators=data["indicators"],
+                ),
             )
+        return results
+
+    for (
+        filter_mode,
+        fund_idx,
+        fund_params,
+        stop_val,
+        Y,
+        fast,
+        slow,
+        tv,
+        stop_loss,
+        mom_lookback,
+    ) in items:
+        results.append(
+            evaluate_params(
+                filter_mode,
+                fund_idx,
+                fund_params,
+                stop_val,
+                Y,
+                fast,
+                slow,
+                tv,
+                stop_loss,
+                data["train"],
+                data["cash_train"],
+                data["vol_window"],
+                data["selected_mode"],
+                data["funds_df"],
+                data["train_start"],
+                data["train_end"],
+                objective=data["objective"],
+                mom_lookback=mom_lookback,
+                entry_gate=data["gate_train"],
+                fast_mode=data["fast_mode"],
+                use_atr_stop=data["use_atr_stop"],
+                N_atr=stop_val,
+                atr_window=data["atr_window"],
+                indicators=data["indicators"],
+            ),
+        )
+    return results
 
-        # -------------------------------------------------------
-        # Build parameter combinations
-        # In ATR mode: iterate over N_atr_grid instead of X_grid.
-        # The loop variable is named stop_val in both cases and placed
-        # at key position 2 — consistent with evaluate_params key tuple.
-        # -------------------------------------------------------
-        param_scores = {}
 
-        filter_modes = ["ma", "mom", "mom_blend"]
-        if funds_df is not None:
-            filter_modes.append("fund")
+def _grid_combinations(
+    funds_df,
+    fund_params_grid,
+    selected_mode,
+    filter_modes_override,
+    X_grid,
+    Y_grid,
+    fast_grid,
+    slow_grid,
+    tv_grid,
+    sl_grid,
+    mom_lookback_grid,
+    use_atr_stop,
+    N_atr_grid,
+):
+    """
+    Parameter combinations of the walk-forward grid search, in grid order.
 
-        if filter_modes_override is not None:
-            filter_modes = filter_modes_override
+    Returns
+    -------
+    (param_combinations, filter_modes)
+    """
+    # -------------------------------------------------------
+    # Build parameter combinations
+    # In ATR mode: iterate over N_atr_grid instead of X_grid.
+    # The loop variable is named stop_val in both cases and placed
+    # at key position 2 — consistent with evaluate_params key tuple.
+    # -------------------------------------------------------
+    filter_modes = ["ma", "mom", "mom_blend"]
+    if funds_df is not None:
+        filter_modes.append("fund")
 
-        param_combinations = []
+    if filter_modes_override is not None:
+        filter_modes = filter_modes_override
 
+    param_combinations = []
+
+    # use_atr_stop="both": fixed and ATR combinations in one grid, each
+    # tagged with its stop flag (appended as the last tuple element)
+    stop_modes = (False, True) if use_atr_stop == "both" else (use_atr_stop,)
+
+    for stop_atr in stop_modes:
+        stop_flag = (stop_atr,) if use_atr_stop == "both" else ()
         for filter_mode in filter_modes:
             fast_iter = fast_grid if filter_mode == "ma" else [50]
             slow_iter = slow_grid if filter_mode == "ma" else [200]
@@ -1237,7 +2145,7 @@ def walk_forward(
                 list(enumerate(fund_params_grid)) if filter_mode == "fund" else [(None, None)]
             )
             # Stop grid: N_atr_grid in ATR mode, X_grid in fixed mode
-            stop_iter = N_atr_grid if use_atr_stop else X_grid
+            stop_iter = N_atr_grid if stop_atr else X_grid
 
             for fund_idx, fund_params in fund_iter:
                 for stop_val in stop_iter:  # stop_val = N_atr or X
@@ -1252,7 +2160,7 @@ def walk_forward(
                                         # In ATR mode: no equivalent constraint
                                         # (absolute stop fraction is independent
                                         # of the ATR multiplier)
-                                        if not use_atr_stop and stop_loss >= stop_val:
+                                        if not stop_atr and stop_loss >= stop_val:
                                             continue
                                         for mom_lookback in mom_lb_iter:
                                             param_combinations.append(
@@ -1267,168 +2175,868 @@ def walk_forward(
                                                     tv,
                                                     stop_loss,
                                                     mom_lookback,
+                                                    *stop_flag,
                                                 ),
                                             )
 
-        for backend, n_jobs_inner, label in [
-            ("loky", n_jobs, "multiprocessing"),
-            ("threading", n_jobs, "threading"),
-            (None, 1, "sequential"),
-        ]:
-            try:
-                if backend is None:
-                    results_list = [
-                        evaluate_params(
-                            filter_mode,
-                            fund_idx,
-                            fund_params,
-                            stop_val,
-                            Y,
-                            fast,
-                            slow,
-                            tv,
-                            stop_loss,
-                            train,
-                            cash_train,
-                            vol_window,
-                            selected_mode,
-                            funds_df,
-                            train_start,
-                            train_end,
-                            objective=objective,
-                            mom_lookback=mom_lookback,
-                            entry_gate=gate_train,
-                            fast_mode=fast_mode,
-                            use_atr_stop=use_atr_stop,
-                            N_atr=stop_val,
-                            atr_window=atr_window,
-                        )
-                        for (
-                            filter_mode,
-                            fund_idx,
-                            fund_params,
-                            stop_val,
-                            Y,
-                            fast,
-                            slow,
-                            tv,
-                            stop_loss,
-                            mom_lookback,
-                        ) in param_combinations
-                    ]
-                else:
-                    results_list = Parallel(n_jobs=n_jobs_inner, backend=backend)(
-                        delayed(evaluate_params)(
-                            filter_mode,
-                            fund_idx,
-                            fund_params,
-                            stop_val,
-                            Y,
-                            fast,
-                            slow,
-                            tv,
-                            stop_loss,
-                            train,
-                            cash_train,
-                            vol_window,
-                            selected_mode,
-                            funds_df,
-                            train_start,
-                            train_end,
-                            objective=objective,
-                            mom_lookback=mom_lookback,
-                            entry_gate=gate_train,
-                            fast_mode=fast_mode,
-                            use_atr_stop=use_atr_stop,
-                            N_atr=stop_val,
-                            atr_window=atr_window,
-                        )
-                        for (
-                            filter_mode,
-                            fund_idx,
-                            fund_params,
-                            stop_val,
-                            Y,
-                            fast,
-                            slow,
-                            tv,
-                            stop_loss,
-                            mom_lookback,
-                        ) in param_combinations
-                    )
+    return param_combinations, filter_modes
 
-                logging.info(
-                    "Grid search completed using %s backend (%d jobs).",
-                    label,
-                    n_jobs_inner,
-                )
+
+def _grid_indicator_store(train, param_combinations, filter_modes, vol_window, atr_window):
+    """Indicator store of a training window covering every grid combination."""
+    return build_indicator_store(
+        train,
+        price_col="Zamkniecie",
+        ma_lengths={c[5] for c in param_combinations} | {c[6] for c in param_combinations},
+        mom_lookbacks={c[9] for c in param_combinations if c[0] == "mom"},
+        mom_blend="mom_blend" in filter_modes,
+        vol_window=vol_window,
+        atr_window=atr_window,
+    )
+
+
+def _batch_items(param_combinations):
+    """
+    Group combinations sharing (filter_mode, fund_idx, fast, slow,
+    mom_lookback) into evaluate_param_batch items (filter_mode, fund_idx,
+    fund_params, fast, slow, mom_lookback, combos).
+    """
+    batch_groups = {}
+    for (
+        filter_mode,
+        fund_idx,
+        fund_params,
+        stop_val,
+        Y,
+        fast,
+        slow,
+        tv,
+        stop_loss,
+        mom_lookback,
+        *stop_flag,
+    ) in param_combinations:
+        group_key = (filter_mode, fund_idx, fast, slow, mom_lookback)
+        if group_key not in batch_groups:
+            batch_groups[group_key] = (fund_params, [])
+        batch_groups[group_key][1].append((stop_val, Y, tv, stop_loss, *stop_flag))
+
+    return [
+        (filter_mode, fund_idx, fund_params, fast, slow, mom_lookback, combos)
+        for (filter_mode, fund_idx, fast, slow, mom_lookback), (
+            fund_params,
+            combos,
+        ) in batch_groups.items()
+    ]
+
+
+def _window_grid_tasks(
+    train,
+    cash_train,
+    gate_train,
+    train_start,
+    train_end,
+    vol_window,
+    funds_df,
+    fund_params_grid,
+    selected_mode,
+    filter_modes_override,
+    X_grid,
+    Y_grid,
+    fast_grid,
+    slow_grid,
+    tv_grid,
+    sl_grid,
+    mom_lookback_grid,
+    objective,
+    fast_mode,
+    use_atr_stop,
+    N_atr_grid,
+    atr_window,
+    batch_mode,
+    n_jobs,
+    data_dir,
+):
+    """
+    Build the grid search tasks of one walk-forward training window.
+
+    The window data is written to data_dir (which must outlive the tasks);
+    n_jobs only sets the number of chunks.
+
+    Returns
+    -------
+    (tasks, param_combinations)
+        tasks              : list of joblib delayed evaluate_window_chunk
+                             calls, each returning a list of item results
+        param_combinations : list of combination tuples in grid order
+    """
+    param_combinations, filter_modes = _grid_combinations(
+        funds_df,
+        fund_params_grid,
+        selected_mode,
+        filter_modes_override,
+        X_grid,
+        Y_grid,
+        fast_grid,
+        slow_grid,
+        tv_grid,
+        sl_grid,
+        mom_lookback_grid,
+        use_atr_stop,
+        N_atr_grid,
+    )
+
+    # -------------------------------------------------------
+    # Indicator store — every rolling series the grid needs is
+    # computed once on this training window and looked up by each
+    # combination (only stop / Y / stop_loss / tv vary within it).
+    # -------------------------------------------------------
+    train_indicators = _grid_indicator_store(
+        train, param_combinations, filter_modes, vol_window, atr_window,
+    )
+
+    # -------------------------------------------------------
+    # Grid search tasks
+    # The window data (train, cash, gate, funds, indicator store) is
+    # written once to data_dir and loaded once per worker process by
+    # evaluate_window_chunk; tasks carry only parameter tuples, split
+    # into a few contiguous chunks per worker.
+    # batch_mode=True: one item per group of combinations sharing the
+    # filter settings (filter_mode, fund_idx, fast, slow, mom_lookback);
+    # stop / Y / tv / stop_loss vary along the parameter axis of the
+    # batched kernel (run_strategy_batch).
+    # batch_mode=False: one item (evaluate_params call) per combination.
+    # -------------------------------------------------------
+    if batch_mode:
+        items = _batch_items(param_combinations)
+    else:
+        items = param_combinations
+
+    data_path = os.path.join(data_dir, f"window_{train_start:%Y%m%d}.pkl")
+    dump(
+        {
+            "train": train,
+            "cash_train": cash_train,
+            "gate_train": gate_train,
+            "funds_df": funds_df,
+            "train_start": train_start,
+            "train_end": train_end,
+            "indicators": train_indicators,
+            "vol_window": vol_window,
+            "selected_mode": selected_mode,
+            "objective": objective,
+            "fast_mode": fast_mode,
+            "use_atr_stop": use_atr_stop,
+            "atr_window": atr_window,
+            "batch_mode": batch_mode,
+        },
+        data_path,
+    )
+
+    n_chunks = min(len(items), 4 * effective_n_jobs(n_jobs))
+    tasks = [
+        delayed(evaluate_window_chunk)(
+            data_path, items[i * len(items) // n_chunks : (i + 1) * len(items) // n_chunks],
+        )
+        for i in range(n_chunks)
+    ]
+
+    return tasks, param_combinations
+
+
+def _run_grid_tasks(tasks, n_jobs):
+    """
+    Run grid search tasks on the shared TaskExecutor: a failed task is
+    re-submitted on its own, and a failed pool hands only the missing
+    tasks to the next backend (loky -> threading -> in-process).
+
+    Returns
+    -------
+    list or None — task results in task order; None if a task failed on
+                   every backend (the window's scores would be incomplete).
+    """
+    results_list = TaskExecutor(n_jobs=n_jobs, label="Grid search").map(tasks)
+    if any(isinstance(result, TaskFailure) for result in results_list):
+        return None
+    return results_list
+
+
+def _window_scores(results_list, param_combinations, batch_mode):
+    """
+    Map one window's grid search task results to {key: objective score}
+    (key as in evaluate_params), in param_combinations order.
+    """
+    results_list = [result for chunk in results_list for result in chunk]
+    if batch_mode:
+        # Flatten group results back into param_combinations order so
+        # that tie-breaking in the selection loop is unchanged.
+        batch_scores = dict(
+            result for group in results_list for result in group if result is not None
+        )
+        results_list = []
+        for combo in param_combinations:
+            key = (combo[0], combo[1], *combo[3:])
+            results_list.append((key, batch_scores[key]) if key in batch_scores else None)
+
+    return {
+        key: score for result in results_list if result is not None for key, score in [result]
+    }
+
+
+def _select_window_params(
+    param_scores,
+    stop_grid,
+    X_grid,
+    Y_grid,
+    N_atr_grid,
+    fund_params_grid,
+    selected_mode,
+    use_atr_stop,
+    atr_window,
+):
+    """
+    Stability-penalised choice of one window's parameters from its grid
+    search scores.
+
+    Returns
+    -------
+    (best_params, best_score, best_raw_score) — best_params is None when no
+    combination has a finite penalised score.
+    """
+    # -------------------------------------------------------
+    # Stability-penalised selection
+    # neighbour_mean_array scores every key's 3x3 stop/Y neighbourhood
+    # in one pass (stop_grid = X_grid or N_atr_grid)
+    # -------------------------------------------------------
+    keys = list(param_scores)
+    raw_scores = np.array([param_scores[k] for k in keys], dtype=float)
+    stability = neighbour_mean_array(keys, raw_scores, stop_grid, Y_grid)
+    combined = 0.5 * raw_scores + 0.5 * stability
+
+    best_score = -np.inf
+    best_params = None
+    best_raw_score = -np.inf
+
+    # First key (in grid order) attaining the maximum combined score —
+    # same tie-breaking as a strict ">" scan; NaN scores never win.
+    candidates = np.flatnonzero(combined > best_score)
+    if len(candidates) > 0:
+        best_idx = candidates[np.argmax(combined[candidates])]
+        key = keys[best_idx]
+        best_score = combined[best_idx]
+        best_raw_score = raw_scores[best_idx]
+        fund_idx = key[1]
+
+        best_params = {
+            "filter_mode": key[0],
+            "fund_idx": fund_idx,
+            "fund_params": (
+                fund_params_grid[fund_idx]
+                if fund_idx is not None and fund_params_grid is not None
+                else None
+            ),
+            # key[2] is stop parameter: X in fixed mode, N_atr in ATR mode
+            "X": key[2] if not use_atr_stop else X_grid[0],
+            "N_atr": key[2] if use_atr_stop else N_atr_grid[0],
+            "Y": key[3],
+            "fast": key[4],
+            "slow": key[5],
+            "stop_loss": key[7],
+            "mom_lookback": key[8],
+            "use_atr_stop": use_atr_stop,
+            "atr_window": atr_window,
+        }
+        if selected_mode != "full":
+            best_params["target_vol"] = key[6]
+
+    return best_params, best_score, best_raw_score
+
+
+def _window_bounds(df, train_start, train_years, test_years):
+    """
+    (train_end, test_end, next_window_has_enough) of the walk-forward window
+    starting at train_start. The last window whose successor would have
+    fewer than test_years*252 rows is extended to the end of the data.
+    """
+    train_end = train_start + pd.DateOffset(years=train_years)
+    test_end = train_end + pd.DateOffset(years=test_years)
+
+    next_window_has_enough = len(df.loc[df.index >= test_end]) >= (test_years * 252)
+    if not next_window_has_enough:
+        test_end = df.index.max() + pd.DateOffset(days=1)
+
+    return train_end, test_end, next_window_has_enough
+
+
+def _train_entry_gate(entry_gate_series, train_index):
+    """Entry gate aligned to a training window (1 where unknown)."""
+    if entry_gate_series is None:
+        return None
+    return entry_gate_series.reindex(train_index, method="ffill").fillna(1).astype(int)
+
+
+def _pooled_window_scores(
+    df,
+    cash_df,
+    start,
+    train_years,
+    test_years,
+    entry_gate_series,
+    window_params,
+    grid_kwargs,
+    n_jobs,
+):
+    """
+    Grid search of every walk-forward window from start onwards in one
+    task pool (windows in window_params are skipped).
+
+    Returns
+    -------
+    dict — {TrainStart: {key: score}} as _window_scores; empty if every
+           parallel backend failed.
+    """
+    precomputed_scores = {}
+    with tempfile.TemporaryDirectory(prefix="wf_grid_") as grid_data_dir:
+        window_tasks = []
+        window_start = start
+        while True:
+            window_train_end, window_test_end, window_has_next = _window_bounds(
+                df, window_start, train_years, test_years,
+            )
+            window_train = df.loc[(df.index >= window_start) & (df.index < window_train_end)]
+            n_test = ((df.index >= window_train_end) & (df.index < window_test_end)).sum()
+            if window_train.empty or n_test < 30:
                 break
 
-            except Exception as e:
-                logging.warning(
-                    "Grid search backend '%s' failed: %s — trying next option.",
-                    label,
-                    e,
+            if window_params is None or window_start not in window_params:
+                tasks, param_combinations = _window_grid_tasks(
+                    window_train,
+                    cash_df.loc[
+                        (cash_df.index >= window_start) & (cash_df.index < window_train_end)
+                    ],
+                    _train_entry_gate(entry_gate_series, window_train.index),
+                    window_start,
+                    window_train_end,
+                    **grid_kwargs,
+                    n_jobs=n_jobs,
+                    data_dir=grid_data_dir,
                 )
-                results_list = None
+                window_tasks.append((window_start, tasks, param_combinations))
 
-        if results_list is None:
-            logging.error("All grid search backends failed. Skipping window.")
-            start += pd.DateOffset(years=test_years)
-            carry_state = None
-            continue
+            if not window_has_next:
+                break
+            window_start += pd.DateOffset(years=test_years)
 
-        param_scores = {
-            key: score for result in results_list if result is not None for key, score in [result]
-        }
+        all_tasks = [task for _, tasks, _ in window_tasks for task in tasks]
+        if all_tasks:
+            logging.info(
+                "Two-phase grid search: %d windows, %d tasks in one pool.",
+                len(window_tasks),
+                len(all_tasks),
+            )
+            results_list = _run_grid_tasks(all_tasks, n_jobs)
+            if results_list is not None:
+                offset = 0
+                for window_start, tasks, param_combinations in window_tasks:
+                    precomputed_scores[window_start] = _window_scores(
+                        results_list[offset : offset + len(tasks)],
+                        param_combinations,
+                        grid_kwargs["batch_mode"],
+                    )
+                    offset += len(tasks)
+        _release_window_data(grid_data_dir)
 
-        if not param_scores:
-            start += pd.DateOffset(years=test_years)
-            carry_state = None
-            continue
+    return precomputed_scores
 
-        # -------------------------------------------------------
-        # Stability-penalised selection
-        # pass stop_grid (X_grid or N_atr_grid) to neighbour_mean
-        # -------------------------------------------------------
-        best_score = -np.inf
-        best_params = None
-        best_raw_score = -np.inf
-
-        for key, raw_score in param_scores.items():
-            same_mode_scores = {k: v for k, v in param_scores.items() if k[0] == key[0]}
-            stability = neighbour_mean(key, same_mode_scores, stop_grid, Y_grid)
-            combined = 0.5 * raw_score + 0.5 * stability
-            if combined > best_score:
-                best_score = combined
-                best_raw_score = raw_score
-                fund_idx = key[1]
-
-                best_params = {
-                    "filter_mode": key[0],
-                    "fund_idx": fund_idx,
-                    "fund_params": (
-                        fund_params_grid[fund_idx]
-                        if fund_idx is not None and fund_params_grid is not None
-                        else None
-                    ),
-                    # key[2] is stop parameter: X in fixed mode, N_atr in ATR mode
-                    "X": key[2] if not use_atr_stop else X_grid[0],
-                    "N_atr": key[2] if use_atr_stop else N_atr_grid[0],
-                    "Y": key[3],
-                    "fast": key[4],
-                    "slow": key[5],
-                    "stop_loss": key[7],
-                    "mom_lookback": key[8],
-                    "use_atr_stop": use_atr_stop,
-                    "atr_window": atr_window,
-                }
-                if selected_mode != "full":
-                    best_params["target_vol"] = key[6]
 
+def _select_params_by_window(
+    scores_by_window,
+    objective,
+    stop_grid,
+    X_grid,
+    Y_grid,
+    N_atr_grid,
+    fund_params_grid,
+    selected_mode,
+    use_atr_stop,
+    atr_window,
+):
+    """
+    _select_window_params for every window of a shared grid search.
+
+    Returns
+    -------
+    dict — {TrainStart: best_params} for walk_forward(window_params=...);
+           windows without scores or without a valid choice are left out
+           (walk_forward then handles them as in a plain run).
+    """
+    window_params = {}
+    for window_start, scores in scores_by_window.items():
+        if not scores:
+            continue
+        best_params, best_score, best_raw_score = _select_window_params(
+            scores,
+            stop_grid,
+            X_grid,
+            Y_grid,
+            N_atr_grid,
+            fund_params_grid,
+            selected_mode,
+            use_atr_stop,
+            atr_window,
+        )
         if best_params is None:
+            continue
+        logging.info(
+            "Window %s: best raw_%s=%.4f | penalised_%s=%.4f",
+            window_start.date(),
+            objective,
+            best_raw_score,
+            objective,
+            best_score,
+        )
+        window_params[window_start] = best_params
+    return window_params
+
+
+# Bump whenever a change alters walk_forward output for identical inputs —
+# it is part of the on-disk cache key (moj_system/core/wf_cache.py).
+WALK_FORWARD_VERSION = 1
+
+
+def walk_forward(
+    df,
+    cash_df,
+    train_years=8,
+    test_years=2,
+    vol_window=20,
+    funds_df=None,
+    fund_params_grid=None,
+    selected_mode="full",
+    filter_modes_override=None,
+    X_grid=[0.08, 0.10, 0.12, 0.15, 0.20],
+    Y_grid=[0.02, 0.03, 0.05, 0.07, 0.10],
+    fast_grid=[50, 75, 100],
+    slow_grid=[150, 200, 250],
+    tv_grid=[0.08, 0.10, 0.12, 0.15, 0.20],
+    sl_grid=[0.05, 0.08, 0.10, 0.15],
+    mom_lookback_grid=[126, 252],
+    objective="calmar",
+    n_jobs=1,
+    entry_gate_series=None,
+    fast_mode=True,
+    # -------------------------------------------------------
+    # ATR trailing stop parameters
+    # -------------------------------------------------------
+    use_atr_stop=False,  # False = fixed % X, True = ATR-scaled N_atr
+    N_atr_grid=None,  # ATR multiplier grid; replaces X_grid when
+    # use_atr_stop=True. Default: [2.0,3.0,4.0,5.0,6.0]
+    atr_window=20,  # Rolling window for ATR estimate (days)
+    batch_mode=True,
+    parallel_windows=True,
+    # -------------------------------------------------------
+    # Resume hooks (incremental runs, see wf_cache.py)
+    # -------------------------------------------------------
+    start_date=None,
+    initial_state=None,
+    initial_equity=None,
+    window_params=None,
+    window_callback=None,
+):
+    """
+    Run a rolling walk-forward optimisation and return a stitched
+    out-of-sample equity curve.
+
+    ATR STOP MODE
+    -------------
+    When use_atr_stop=True, the trailing stop parameter searched over is
+    N_atr (ATR multiplier) rather than X (fixed fraction). N_atr_grid
+    replaces X_grid in the parameter combinations loop. The key tuple
+    structure is unchanged — position 2 simply holds N_atr instead of X.
+    neighbour_mean receives N_atr_grid as the stop_grid argument.
+
+    All other walk-forward mechanics (carry state, warmup, stability
+    penalty, OOS stitching) are identical to the fixed-stop mode.
+
+    Backward compatibility: use_atr_stop defaults to False. Existing
+    callers that do not pass ATR parameters are completely unaffected.
+
+    BATCHED GRID SEARCH
+    -------------------
+    batch_mode=True (default) evaluates the training grid with
+    run_strategy_batch, one call per (filter_mode, fund_idx, fast, slow,
+    mom_lookback) group, instead of one run_strategy_with_trades call per
+    combination. Scores are identical; batch_mode=False keeps the
+    per-combination path (and its fast_mode switch) for cross-checking.
+
+    TWO-PHASE GRID SEARCH
+    ---------------------
+    The training grid search of a window does not depend on earlier OOS
+    results. parallel_windows=True (default) first submits the grid search
+    tasks of every window to one Parallel pool, then runs the sequential
+    OOS stitching (carry state, equity chaining) on the stored scores.
+    parallel_windows=False starts one pool per window. Output is identical.
+
+    SEVERAL OBJECTIVES
+    ------------------
+    objective may be a list of objective names. The grid of every window is
+    then simulated once (in one pool) with all objectives scored from the
+    same metrics; selection and OOS stitching run separately per objective.
+    Returns {objective: (oos_equity, results_df, oos_trades_df)}, each
+    identical to a walk_forward run with that single objective.
+    window_callback is not supported in this mode.
+
+    BOTH STOP MODES
+    ---------------
+    use_atr_stop="both" evaluates the fixed (X_grid) and ATR (N_atr_grid)
+    combinations of every window in the same batched kernel calls, sharing
+    data preparation, indicators and filters; the stop type is one more
+    per-combination axis. Returns {"fixed": (...), "atr": (...)}, each
+    identical to the run with use_atr_stop=False / True. Requires a single
+    objective; window_params and window_callback are not supported.
+
+    RESUMING
+    --------
+    start_date      — TrainStart of the first window (default: first row
+                      of df). Must be a window start of an earlier run.
+    initial_state   — carry state entering that window (end_state of the
+                      previous window, or None).
+    initial_equity  — stitched equity at the end of the previous window;
+                      the first OOS slice is scaled by it.
+    window_params   — {TrainStart: best_params} reused instead of running
+                      the grid search of those windows.
+    window_callback — called once per window with OOS output with a dict:
+                      TrainStart, TrainEnd, TestEnd, final (open window
+                      ending at data_end), best_params, initial_state,
+                      end_state, equity (stitched slice), trades, result.
+
+    A run resumed from a window start with that window's carry state and
+    equity returns exactly the windows from start_date onwards of the
+    full run.
+    """
+
+    # Resolve ATR grid default
+    if N_atr_grid is None:
+        N_atr_grid = [0.08, 0.10, 0.12, 0.15, 0.20]
+
+    # The stop grid for neighbour_mean: X_grid in fixed mode, N_atr_grid in ATR mode
+    stop_grid = N_atr_grid if use_atr_stop else X_grid
+
+    data_end = df.index.max()
+    logging.info(
+        "walk_forward received data from %s to %s (%d rows)", df.index.min(), data_end, len(df),
+    )
+    logging.info("Objective function: %s", objective)
+    logging.info(
+        "Trailing stop mode: %s  (ATR window=%d)",
+        (
+            "fixed percentage and ATR-scaled (shared grid)"
+            if use_atr_stop == "both"
+            else "ATR-scaled (Chandelier)" if use_atr_stop else "fixed percentage"
+        ),
+        atr_window,
+    )
+
+    oos_equity_slices = []
+    results = []
+    all_oos_trades = []
+
+    start = df.index.min() if start_date is None else pd.Timestamp(start_date)
+    carry_state = initial_state
+
+    if filter_modes_override is not None:
+        logging.info("filter_modes overridden to: %s", filter_modes_override)
+
+    grid_kwargs = {
+        "vol_window": vol_window,
+        "funds_df": funds_df,
+        "fund_params_grid": fund_params_grid,
+        "selected_mode": selected_mode,
+        "filter_modes_override": filter_modes_override,
+        "X_grid": X_grid,
+        "Y_grid": Y_grid,
+        "fast_grid": fast_grid,
+        "slow_grid": slow_grid,
+        "tv_grid": tv_grid,
+        "sl_grid": sl_grid,
+        "mom_lookback_grid": mom_lookback_grid,
+        "objective": objective,
+        "fast_mode": fast_mode,
+        "use_atr_stop": use_atr_stop,
+        "N_atr_grid": N_atr_grid,
+        "atr_window": atr_window,
+        "batch_mode": batch_mode,
+    }
+
+    # -------------------------------------------------------
+    # Both stop modes — one shared grid search with the stop type as an
+    # extra axis of the batched kernel, then per mode the selection of
+    # every window and a walk_forward run reusing it (window_params).
+    # -------------------------------------------------------
+    if use_atr_stop == "both":
+        if not isinstance(objective, str):
+            raise ValueError("use_atr_stop='both' requires a single objective")
+        if window_params is not None or window_callback is not None:
+            raise ValueError("use_atr_stop='both' does not support window_params/window_callback")
+
+        shared_scores = _pooled_window_scores(
+            df,
+            cash_df,
+            start,
+            train_years,
+            test_years,
+            entry_gate_series,
+            None,
+            {**grid_kwargs, "batch_mode": True},
+            n_jobs,
+        )
+
+        results_by_mode = {}
+        for mode_name, mode_atr in (("fixed", False), ("atr", True)):
+            logging.info("Stop mode %s: selection and OOS stitching", mode_name)
+            mode_params = _select_params_by_window(
+                {
+                    window_start: {
+                        key[:-1]: score for key, score in scores.items() if key[-1] == mode_atr
+                    }
+                    for window_start, scores in shared_scores.items()
+                },
+                objective,
+                N_atr_grid if mode_atr else X_grid,
+                X_grid,
+                Y_grid,
+                N_atr_grid,
+                fund_params_grid,
+                selected_mode,
+                mode_atr,
+                atr_window,
+            )
+            results_by_mode[mode_name] = walk_forward(
+                df,
+                cash_df,
+                train_years=train_years,
+                test_years=test_years,
+                vol_window=vol_window,
+                funds_df=funds_df,
+                fund_params_grid=fund_params_grid,
+                selected_mode=selected_mode,
+                filter_modes_override=filter_modes_override,
+                X_grid=X_grid,
+                Y_grid=Y_grid,
+                fast_grid=fast_grid,
+                slow_grid=slow_grid,
+                tv_grid=tv_grid,
+                sl_grid=sl_grid,
+                mom_lookback_grid=mom_lookback_grid,
+                objective=objective,
+                n_jobs=n_jobs,
+                entry_gate_series=entry_gate_series,
+                fast_mode=fast_mode,
+                use_atr_stop=mode_atr,
+                N_atr_grid=N_atr_grid,
+                atr_window=atr_window,
+                batch_mode=batch_mode,
+                parallel_windows=parallel_windows,
+                start_date=start,
+                initial_state=initial_state,
+                initial_equity=initial_equity,
+                window_params=mode_params,
+            )
+
+        return results_by_mode
+
+    # -------------------------------------------------------
+    # Several objectives — one shared grid search, then per objective the
+    # stability-penalised selection of every window and a walk_forward run
+    # that reuses those parameters (window_params) for its OOS stitching.
+    # -------------------------------------------------------
+    if not isinstance(objective, str):
+        objectives = list(objective)
+        if window_callback is not None:
+            raise ValueError("window_callback requires a single objective")
+
+        shared_scores = _pooled_window_scores(
+            df,
+            cash_df,
+            start,
+            train_years,
+            test_years,
+            entry_gate_series,
+            window_params,
+            {**grid_kwargs, "objective": tuple(objectives)},
+            n_jobs,
+        )
+
+        results_by_objective = {}
+        for i, single_objective in enumerate(objectives):
+            objective_params = _select_params_by_window(
+                {
+                    window_start: {
+                        key: values[i] for key, values in scores.items() if values[i] is not None
+                    }
+                    for window_start, scores in shared_scores.items()
+                },
+                single_objective,
+                stop_grid,
+                X_grid,
+                Y_grid,
+                N_atr_grid,
+                fund_params_grid,
+                selected_mode,
+                use_atr_stop,
+                atr_window,
+            )
+            if window_params is not None:
+                objective_params.update(window_params)
+
+            logging.info("OOS stitching for objective: %s", single_objective)
+            results_by_objective[single_objective] = walk_forward(
+                df,
+                cash_df,
+                train_years=train_years,
+                test_years=test_years,
+                vol_window=vol_window,
+                funds_df=funds_df,
+                fund_params_grid=fund_params_grid,
+                selected_mode=selected_mode,
+                filter_modes_override=filter_modes_override,
+                X_grid=X_grid,
+                Y_grid=Y_grid,
+                fast_grid=fast_grid,
+                slow_grid=slow_grid,
+                tv_grid=tv_grid,
+                sl_grid=sl_grid,
+                mom_lookback_grid=mom_lookback_grid,
+                objective=single_objective,
+                n_jobs=n_jobs,
+                entry_gate_series=entry_gate_series,
+                fast_mode=fast_mode,
+                use_atr_stop=use_atr_stop,
+                N_atr_grid=N_atr_grid,
+                atr_window=atr_window,
+                batch_mode=batch_mode,
+                parallel_windows=parallel_windows,
+                start_date=start,
+                initial_state=initial_state,
+                initial_equity=initial_equity,
+                window_params=objective_params,
+            )
+
+        return results_by_objective
+
+    # -------------------------------------------------------
+    # Phase 1 (parallel_windows=True) — grid search of every window in
+    # one task pool. Windows the OOS loop later reaches without stored
+    # scores (pool failure, or a loop that runs past the expected final
+    # window after a skipped one) fall back to a per-window search.
+    # -------------------------------------------------------
+    precomputed_scores = {}
+    if parallel_windows:
+        precomputed_scores = _pooled_window_scores(
+            df,
+            cash_df,
+            start,
+            train_years,
+            test_years,
+            entry_gate_series,
+            window_params,
+            grid_kwargs,
+            n_jobs,
+        )
+
+    # -------------------------------------------------------
+    # Phase 2 — sequential window loop: selection, OOS run, stitching
+    # -------------------------------------------------------
+    while True:
+        gate_train = None
+        gate_oos = None
+        train_start = start
+        train_end, test_end, next_window_has_enough = _window_bounds(
+            df, train_start, train_years, test_years,
+        )
+
+        train = df.loc[(df.index >= train_start) & (df.index < train_end)]
+
+        test = df.loc[(df.index >= train_end) & (df.index < test_end)]
+
+        logging.info(
+            "Iteration: train=%s to %s (%d rows) | test=%s to %s (%d rows) | "
+            "next_window_has_enough=%s | data_end=%s",
+            train_start.date(),
+            train_end.date(),
+            len(train),
+            train_end.date(),
+            test_end.date(),
+            len(test),
+            next_window_has_enough,
+            data_end.date(),
+        )
+
+        if train.empty or len(test) < 30:
+            logging.info("Breaking — train empty or test too short")
             break
+
+        cash_train = cash_df.loc[(cash_df.index >= train_start) & (cash_df.index < train_end)]
+
+        gate_train = _train_entry_gate(entry_gate_series, train.index)
+
+        reused_params = window_params.get(train_start) if window_params is not None else None
+        if reused_params is not None:
+            # Training window already searched in an earlier run
+            best_params = dict(reused_params)
+            logging.info(
+                "Window %s: reusing stored parameters | filter=%s",
+                train_start.date(),
+                best_params["filter_mode"],
+            )
         else:
+            if train_start in precomputed_scores:
+                param_scores = precomputed_scores.pop(train_start)
+            else:
+                with tempfile.TemporaryDirectory(prefix="wf_grid_") as grid_data_dir:
+                    tasks, param_combinations = _window_grid_tasks(
+                        train,
+                        cash_train,
+                        gate_train,
+                        train_start,
+                        train_end,
+                        **grid_kwargs,
+                        n_jobs=n_jobs,
+                        data_dir=grid_data_dir,
+                    )
+                    results_list = _run_grid_tasks(tasks, n_jobs)
+                    _release_window_data(grid_data_dir)
+                param_scores = (
+                    _window_scores(results_list, param_combinations, batch_mode)
+                    if results_list is not None
+                    else None
+                )
+
+            if param_scores is None:
+                logging.error("All grid search backends failed. Skipping window.")
+                start += pd.DateOffset(years=test_years)
+                carry_state = None
+                continue
+
+            if not param_scores:
+                start += pd.DateOffset(years=test_years)
+                carry_state = None
+                continue
+
+            best_params, best_score, best_raw_score = _select_window_params(
+                param_scores,
+                stop_grid,
+                X_grid,
+                Y_grid,
+                N_atr_grid,
+                fund_params_grid,
+                selected_mode,
+                use_atr_stop,
+                atr_window,
+            )
+
+            if best_params is None:
+                break
+
             stop_label = (
                 f"N_atr={best_params['N_atr']:.1f}" if use_atr_stop else f"X={best_params['X']:.2f}"
             )
@@ -1495,6 +3103,7 @@ def walk_forward(
             "N_atr",
         }
 
+        window_initial_state = carry_state
         bt_oos, test_metrics, oos_trades, end_state = run_strategy_with_trades(
             test,
             price_col="Zamkniecie",
@@ -1522,8 +3131,8 @@ def walk_forward(
         carry_state = end_state
 
         equity_slice = bt_oos["equity"].copy()
-        if oos_equity_slices:
-            prev_end = oos_equity_slices[-1].iloc[-1]
+        prev_end = oos_equity_slices[-1].iloc[-1] if oos_equity_slices else initial_equity
+        if prev_end is not None:
             equity_slice = equity_slice * prev_end
 
         oos_equity_slices.append(equity_slice)
@@ -1533,35 +3142,50 @@ def walk_forward(
             oos_trades["WF_Window"] = train_start
             all_oos_trades.append(oos_trades)
 
-        results.append(
-            {
-                "TrainStart": train_start,
-                "TrainEnd": train_end,
-                "TestStart": train_end,
-                "TestEnd": test_end,
-                "filter_mode": best_params["filter_mode"],
-                "fund_idx": best_params["fund_idx"],
-                "fund_params": str(best_params["fund_params"]),
-                **{
-                    k: v
-                    for k, v in best_params.items()
-                    if k
-                    not in (
-                        "filter_mode",
-                        "fund_params",
-                        "fund_idx",
-                        "target_vol",
-                        "use_atr_stop",
-                        "atr_window",
-                    )
-                },
-                "target_vol": best_params.get("target_vol", "N/A"),
-                "mom_lookback": best_params.get("mom_lookback", 252),
-                "use_atr_stop": best_params["use_atr_stop"],
-                "atr_window": best_params["atr_window"],
-                **test_metrics,
+        result_row = {
+            "TrainStart": train_start,
+            "TrainEnd": train_end,
+            "TestStart": train_end,
+            "TestEnd": test_end,
+            "filter_mode": best_params["filter_mode"],
+            "fund_idx": best_params["fund_idx"],
+            "fund_params": str(best_params["fund_params"]),
+            **{
+                k: v
+                for k, v in best_params.items()
+                if k
+                not in (
+                    "filter_mode",
+                    "fund_params",
+                    "fund_idx",
+                    "target_vol",
+                    "use_atr_stop",
+                    "atr_window",
+                )
             },
-        )
+            "target_vol": best_params.get("target_vol", "N/A"),
+            "mom_lookback": best_params.get("mom_lookback", 252),
+            "use_atr_stop": best_params["use_atr_stop"],
+            "atr_window": best_params["atr_window"],
+            **test_metrics,
+        }
+        results.append(result_row)
+
+        if window_callback is not None:
+            window_callback(
+                {
+                    "TrainStart": train_start,
+                    "TrainEnd": train_end,
+                    "TestEnd": test_end,
+                    "final": not next_window_has_enough,
+                    "best_params": best_params,
+                    "initial_state": window_initial_state,
+                    "end_state": end_state,
+                    "equity": equity_slice,
+                    "trades": oos_trades,
+                    "result": result_row,
+                },
+            )
 
         start += pd.DateOffset(years=test_years)
 
@@ -1597,6 +3221,231 @@ def walk_forward(
     return oos_equity, results_df, oos_trades_df
 
 
+# -------------------------------------------------------
+# Several price paths on one calendar (block bootstrap)
+# -------------------------------------------------------
+
+
+def _stacked_window_scores(
+    dfs,
+    cash_dfs,
+    start,
+    train_years,
+    test_years,
+    window_params,
+    grid_kwargs,
+):
+    """
+    Grid search of every walk-forward window from start onwards on every
+    path at once (windows in window_params are skipped). The paths must
+    share one index.
+
+    Returns
+    -------
+    list — per path, {TrainStart: {key: score}} as _pooled_window_scores
+    """
+    param_combinations, filter_modes = _grid_combinations(
+        grid_kwargs["funds_df"],
+        grid_kwargs["fund_params_grid"],
+        grid_kwargs["selected_mode"],
+        grid_kwargs["filter_modes_override"],
+        grid_kwargs["X_grid"],
+        grid_kwargs["Y_grid"],
+        grid_kwargs["fast_grid"],
+        grid_kwargs["slow_grid"],
+        grid_kwargs["tv_grid"],
+        grid_kwargs["sl_grid"],
+        grid_kwargs["mom_lookback_grid"],
+        grid_kwargs["use_atr_stop"],
+        grid_kwargs["N_atr_grid"],
+    )
+    items = _batch_items(param_combinations)
+    funds_df = grid_kwargs["funds_df"]
+    vol_window = grid_kwargs["vol_window"]
+    atr_window = grid_kwargs["atr_window"]
+
+    scores_by_path = [{} for _ in dfs]
+    index = dfs[0].index
+    window_start = start
+    while True:
+        window_train_end, window_test_end, window_has_next = _window_bounds(
+            dfs[0], window_start, train_years, test_years,
+        )
+        train_mask = (index >= window_start) & (index < window_train_end)
+        n_test = ((index >= window_train_end) & (index < window_test_end)).sum()
+        if not train_mask.any() or n_test < 30:
+            break
+
+        if window_params is None or window_start not in window_params:
+            trains = [df.loc[train_mask] for df in dfs]
+            cash_trains = [
+                cash_df.loc[(cash_df.index >= window_start) & (cash_df.index < window_train_end)]
+                for cash_df in cash_dfs
+            ]
+            stores = [
+                _grid_indicator_store(
+                    train, param_combinations, filter_modes, vol_window, atr_window,
+                )
+                for train in trains
+            ]
+
+            results_by_path = [[] for _ in dfs]
+            for filter_mode, fund_idx, fund_params, fast, slow, mom_lookback, combos in items:
+                train_fund_signal = None
+                if filter_mode == "fund" and fund_params is not None:
+                    # Import here to avoid circular dependency (fund_filter imports this module)
+                    from moj_system.core.fund_filter import compute_fund_breadth_signal
+
+                    funds_train = funds_df.loc[
+                        (funds_df.index >= window_start) & (funds_df.index < window_train_end)
+                    ]
+                    train_fund_signal = compute_fund_breadth_signal(funds_train, **fund_params)
+
+                stop_vals, Y_vals, tv_vals, sl_vals, use_atr_stop = _combo_arrays(
+                    combos, grid_kwargs["use_atr_stop"],
+                )
+                metrics_by_path = run_strategy_batch_paths(
+                    trains,
+                    stop_vals=stop_vals,
+                    Y_vals=Y_vals,
+                    stop_losses=sl_vals,
+                    target_vols=tv_vals,
+                    cash_dfs=cash_trains,
+                    price_col="Zamkniecie",
+                    fast=fast,
+                    slow=slow,
+                    vol_window=vol_window,
+                    position_mode=grid_kwargs["selected_mode"],
+                    filter_mode=filter_mode,
+                    mom_lookback=mom_lookback,
+                    fund_signal=train_fund_signal,
+                    use_atr_stop=use_atr_stop,
+                    atr_window=atr_window,
+                    indicators=stores,
+                )
+                for path_results, metrics_arr in zip(
+                    results_by_path, metrics_by_path, strict=True,
+                ):
+                    path_results.append(
+                        _batch_results(
+                            filter_mode,
+                            fund_idx,
+                            fast,
+                            slow,
+                            mom_lookback,
+                            combos,
+                            metrics_arr,
+                            grid_kwargs["objective"],
+                        ),
+                    )
+
+            for path_scores, path_results in zip(scores_by_path, results_by_path, strict=True):
+                path_scores[window_start] = _window_scores(
+                    [path_results], param_combinations, batch_mode=True,
+                )
+
+        if not window_has_next:
+            break
+        window_start += pd.DateOffset(years=test_years)
+
+    return scores_by_path
+
+
+def walk_forward_paths(dfs, cash_dfs, **wf_kwargs):
+    """
+    walk_forward of several price paths that share one calendar, e.g. the
+    synthetic histories of a block bootstrap.
+
+    The paths share the window calendar and the parameter grid, so the
+    grid of every window is evaluated across all of them at once:
+    run_strategy_batch_paths runs one stacked (time × paths·combinations)
+    kernel pass per filter group instead of one pass per group and path.
+    Each path then gets its own stability-penalised selection and a
+    walk_forward run reusing it (window_params) for the OOS stitching.
+
+    Results are identical to walk_forward(dfs[i], cash_dfs[i], **wf_kwargs)
+    per path. Paths with different indices, several objectives,
+    use_atr_stop="both" or a window_callback fall back to exactly those
+    per-path calls.
+
+    Returns
+    -------
+    list — (oos_equity, results_df, oos_trades_df) per path
+    """
+    bound = inspect.signature(walk_forward).bind(None, None, **wf_kwargs)
+    bound.apply_defaults()
+    args = bound.arguments
+
+    if (
+        len(dfs) < 2
+        or not isinstance(args["objective"], str)
+        or isinstance(args["use_atr_stop"], str)
+        or args["window_callback"] is not None
+        or any(not df.index.equals(dfs[0].index) for df in dfs[1:])
+    ):
+        return [
+            walk_forward(df, cash_df, **wf_kwargs)
+            for df, cash_df in zip(dfs, cash_dfs, strict=True)
+        ]
+
+    # Same N_atr_grid default as walk_forward
+    N_atr_grid = args["N_atr_grid"]
+    if N_atr_grid is None:
+        N_atr_grid = [0.08, 0.10, 0.12, 0.15, 0.20]
+    use_atr_stop = args["use_atr_stop"]
+    grid_kwargs = {
+        name: args[name]
+        for name in (
+            "vol_window",
+            "funds_df",
+            "fund_params_grid",
+            "selected_mode",
+            "filter_modes_override",
+            "X_grid",
+            "Y_grid",
+            "fast_grid",
+            "slow_grid",
+            "tv_grid",
+            "sl_grid",
+            "mom_lookback_grid",
+            "objective",
+            "use_atr_stop",
+            "atr_window",
+        )
+    }
+    grid_kwargs["N_atr_grid"] = N_atr_grid
+
+    start = dfs[0].index.min() if args["start_date"] is None else pd.Timestamp(args["start_date"])
+    scores_by_path = _stacked_window_scores(
+        dfs,
+        cash_dfs,
+        start,
+        args["train_years"],
+        args["test_years"],
+        args["window_params"],
+        grid_kwargs,
+    )
+
+    results = []
+    for df, cash_df, scores in zip(dfs, cash_dfs, scores_by_path, strict=True):
+        path_params = _select_params_by_window(
+            scores,
+            args["objective"],
+            N_atr_grid if use_atr_stop else args["X_grid"],
+            args["X_grid"],
+            args["Y_grid"],
+            N_atr_grid,
+            args["fund_params_grid"],
+            args["selected_mode"],
+            use_atr_stop,
+            args["atr_window"],
+        )
+        if args["window_params"] is not None:
+            path_params.update(args["window_params"])
+        results.append(walk_forward(df, cash_df, **{**wf_kwargs, "window_params": path_params}))
+    return results
+
+
 # ============================================================
 # TRADE ANALYSIS
 # ============================================================
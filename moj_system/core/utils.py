@@ -13,6 +13,7 @@ Neutral module for shared functions to break circular imports.
 """
 import logging
 
+import numpy as np
 import pandas as pd
 
 CLOSE_COL = "Zamkniecie"  # stooq close column name used throughout
@@ -175,6 +176,183 @@ def reallocation_gate(
     return target_weights, True, annual_counter
 
 
+_DAY_NS = 86_400_000_000_000  # nanoseconds per calendar day
+
+
+def simulate_reallocation_gate(
+    targets,
+    dates,
+    current_weights,
+    last_change_date=None,
+    annual_counter: dict = None,
+    cooldown_days: int = 10,
+    min_delta: float = 0.10,
+    annual_cap: int = 12,
+) -> tuple:
+    """
+    Run reallocation_gate over a whole block of dates on plain arrays.
+
+    Same cooldown / min_delta / annual cap rules and the same decisions as
+    calling reallocation_gate once per date, but the targets are one row
+    per date of a (T, A) array (assets in a fixed column order) and the
+    loop works on Python floats and integer nanosecond dates: no dicts,
+    Timestamp conversions or per-date logging.
+
+    Parameters
+    ----------
+    targets          : np.ndarray (T, A) — target weights per date
+    dates            : pd.DatetimeIndex (T,) — simulation dates, ascending
+    current_weights  : sequence (A,) — weights held before the first date
+    last_change_date : date-like or None — last accepted reallocation
+    annual_counter   : dict — mutable {year: count}, updated in place
+    cooldown_days, min_delta, annual_cap : as in reallocation_gate
+
+    Returns
+    -------
+    (weights, realloc_rows, state)
+      weights      : np.ndarray (T, A) — weights held on each date (post-gate)
+      realloc_rows : np.ndarray (R,) int — rows where a reallocation was accepted
+      state        : dict — current_weights (np.ndarray (A,)), last_change_date
+                     (pd.Timestamp or None), annual_counter and n_cap_blocked
+                     (dates blocked only by the annual cap)
+    """
+    if annual_counter is None:
+        annual_counter = {}
+
+    dates = pd.DatetimeIndex(dates)
+    targets = np.asarray(targets, dtype=float)
+    day_ns = dates.values.astype("datetime64[ns]").astype(np.int64).tolist()
+    years = dates.year.tolist()
+    target_rows = targets.tolist()
+    cooldown_ns = cooldown_days * _DAY_NS
+
+    current = [float(w) for w in current_weights]
+    last_ns = None
+    if last_change_date is not None:
+        last_change_date = pd.Timestamp(last_change_date)
+        last_ns = int(np.datetime64(last_change_date, "ns").astype(np.int64))
+    realloc_rows = []
+    held = [current]
+    n_cap_blocked = 0
+
+    for t, target in enumerate(target_rows):
+        # Guard 1: cooldown ((current - last).days < cooldown_days)
+        if last_ns is not None and day_ns[t] - last_ns < cooldown_ns:
+            continue
+        # Guard 2: minimum delta
+        if max(abs(a - b) for a, b in zip(target, current, strict=True)) < min_delta:
+            continue
+        # Guard 3: annual cap
+        count_this_year = annual_counter.get(years[t], 0)
+        if count_this_year >= annual_cap:
+            n_cap_blocked += 1
+            continue
+        annual_counter[years[t]] = count_this_year + 1
+        current = target
+        last_ns = day_ns[t]
+        realloc_rows.append(t)
+        held.append(current)
+
+    # Weights are piecewise constant between accepted reallocations
+    realloc_rows = np.array(realloc_rows, dtype=int)
+    segment = np.searchsorted(realloc_rows, np.arange(len(target_rows)), side="right")
+    weights = np.array(held, dtype=float).reshape(len(held), -1)[segment]
+
+    state = {
+        "current_weights": np.array(current, dtype=float),
+        "last_change_date": dates[realloc_rows[-1]] if len(realloc_rows) else last_change_date,
+        "annual_counter": annual_counter,
+        "n_cap_blocked": n_cap_blocked,
+    }
+    return weights, realloc_rows, state
+
+
+def simulate_reallocation_gate_batch(
+    targets,
+    dates,
+    current_weights,
+    last_change_dates=None,
+    annual_counter: dict = None,
+    cooldown_days: int = 10,
+    min_delta: float = 0.10,
+    annual_cap: int = 12,
+) -> tuple:
+    """
+    simulate_reallocation_gate for C portfolios side by side.
+
+    Every column (portfolio) has its own gate state — weights, last change
+    date and annual counts — and the same decisions as running it through
+    the gate alone; each date is one set of NumPy operations across the
+    columns, so perturbed weight sets of a robustness analysis run as
+    extra columns of a single pass.
+
+    Parameters
+    ----------
+    targets           : np.ndarray (T, C, A) — target weights per date and column
+    dates             : pd.DatetimeIndex (T,) — simulation dates, ascending
+    current_weights   : np.ndarray (C, A) — weights held before the first date
+    last_change_dates : np.ndarray (C,) datetime64[ns] or None — last accepted
+                        reallocation per column (NaT = none yet)
+    annual_counter    : dict — mutable {year: np.ndarray (C,) int}, updated
+                        in place
+    cooldown_days, min_delta, annual_cap : as in reallocation_gate
+
+    Returns
+    -------
+    (weights, n_reallocations, state)
+      weights         : np.ndarray (T, C, A) — weights held on each date
+      n_reallocations : np.ndarray (C,) int — accepted reallocations per column
+      state           : dict — current_weights, last_change_dates,
+                        annual_counter and n_cap_blocked (C,) of the next call
+    """
+    if annual_counter is None:
+        annual_counter = {}
+
+    dates = pd.DatetimeIndex(dates)
+    targets = np.asarray(targets, dtype=float)
+    n_cols = targets.shape[1]
+    day_ns = dates.values.astype("datetime64[ns]").astype(np.int64)
+    years = dates.year.tolist()
+    cooldown_ns = cooldown_days * _DAY_NS
+
+    current = np.array(current_weights, dtype=float)
+    if last_change_dates is None:
+        last_change_dates = np.full(n_cols, np.datetime64("NaT"), dtype="datetime64[ns]")
+    last_change_dates = np.asarray(last_change_dates, dtype="datetime64[ns]")
+    never = np.isnat(last_change_dates)
+    last_ns = np.where(never, 0, last_change_dates.astype(np.int64))
+
+    weights = np.empty_like(targets)
+    n_reallocations = np.zeros(n_cols, dtype=int)
+    n_cap_blocked = np.zeros(n_cols, dtype=int)
+
+    for t in range(len(dates)):
+        counts = annual_counter.setdefault(years[t], np.zeros(n_cols, dtype=int))
+        open_gate = (never | (day_ns[t] - last_ns >= cooldown_ns)) & (
+            np.abs(targets[t] - current).max(axis=1) >= min_delta
+        )
+        capped = counts >= annual_cap
+        n_cap_blocked += open_gate & capped
+        accept = open_gate & ~capped
+        if accept.any():
+            current[accept] = targets[t, accept]
+            last_ns[accept] = day_ns[t]
+            never &= ~accept
+            counts += accept
+            n_reallocations += accept
+        weights[t] = current
+
+    state = {
+        "current_weights": current,
+        "last_change_dates": np.where(
+            never, np.datetime64("NaT", "ns"), last_ns.astype("datetime64[ns]"),
+        ),
+        "annual_counter": annual_counter,
+        "n_cap_blocked": n_cap_blocked,
+    }
+    return weights, n_reallocations, state
+
+
 # ============================================================
 # MMF BACKWARD EXTENSION  (WIBOR1M chain-link)
 # ============================================================
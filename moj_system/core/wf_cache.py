@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+moj_system/core/wf_cache.py
+===========================
+Persistent, content-addressed cache for walk_forward results.
+
+A walk-forward run is fully determined by its input data and its
+arguments, so the stitched OOS equity, the per-window results and the
+OOS trade log are stored on disk under a SHA-256 key built from:
+  - the contents (index + values) of the price, cash, funds and entry-gate
+    inputs,
+  - every walk_forward argument that affects the output (grids, window
+    config, stop mode, objective, ...), defaults included,
+  - WALK_FORWARD_VERSION from strategy_engine, bumped whenever a change
+    to the engine alters its output.
+
+Entries are gzip-compressed pickles written atomically. The cache is
+bounded in size and evicts least-recently-used entries (by file mtime,
+refreshed on every hit).
+
+incremental_walk_forward covers the daily case, where the data changes
+every run and a content-addressed key would always miss. It keeps one
+state file per series holding every completed window (OOS equity slice,
+trades, results row) plus the parameters and carry state entering the
+open final window. The next run re-simulates only that window (and runs
+the grid search of any window opened since), as long as the bars before
+its test start are unchanged — otherwise it rebuilds from scratch.
+"""
+
+import hashlib
+import inspect
+import logging
+from pathlib import Path
+
+import pandas as pd
+
+from moj_system.core.strategy_engine import WALK_FORWARD_VERSION, walk_forward
+
+# walk_forward arguments that change run time but never the result
+NON_RESULT_ARGS = {
+    "df",
+    "cash_df",
+    "n_jobs",
+    "fast_mode",
+    "batch_mode",
+    "parallel_windows",
+    "window_callback",
+}
+
+# Dated inputs — hashed up to the open window in incremental mode
+_HISTORY_ARGS = ("df", "cash_df", "funds_df", "entry_gate_series")
+
+# walk_forward arguments owned by incremental_walk_forward
+_RESUME_ARGS = {"start_date", "initial_state", "initial_equity", "window_params", "window_callback"}
+
+
+def hash_value(value) -> str:
+    """Stable text fingerprint of a walk_forward argument."""
+    if isinstance(value, (pd.Series, pd.DataFrame)):
+        digest = hashlib.sha256()
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+        if isinstance(value, pd.DataFrame):
+            digest.update(repr(list(value.columns)).encode("utf-8"))
+        return f"<{type(value).__name__} {digest.hexdigest()}>"
+    return repr(value)
+
+
+def write_pickle(path, obj):
+    """Atomically write obj as a gzip-compressed pickle (tmp + replace)."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    try:
+        pd.to_pickle(obj, tmp, compression="gzip")
+        tmp.replace(path)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def walk_forward_cache_key(df, cash_df, **wf_kwargs) -> str:
+    """
+    Content-addressed key of a walk_forward(df, cash_df, **wf_kwargs) call.
+
+    Arguments are bound to the walk_forward signature with defaults
+    applied, so passing a default explicitly or omitting it gives the
+    same key.
+    """
+    bound = inspect.signature(walk_forward).bind(df, cash_df, **wf_kwargs)
+    bound.apply_defaults()
+
+    parts = [
+        f"engine={WALK_FORWARD_VERSION}",
+        f"df={hash_value(df)}",
+        f"cash_df={hash_value(cash_df)}",
+    ]
+    for name, value in sorted(bound.arguments.items()):
+        if name in NON_RESULT_ARGS:
+            continue
+        parts.append(f"{name}={hash_value(value)}")
+
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+class WalkForwardCache:
+    """
+    Size-bounded on-disk LRU cache of walk_forward results.
+
+    Parameters
+    ----------
+    cache_dir : str or Path — directory holding the cache entries
+    max_bytes : int         — total size above which the least recently
+                              used entries are evicted
+    """
+
+    SUFFIX = ".pkl.gz"
+
+    def __init__(self, cache_dir, max_bytes=512 * 1024**2):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _path(self, key) -> Path:
+        return self.cache_dir / f"{key}{self.SUFFIX}"
+
+    def get(self, key):
+        """Return the cached walk_forward result or None."""
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            result = pd.read_pickle(path, compression="gzip")
+        except Exception as exc:
+            logging.warning(f"WalkForwardCache: dropping unreadable entry {path.name} - {exc}")
+            path.unlink(missing_ok=True)
+            return None
+        # Refresh mtime so eviction sees this entry as recently used
+        path.touch()
+        return result
+
+    def put(self, key, result):
+        """Store a walk_forward result tuple and evict old entries if needed."""
+        path = self._path(key)
+        try:
+            write_pickle(path, result)
+        except Exception as exc:
+            logging.warning(f"WalkForwardCache: could not write {path.name} - {exc}")
+            return
+        self.evict()
+
+    def evict(self):
+        """Delete least-recently-used entries until the cache fits max_bytes."""
+        entries = []
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        # Oldest access first
+        entries.sort(key=lambda entry: entry[0])
+        total = sum(entry[1] for entry in entries)
+        for entry in entries:
+            size, path = entry[1], entry[2]
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            logging.info(f"WalkForwardCache: evicted {path.name} ({size / 1024:.0f} KiB)")
+
+
+def cached_walk_forward(df, cash_df, cache=None, **wf_kwargs):
+    """
+    Drop-in replacement for walk_forward(df, cash_df, **wf_kwargs) that
+    reads from / writes to a WalkForwardCache.
+
+    With cache=None this is a plain walk_forward call.
+
+    Returns
+    -------
+    (oos_equity, results_df, oos_trades_df) — as walk_forward
+    """
+    if cache is None:
+        return walk_forward(df, cash_df, **wf_kwargs)
+
+    key = walk_forward_cache_key(df, cash_df, **wf_kwargs)
+    cached = cache.get(key)
+    if cached is not None:
+        logging.info(f"  [WF DISK CACHE HIT] {key[:12]}")
+        return cached
+
+    logging.info(f"  [WF DISK CACHE MISS] {key[:12]} - running walk_forward")
+    result = walk_forward(df, cash_df, **wf_kwargs)
+    cache.put(key, result)
+    return result
+
+
+# -------------------------------------------------------
+# Incremental mode — reuse completed windows between daily runs
+# -------------------------------------------------------
+
+
+def _walk_forward_config_key(**wf_kwargs) -> str:
+    """Key of every walk_forward argument except the dated inputs."""
+    bound = inspect.signature(walk_forward).bind(None, None, **wf_kwargs)
+    bound.apply_defaults()
+
+    parts = [f"engine={WALK_FORWARD_VERSION}"]
+    for name, value in sorted(bound.arguments.items()):
+        if name in NON_RESULT_ARGS or name in _HISTORY_ARGS:
+            continue
+        parts.append(f"{name}={hash_value(value)}")
+
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _history_hash(inputs, cutoff) -> str:
+    """Fingerprint of the dated inputs restricted to rows before cutoff."""
+    parts = []
+    for name in _HISTORY_ARGS:
+        value = inputs.get(name)
+        if isinstance(value, (pd.Series, pd.DataFrame)):
+            value = value.loc[value.index < cutoff]
+        parts.append(f"{name}={hash_value(value)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _stitch_windows(windows):
+    """Rebuild the walk_forward return tuple from per-window records."""
+    if not windows:
+        return pd.Series(dtype=float), pd.DataFrame(), pd.DataFrame()
+
+    oos_equity = pd.concat([w["equity"] for w in windows]).sort_index()
+    results_df = pd.DataFrame([w["result"] for w in windows])
+    trades = [w["trades"] for w in windows if not w["trades"].empty]
+    oos_trades_df = pd.concat(trades) if trades else pd.DataFrame()
+    return oos_equity, results_df, oos_trades_df
+
+
+def incremental_walk_forward(df, cash_df, state_path=None, rebuild=False, **wf_kwargs):
+    """
+    walk_forward(df, cash_df, **wf_kwargs) that carries completed windows
+    over from the previous run.
+
+    The state file stores the completed windows and the resume point of
+    the open final window (its TrainStart, best_params, entering carry
+    state and stitched equity). It is reused when the walk_forward
+    arguments are unchanged and df, cash_df, funds_df and
+    entry_gate_series are identical before the open window's test start;
+    only bars after that point may differ (appended or revised). The
+    output then equals a full walk_forward run on the same data.
+
+    If a window boundary has been crossed since the last run, the
+    previously open window is closed with its stored parameters and the
+    new window(s) run their grid search as usual.
+
+    Parameters
+    ----------
+    state_path : str or Path or None — state file; None = plain walk_forward
+    rebuild    : bool — ignore the stored state (the new state is still saved)
+
+    Returns
+    -------
+    (oos_equity, results_df, oos_trades_df) — as walk_forward
+    """
+    if state_path is None:
+        return walk_forward(df, cash_df, **wf_kwargs)
+
+    resume_args = _RESUME_ARGS.intersection(wf_kwargs)
+    if resume_args:
+        raise ValueError(f"incremental_walk_forward manages {sorted(resume_args)} itself")
+
+    state_path = Path(state_path)
+    inputs = {"df": df, "cash_df": cash_df, **wf_kwargs}
+    config_key = _walk_forward_config_key(**wf_kwargs)
+
+    state = None
+    if not rebuild and state_path.exists():
+        try:
+            state = pd.read_pickle(state_path, compression="gzip")
+        except Exception as exc:
+            logging.warning(f"  [WF INCREMENTAL] unreadable state {state_path.name} - {exc}")
+
+    completed = []
+    resume_kwargs = {}
+    if state is None:
+        logging.info(f"  [WF INCREMENTAL] no usable state for {state_path.name} - full run")
+    elif state["config_key"] != config_key:
+        logging.info("  [WF INCREMENTAL] walk_forward arguments changed - full rebuild")
+    elif _history_hash(inputs, state["cutoff"]) != state["history_hash"]:
+        logging.info(
+            f"  [WF INCREMENTAL] data before {state['cutoff'].date()} changed - full rebuild",
+        )
+    else:
+        completed = state["windows"]
+        open_window = state["open_window"]
+        resume_kwargs = {
+            "start_date": open_window["TrainStart"],
+            "initial_state": open_window["initial_state"],
+            "initial_equity": completed[-1]["equity"].iloc[-1] if completed else None,
+            "window_params": {open_window["TrainStart"]: open_window["best_params"]},
+        }
+        logging.info(
+            f"  [WF INCREMENTAL] reusing {len(completed)} completed windows, "
+            f"re-simulating from {open_window['TrainEnd'].date()}",
+        )
+
+    new_windows = []
+    walk_forward(df, cash_df, window_callback=new_windows.append, **resume_kwargs, **wf_kwargs)
+    windows = completed + new_windows
+
+    if windows and windows[-1]["final"]:
+        open_window = windows[-1]
+        new_state = {
+            "config_key": config_key,
+            "cutoff": open_window["TrainEnd"],
+            "history_hash": _history_hash(inputs, open_window["TrainEnd"]),
+            "windows": windows[:-1],
+            "open_window": open_window,
+        }
+        try:
+            write_pickle(state_path, new_state)
+        except Exception as exc:
+            logging.warning(f"  [WF INCREMENTAL] could not write {state_path.name} - {exc}")
+    else:
+        # No open window to resume from — next run starts from scratch
+        state_path.unlink(missing_ok=True)
+
+    return _stitch_windows(windows)
@@ -18,7 +18,7 @@ matplotlib.use("Agg")
 
 # --- Path Setup ---
 # --- New, Clean Imports ---
-from moj_system.config import ASSET_REGISTRY, BASE_GRIDS, OUTPUT_DIR
+from moj_system.config import ASSET_REGISTRY, BASE_GRIDS, OUTPUT_DIR, WF_STATE_DIR
 from moj_system.core.global_engine import (
     allocation_walk_forward_n,
     build_price_df_from_returns,
@@ -43,9 +43,9 @@ from moj_system.core.strategy_engine import (
     compute_metrics,
     get_n_jobs,
     print_backtest_report,
-    walk_forward,
 )
 from moj_system.core.utils import build_mmf_extended
+from moj_system.core.wf_cache import incremental_walk_forward
 from moj_system.data.builder import build_and_upload
 from moj_system.data.data_manager import load_local_csv
 from moj_system.data.updater import DataUpdater
@@ -74,7 +74,12 @@ def setup_logging(output_prefix):
     )
 
 
-def run_single_asset(asset_name, stop_mode_arg, creds_path):
+def wf_state_path(name):
+    """Incremental walk-forward state file of one traded series."""
+    return WF_STATE_DIR / f"{name.lower()}.pkl.gz"
+
+
+def run_single_asset(asset_name, stop_mode_arg, creds_path, full_rebuild=False):
     cfg = ASSET_REGISTRY[asset_name]
     output_prefix = asset_name.lower()
     selected_stop_mode = (
@@ -109,9 +114,11 @@ def run_single_asset(asset_name, stop_mode_arg, creds_path):
     if "grids" in cfg:
         grids.update(cfg["grids"])
 
-    wf_equity, wf_results, wf_trades = walk_forward(
+    wf_equity, wf_results, wf_trades = incremental_walk_forward(
         df=df,
         cash_df=cash_df,
+        state_path=wf_state_path(asset_name),
+        rebuild=full_rebuild,
         train_years=cfg["train"],
         test_years=cfg["test"],
         X_grid=grids["X_GRID"],
@@ -179,7 +186,7 @@ def run_single_asset(asset_name, stop_mode_arg, creds_path):
     )
 
 
-def run_pension_portfolio(stop_mode_arg, creds_path):
+def run_pension_portfolio(stop_mode_arg, creds_path, full_rebuild=False):
     cfg = ASSET_REGISTRY["PENSION"]
     selected_stop = cfg.get("default_stop_eq", "atr") if stop_mode_arg == "auto" else stop_mode_arg
     use_atr_eq = selected_stop == "atr"
@@ -202,14 +209,23 @@ def run_pension_portfolio(stop_mode_arg, creds_path):
     derived = build_standard_two_asset_data(WIG, TBSP, MMF, WIBOR, PL10Y, DE10Y, "1995-01-02")
     n_jobs = get_n_jobs()
 
-    wf_eq, wf_res_eq, wf_tr_eq = walk_forward(
-        WIG, derived["mmf_ext"], cfg["train"], cfg["test"], use_atr_stop=use_atr_eq, n_jobs=n_jobs,
+    wf_eq, wf_res_eq, wf_tr_eq = incremental_walk_forward(
+        WIG,
+        derived["mmf_ext"],
+        state_path=wf_state_path("pension_wig"),
+        rebuild=full_rebuild,
+        train_years=cfg["train"],
+        test_years=cfg["test"],
+        use_atr_stop=use_atr_eq,
+        n_jobs=n_jobs,
     )
-    wf_bd, wf_res_bd, wf_tr_bd = walk_forward(
+    wf_bd, wf_res_bd, wf_tr_bd = incremental_walk_forward(
         TBSP,
         derived["mmf_ext"],
-        cfg["train"],
-        cfg["test"],
+        state_path=wf_state_path("pension_tbsp"),
+        rebuild=full_rebuild,
+        train_years=cfg["train"],
+        test_years=cfg["test"],
         filter_modes_override=["ma"],
         n_jobs=n_jobs,
         entry_gate_series=derived["bond_gate"],
@@ -277,7 +293,7 @@ def run_pension_portfolio(stop_mode_arg, creds_path):
     )
 
 
-def run_global_portfolio(asset_key, stop_mode_arg, creds_path):
+def run_global_portfolio(asset_key, stop_mode_arg, creds_path, full_rebuild=False):
     cfg = ASSET_REGISTRY[asset_key]
     mode, train_y, test_y, fx_h = cfg["mode"], cfg["train"], cfg["test"], cfg["fx_hedged"]
     folder_id = os.environ.get("GDRIVE_FOLDER_ID")
@@ -329,13 +345,28 @@ def run_global_portfolio(asset_key, stop_mode_arg, creds_path):
         ret_s = build_return_series(px_df, fx_series=fx_s, hedged=fx_h)
         rets_dict[lbl] = ret_s.dropna()
         proc_px = px_df if fx_h or fx_s is None else build_price_df_from_returns(ret_s, lbl)
-        wf_e, wf_r, wf_t = walk_forward(proc_px, MMF, train_y, test_y, n_jobs=n_jobs)
+        wf_e, wf_r, wf_t = incremental_walk_forward(
+            proc_px,
+            MMF,
+            state_path=wf_state_path(f"{asset_key}_{lbl}"),
+            rebuild=full_rebuild,
+            train_years=train_y,
+            test_years=test_y,
+            n_jobs=n_jobs,
+        )
         sigs_full[lbl] = build_signal_series(wf_e, wf_t)
         if lbl == "WIG":
             wig_wf_res = wf_r
 
-    wf_bd, wf_res_bd, wf_tr_bd = walk_forward(
-        TBSP, MMF, train_y, test_y, filter_modes_override=["ma"], n_jobs=n_jobs,
+    wf_bd, wf_res_bd, wf_tr_bd = incremental_walk_forward(
+        TBSP,
+        MMF,
+        state_path=wf_state_path(f"{asset_key}_TBSP"),
+        rebuild=full_rebuild,
+        train_years=train_y,
+        test_years=test_y,
+        filter_modes_override=["ma"],
+        n_jobs=n_jobs,
     )
     rets_dict["TBSP"] = TBSP["Zamkniecie"].pct_change().dropna()
     sigs_full["TBSP"] = build_signal_series(wf_bd, wf_tr_bd)
@@ -397,6 +428,11 @@ def main():
         "--asset", type=str, required=True, help="Asset key: WIG20TR, PENSION, GLOBAL_A, etc.",
     )
     parser.add_argument("--stop_mode", type=str, choices=["fixed", "atr", "auto"], default="auto")
+    parser.add_argument(
+        "--full_rebuild",
+        action="store_true",
+        help="Ignore stored incremental walk-forward state and rerun all windows.",
+    )
     args = parser.parse_args()
 
     cfg = ASSET_REGISTRY.get(args.asset)
@@ -409,11 +445,11 @@ def main():
     updater.run_full_update(get_funds=False)
 
     if cfg["type"] == "portfolio_pension":
-        run_pension_portfolio(args.stop_mode, creds_path)
+        run_pension_portfolio(args.stop_mode, creds_path, args.full_rebuild)
     elif cfg["type"] == "portfolio_global":
-        run_global_portfolio(args.asset, args.stop_mode, creds_path)
+        run_global_portfolio(args.asset, args.stop_mode, creds_path, args.full_rebuild)
     else:
-        run_single_asset(args.asset, args.stop_mode, creds_path)
+        run_single_asset(args.asset, args.stop_mode, creds_path, args.full_rebuild)
 
     logging.info(f"Execution of {args.asset} completed successfully.")
 
@@ -28,10 +28,12 @@ project_root = os.path.abspath(os.path.join(script_dir, "..", ".."))
 sys.path.append(project_root)
 
 
+from moj_system.config import WF_CACHE_DIR, WF_CACHE_MAX_BYTES
 from moj_system.core.pension_engine import allocation_walk_forward, build_signal_series
 
 # Core Engine Imports
-from moj_system.core.strategy_engine import compute_metrics, get_n_jobs, walk_forward
+from moj_system.core.strategy_engine import compute_metrics, get_n_jobs
+from moj_system.core.wf_cache import WalkForwardCache, cached_walk_forward
 from moj_system.data.builder import build_and_upload
 from moj_system.data.data_manager import load_local_csv
 
@@ -67,19 +69,38 @@ def main():
     # 2. Setup Comparison
     common_start = pd.Timestamp("2008-01-04")  # Based on previous sweep success
     results = []
+    wf_cache = WalkForwardCache(WF_CACHE_DIR, max_bytes=WF_CACHE_MAX_BYTES)
 
     logging.info(f"BENCHMARKING OBJECTIVES FOR {args.strategy} STARTING FROM {common_start.date()}")
 
+    # One grid search per window serves every objective; selection and OOS
+    # stitching run per objective inside walk_forward.
+    wf_eq_by_obj = cached_walk_forward(
+        WIG,
+        MMF,
+        cache=wf_cache,
+        train_years=8,
+        test_years=2,
+        objective=OBJECTIVES,
+        n_jobs=get_n_jobs(),
+    )
+    wf_bd_by_obj = cached_walk_forward(
+        TBSP,
+        MMF,
+        cache=wf_cache,
+        train_years=8,
+        test_years=2,
+        filter_modes_override=["ma"],
+        objective=OBJECTIVES,
+        n_jobs=get_n_jobs(),
+    )
+
     for obj in OBJECTIVES:
         logging.info(f">>> Testing Objective: {obj.upper()}")
 
         # Simple Pension simulation for benchmarking
-        wf_eq, wf_res_eq, wf_tr_eq = walk_forward(
-            WIG, MMF, 8, 2, objective=obj, n_jobs=get_n_jobs(),
-        )
-        wf_bd, wf_res_bd, wf_tr_bd = walk_forward(
-            TBSP, MMF, 8, 2, filter_modes_override=["ma"], objective=obj, n_jobs=get_n_jobs(),
-        )
+        wf_eq, wf_res_eq, wf_tr_eq = wf_eq_by_obj[obj]
+        wf_bd, wf_res_bd, wf_tr_bd = wf_bd_by_obj[obj]
 
         sig_eq, sig_bd = build_signal_series(wf_eq, wf_tr_eq), build_signal_series(wf_bd, wf_tr_bd)
         port_eq, _port_weights, realloc, _alloc_df = allocation_walk_forward(
@@ -10,11 +10,15 @@ Advanced Strategy Sweeper. Optimized for extended data handling.
 
 import argparse
 import datetime as dt
+import hashlib
 import logging
 import os
 import sys
 import tempfile
+import time
 from collections import Counter
+from functools import partial
+from pathlib import Path
 
 import matplotlib
 import numpy as np
@@ -32,7 +36,12 @@ from moj_system.config import (
     EQUITY_THRESHOLDS_BOOTSTRAP,
     EQUITY_THRESHOLDS_MC,
     OUTPUT_DIR,
+    ROBUSTNESS_RESERVOIR_SIZE,
+    ROBUSTNESS_STORE_DIR,
+    SWEEP_CHECKPOINT_DIR,
     SWEEP_WINDOW_CONFIGS,
+    WF_CACHE_DIR,
+    WF_CACHE_MAX_BYTES,
 )
 from moj_system.core.global_engine import (
     allocation_walk_forward_n,
@@ -53,15 +62,17 @@ from moj_system.core.research import (
 )
 from moj_system.core.robustness import RobustnessEngine
 from moj_system.core.robustness_engine import analyze_bootstrap, analyze_robustness
+from moj_system.core.robustness_store import RobustnessSampleStore
 
 # --- CORE ENGINE IMPORTS ---
 from moj_system.core.strategy_engine import (
+    WALK_FORWARD_VERSION,
     compute_buy_and_hold,
     compute_metrics,
     get_n_jobs,
-    walk_forward,
 )
 from moj_system.core.utils import build_mmf_extended
+from moj_system.core.wf_cache import WalkForwardCache, cached_walk_forward, hash_value, write_pickle
 from moj_system.data.builder import build_and_upload
 from moj_system.data.data_manager import load_local_csv
 from moj_system.data.updater import DataUpdater
@@ -193,21 +204,96 @@ def _compile_window_stats(window_rows: list) -> dict:
     return summary
 
 
+# ==============================================================================
+# SWEEP CHECKPOINT
+# ==============================================================================
+
+
+def _sweep_input_hash(data_map: dict) -> str:
+    """
+    Short SHA-256 fingerprint of everything a sweep unit's result depends
+    on besides the unit itself: the contents of every loaded series, the
+    strategy grids, window configs, robustness thresholds, the asset
+    registry and WALK_FORWARD_VERSION.
+    """
+    parts = [f"engine={WALK_FORWARD_VERSION}"]
+    for key in sorted(data_map):
+        parts.append(f"{key}={hash_value(data_map[key])}")
+    for name, value in (
+        ("ASSET_REGISTRY", ASSET_REGISTRY),
+        ("BASE_GRIDS", BASE_GRIDS),
+        ("BOND_GRIDS", BOND_GRIDS),
+        ("SWEEP_WINDOW_CONFIGS", SWEEP_WINDOW_CONFIGS),
+        ("EQUITY_THRESHOLDS_MC", EQUITY_THRESHOLDS_MC),
+        ("EQUITY_THRESHOLDS_BOOTSTRAP", EQUITY_THRESHOLDS_BOOTSTRAP),
+        ("BOND_THRESHOLDS_MC", BOND_THRESHOLDS_MC),
+        ("BOND_THRESHOLDS_BOOTSTRAP", BOND_THRESHOLDS_BOOTSTRAP),
+    ):
+        parts.append(f"{name}={hash_value(value)}")
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+class SweepCheckpoint:
+    """
+    Completed sweep units on disk, one atomically written file per unit.
+
+    A unit is one (strategy, train, test, stop mode) iteration; its file
+    holds the result row and the window rows it added. Walk-forwards and
+    MC / bootstrap sample batches inside a unit are persisted by the
+    walk-forward cache and the robustness sample store, so an
+    interrupted unit also restarts from its last completed piece.
+    """
+
+    SUFFIX = ".pkl.gz"
+
+    def __init__(self, checkpoint_dir):
+        self.checkpoint_dir = Path(checkpoint_dir)
+
+    def _path(self, unit) -> Path:
+        name = "_".join(str(part) for part in unit).replace("/", "-").replace(" ", "")
+        return self.checkpoint_dir / f"{name}{self.SUFFIX}"
+
+    def load(self, unit):
+        """Return (result, window_rows) of a completed unit or None."""
+        path = self._path(unit)
+        if not path.exists():
+            return None
+        try:
+            return pd.read_pickle(path, compression="gzip")
+        except Exception as exc:
+            logging.warning(f"SweepCheckpoint: ignoring unreadable unit {path.name} - {exc}")
+            return None
+
+    def save(self, unit, result, window_rows):
+        write_pickle(self._path(unit), (result, window_rows))
+
+    def clear(self):
+        for path in self.checkpoint_dir.glob(f"*{self.SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+
 # ==============================================================================
 # SWEEP MANAGER
 # ==============================================================================
 
 
 class SweepManager:
-    def __init__(self, n_mc, n_boot, data_map):
+    def __init__(self, n_mc, n_boot, data_map, adaptive=False):
         self.n_mc = n_mc
         self.n_boot = n_boot
         self.data_map = data_map
-        self.rob_engine = RobustnessEngine(n_jobs=get_n_jobs())
+        self.rob_engine = RobustnessEngine(
+            n_jobs=get_n_jobs(),
+            adaptive=adaptive,
+            store=RobustnessSampleStore(ROBUSTNESS_STORE_DIR),
+            stream=True,
+            reservoir_size=ROBUSTNESS_RESERVOIR_SIZE,
+        )
         self.creds_path = os.path.join(tempfile.gettempdir(), "credentials.json")
         self.folder_id = os.environ.get("GDRIVE_FOLDER_ID")
         self.all_windows = []
         self.wf_cache = {}
+        self.wf_disk_cache = WalkForwardCache(WF_CACHE_DIR, max_bytes=WF_CACHE_MAX_BYTES)
         self.mc_cache = {}
         self.boot_cache = {}
 
@@ -229,9 +315,33 @@ class SweepManager:
         grids = BOND_GRIDS if grid_type == "BOND" else BASE_GRIDS
         use_atr = stop_type == "atr"
 
-        wf_equity, wf_results, wf_trades = walk_forward(
+        if grid_type == "EQUITY":
+            # Equity configs are swept in both stop modes: one shared grid
+            # pass (stop type as a kernel axis) fills both cache entries.
+            wf_by_mode = cached_walk_forward(
+                df=df,
+                cash_df=cash_df,
+                cache=self.wf_disk_cache,
+                train_years=train_y,
+                test_years=test_y,
+                X_grid=grids["X_GRID"],
+                Y_grid=grids["Y_GRID"],
+                fast_grid=grids["FAST_GRID"],
+                slow_grid=grids["SLOW_GRID"],
+                use_atr_stop="both",
+                N_atr_grid=grids["N_ATR_GRID"],
+                entry_gate_series=entry_gate,
+                n_jobs=get_n_jobs(),
+                fast_mode=True,
+            )
+            for mode_name, mode_result in wf_by_mode.items():
+                self.wf_cache[(asset_name, train_y, test_y, mode_name, gate_id)] = mode_result
+            return self.wf_cache[cache_key]
+
+        wf_equity, wf_results, wf_trades = cached_walk_forward(
             df=df,
             cash_df=cash_df,
+            cache=self.wf_disk_cache,
             train_years=train_y,
             test_years=test_y,
             X_grid=grids["X_GRID"],
@@ -272,7 +382,11 @@ class SweepManager:
             f"  [MC CACHE MISS] Running MC: {asset_name} train: {train_y} test: {test_y}, stop type: {stop_type}",
         )
         mc_df = self.rob_engine.run_mc_test(
-            wf_results=wf_results, df=df, cash_df=cash_df, n_samples=n_samples,
+            wf_results=wf_results,
+            df=df,
+            cash_df=cash_df,
+            n_samples=n_samples,
+            thresholds=thresholds,
         )
         # POPRAWKA: baseline_metrics liczone z krzywej kapitału, nie z wyników okienek
         result = analyze_robustness(
@@ -312,6 +426,7 @@ class SweepManager:
             df=df,
             cash_df=cash_df,
             n_samples=n_samples,
+            thresholds=thresholds,
             train_years=train_y,
             test_years=test_y,
             use_atr_stop=use_atr,
@@ -383,14 +498,18 @@ class SweepManager:
         )
 
         mc_p05 = pd.NA
+        mc_n = pd.NA
         if mc_verdicts_dict:
             first_mc_key = list(mc_verdicts_dict.keys())[0]
             mc_p05 = mc_verdicts_dict[first_mc_key].get("CAGR", {}).get("p05", pd.NA)
+            mc_n = mc_verdicts_dict[first_mc_key].get("n_samples", pd.NA)
 
         bb_p05 = pd.NA
+        bb_n = pd.NA
         if bb_verdicts_dict:
             first_bb_key = list(bb_verdicts_dict.keys())[0]
             bb_p05 = bb_verdicts_dict[first_bb_key].get("CAGR", {}).get("p05", pd.NA)
+            bb_n = bb_verdicts_dict[first_bb_key].get("n_samples", pd.NA)
 
         return {
             "Strategy": strat_name,
@@ -411,8 +530,10 @@ class SweepManager:
             else pd.NA,
             "MC_Verdict": mc_verdict,
             "MC_p05_CAGR": mc_p05,
+            "MC_n": mc_n,
             "BB_Verdict": bb_verdict,
             "BB_p05_CAGR": bb_p05,
+            "BB_n": bb_n,
             **win_stats,
             **regime_metrics,
         }
@@ -459,7 +580,9 @@ class SweepManager:
 
         mc_res, bb_res = {}, {}
         if self.n_mc > 0:
-            mc_df = self.rob_engine.run_mc_test(wf_results, df, cash_df, n_samples=self.n_mc)
+            mc_df = self.rob_engine.run_mc_test(
+                wf_results, df, cash_df, n_samples=self.n_mc, thresholds=EQUITY_THRESHOLDS_MC,
+            )
             mc_res[asset_name] = analyze_robustness(
                 mc_df, compute_metrics(wf_equity), thresholds=EQUITY_THRESHOLDS_MC,
             )
@@ -469,6 +592,7 @@ class SweepManager:
                 df,
                 cash_df,
                 n_samples=self.n_boot,
+                thresholds=EQUITY_THRESHOLDS_BOOTSTRAP,
                 train_years=train_y,
                 test_years=test_y,
                 use_atr_stop=use_atr,
@@ -895,6 +1019,22 @@ def main():
     parser.add_argument("--assets", nargs="+", help="Dla trybu SINGLE (np. WIG20TR SP500)")
     parser.add_argument("--n_mc", type=int, default=0, help="Liczba probek MC")
     parser.add_argument("--n_boot", type=int, default=0, help="Liczba probek Bootstrap")
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="n_mc / n_boot jako limit: MC i Bootstrap koncza sie, gdy werdykt jest rozstrzygniety",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Pomin jednostki zakonczone w poprzednim (przerwanym) przebiegu",
+    )
+    parser.add_argument(
+        "--max_minutes",
+        type=float,
+        default=0,
+        help="Nie zaczynaj nowych jednostek po tym czasie (0 = bez limitu)",
+    )
     args = parser.parse_args()
 
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
@@ -972,39 +1112,86 @@ def main():
     common_start = get_common_oos_start(data_map, SWEEP_WINDOW_CONFIGS)
 
     # 3. Init Manager with the map
-    manager = SweepManager(args.n_mc, args.n_boot, data_map)
+    manager = SweepManager(args.n_mc, args.n_boot, data_map, adaptive=args.adaptive)
     results = []
 
-    # 4. Iteration loops
+    # 4. Iteration loops — one checkpointed unit per iteration
+    units = []
     if args.mode in ["SINGLE", "ALL"] and args.assets:
         for asset in args.assets:
             for ty, te in SWEEP_WINDOW_CONFIGS:
                 for st in ["fixed", "atr"]:
-                    logging.info(
-                        f"\n{'=' * 80}\nSINGLE SWEEP: {asset} | {ty}+{te} | {st}\n{'=' * 80}",
+                    units.append(
+                        (
+                            f"SINGLE SWEEP: {asset} | {ty}+{te} | {st}",
+                            ("SINGLE", asset, ty, te, st),
+                            partial(
+                                manager.run_single_asset_iteration, asset, ty, te, st, common_start,
+                            ),
+                        ),
                     )
-                    res = manager.run_single_asset_iteration(asset, ty, te, st, common_start)
-                    if res:
-                        results.append(res)
 
     if args.mode in ["GLOBAL", "ALL"]:
         for var in ["GLOBAL_A", "GLOBAL_B"]:
             for ty, te in SWEEP_WINDOW_CONFIGS:
                 for st in ["fixed", "atr"]:
-                    logging.info(
-                        f"\n{'=' * 80}\nGLOBAL SWEEP: {var} | {ty}+{te} | {st}\n{'=' * 80}",
+                    units.append(
+                        (
+                            f"GLOBAL SWEEP: {var} | {ty}+{te} | {st}",
+                            ("GLOBAL", var, ty, te, st),
+                            partial(manager.run_global_iteration, var, ty, te, st, common_start),
+                        ),
                     )
-                    res = manager.run_global_iteration(var, ty, te, st, common_start)
-                    if res:
-                        results.append(res)
 
     if args.mode in ["PENSION", "ALL"]:
         for ty, te in SWEEP_WINDOW_CONFIGS:
             for st in ["fixed", "atr"]:
-                logging.info(f"\n{'=' * 80}\nPENSION SWEEP: {ty}+{te} | {st}\n{'=' * 80}")
-                res = manager.run_pension_iteration(ty, te, st, common_start)
-                if res:
-                    results.append(res)
+                units.append(
+                    (
+                        f"PENSION SWEEP: {ty}+{te} | {st}",
+                        ("PENSION", ty, te, st),
+                        partial(manager.run_pension_iteration, ty, te, st, common_start),
+                    ),
+                )
+
+    # Unit files are only valid for the same robustness settings, OOS start,
+    # input data and sweep configuration
+    checkpoint = SweepCheckpoint(SWEEP_CHECKPOINT_DIR)
+    run_tag = (
+        f"mc{args.n_mc}",
+        f"boot{args.n_boot}",
+        "adaptive" if args.adaptive else "fixed_n",
+        str(common_start.date()),
+        _sweep_input_hash(data_map),
+    )
+    if not args.resume:
+        checkpoint.clear()
+    deadline = time.time() + args.max_minutes * 60 if args.max_minutes else None
+    n_pending = 0
+
+    for label, unit, run in units:
+        unit = unit + run_tag
+        stored = checkpoint.load(unit) if args.resume else None
+        if stored is not None:
+            logging.info(f"[RESUME] Skipping completed unit: {label}")
+            res, window_rows = stored
+            manager.all_windows.extend(window_rows)
+        elif deadline is not None and time.time() > deadline:
+            n_pending += 1
+            continue
+        else:
+            logging.info(f"\n{'=' * 80}\n{label}\n{'=' * 80}")
+            n_windows_before = len(manager.all_windows)
+            res = run()
+            checkpoint.save(unit, res, manager.all_windows[n_windows_before:])
+        if res:
+            results.append(res)
+
+    if n_pending:
+        logging.warning(
+            f"Time budget of {args.max_minutes} min reached: {n_pending} units not started. "
+            f"Re-run with --resume to continue.",
+        )
 
     # 5. Saving
     if results:
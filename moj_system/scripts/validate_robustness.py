@@ -33,6 +33,11 @@ from moj_system.config import (
     EQUITY_THRESHOLDS_BOOTSTRAP,
     EQUITY_THRESHOLDS_MC,
     OUTPUT_DIR,
+    ROBUSTNESS_CURVE_RESERVOIR_SIZE,
+    ROBUSTNESS_RESERVOIR_SIZE,
+    ROBUSTNESS_STORE_DIR,
+    WF_CACHE_DIR,
+    WF_CACHE_MAX_BYTES,
 )
 from moj_system.core.global_engine import (
     allocation_walk_forward_n,
@@ -50,15 +55,16 @@ from moj_system.core.pension_engine import (
 )
 from moj_system.core.robustness import RobustnessEngine
 from moj_system.core.robustness_engine import analyze_bootstrap, analyze_robustness
+from moj_system.core.robustness_store import RobustnessSampleStore
 
 # --- CORE ENGINE IMPORTS ---
 from moj_system.core.strategy_engine import (
     compute_buy_and_hold,
     compute_metrics,
     get_n_jobs,
-    walk_forward,
 )
 from moj_system.core.utils import build_mmf_extended
+from moj_system.core.wf_cache import WalkForwardCache, cached_walk_forward
 from moj_system.data.builder import build_and_upload
 from moj_system.data.data_manager import load_local_csv
 from moj_system.data.updater import DataUpdater
@@ -69,9 +75,16 @@ class ValidationManager:
         self.n_mc = n_mc
         self.n_boot = n_boot
         self.run_weights_perturb = run_weights_perturb
-        self.rob_engine = RobustnessEngine(n_jobs=get_n_jobs())
+        self.rob_engine = RobustnessEngine(
+            n_jobs=get_n_jobs(),
+            store=RobustnessSampleStore(ROBUSTNESS_STORE_DIR),
+            stream=True,
+            reservoir_size=ROBUSTNESS_RESERVOIR_SIZE,
+            curve_reservoir_size=ROBUSTNESS_CURVE_RESERVOIR_SIZE,
+        )
         self.creds_path = os.path.join(tempfile.gettempdir(), "credentials.json")
         self.folder_id = os.environ.get("GDRIVE_FOLDER_ID")
+        self.wf_cache = WalkForwardCache(WF_CACHE_DIR, max_bytes=WF_CACHE_MAX_BYTES)
 
     def _save_validation_chart(self, strategy_equity, bh_equity, title, filename):
         """Generates a 2-panel OOS validation chart (Equity + Drawdown)."""
@@ -127,13 +140,41 @@ class ValidationManager:
         plt.close(fig=fig)
         logging.info(msg=f"Validation chart saved to: {chart_path}")
 
+    def _save_mc_fan_chart(self, mc_results, strategy_equity, title, filename):
+        """Plots the reservoir of Monte Carlo equity curves around the OOS equity."""
+        curves = mc_results.curve_frame()
+        if curves.empty:
+            return
+        OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+        chart_path = OUTPUT_DIR / filename
+
+        fig, ax = plt.subplots(figsize=(14, 7))
+        ax.plot(curves.index, curves.values, color="grey", linewidth=0.6, alpha=0.25)
+        ax.plot(
+            strategy_equity.index,
+            (strategy_equity / strategy_equity.iloc[0]).values,
+            label="Strategy (OOS)",
+            color="steelblue",
+            linewidth=2,
+        )
+        ax.plot([], [], color="grey", alpha=0.5, label=f"MC samples ({curves.shape[1]} shown)")
+        ax.set_title(label=title, fontsize=14, fontweight="bold")
+        ax.set_ylabel(ylabel="Normalised Equity")
+        ax.legend(loc="upper left")
+        ax.grid(visible=True, alpha=0.3)
+
+        plt.savefig(fname=chart_path, dpi=72, bbox_inches="tight")
+        plt.close(fig=fig)
+        logging.info(msg=f"Monte Carlo fan chart saved to: {chart_path}")
+
     def validate_single(self, asset_name, train_y, test_y, stop_type, df, cash_df):
         logging.info(f"VALIDATING SINGLE ASSET: {asset_name} | {train_y}+{test_y} | {stop_type}")
         use_atr = stop_type == "atr"
 
-        wf_eq, wf_res, wf_tr = walk_forward(
+        wf_eq, wf_res, wf_tr = cached_walk_forward(
             df=df,
             cash_df=cash_df,
+            cache=self.wf_cache,
             train_years=train_y,
             test_years=test_y,
             X_grid=BASE_GRIDS["X_GRID"],
@@ -165,6 +206,12 @@ class ValidationManager:
                 baseline_metrics=compute_metrics(wf_eq),
                 thresholds=EQUITY_THRESHOLDS_MC,
             )
+            self._save_mc_fan_chart(
+                mc_results=mc_results,
+                strategy_equity=wf_eq,
+                title=f"MC Robustness: {asset_name} ({train_y}+{test_y} {stop_type})",
+                filename=f"validate_mc_{asset_name.lower()}_{train_y}_{test_y}.png",
+            )
 
         if self.n_boot > 0:
             bb_results = self.rob_engine.run_bootstrap_test(
@@ -231,9 +278,10 @@ class ValidationManager:
         )
 
         logging.info("\n" + "=" * 60 + "\n--- Component 2: TBSP Robustness ---\n" + "=" * 60)
-        wf_bd_eq, wf_bd_res, wf_bd_tr = walk_forward(
+        wf_bd_eq, wf_bd_res, wf_bd_tr = cached_walk_forward(
             df=TBSP,
             cash_df=derived["mmf_ext"],
+            cache=self.wf_cache,
             train_years=train_y,
             test_years=test_y,
             filter_modes_override=["ma"],
@@ -276,9 +324,10 @@ class ValidationManager:
             )
 
         # Symulacja portfela dla wykresu zbiorczego
-        wf_eq, wf_res_eq, wf_tr_eq = walk_forward(
+        wf_eq, wf_res_eq, wf_tr_eq = cached_walk_forward(
             df=WIG,
             cash_df=derived["mmf_ext"],
+            cache=self.wf_cache,
             train_years=train_y,
             test_years=test_y,
             X_grid=BASE_GRIDS["X_GRID"],
@@ -403,9 +452,10 @@ class ValidationManager:
             )
 
             # Base WF
-            wf_e, wf_r, wf_t = walk_forward(
+            wf_e, wf_r, wf_t = cached_walk_forward(
                 df=proc_px,
                 cash_df=mmf_ext,
+                cache=self.wf_cache,
                 train_years=train_y,
                 test_years=test_y,
                 X_grid=BASE_GRIDS["X_GRID"],
@@ -452,9 +502,10 @@ class ValidationManager:
 
         # 2. Bond Component Robustness (MC + Bootstrap)
         logging.info("\n" + "=" * 60 + "\n--- Component Robustness: TBSP ---\n" + "=" * 60)
-        wf_bd, wf_res_bd, wf_tr_bd = walk_forward(
+        wf_bd, wf_res_bd, wf_tr_bd = cached_walk_forward(
             df=TBSP,
             cash_df=mmf_ext,
+            cache=self.wf_cache,
             train_years=train_y,
             test_years=test_y,
             filter_modes_override=["ma"],